@@ -1,15 +1,16 @@
 import hou 
 import os
-from utils import io_utils as io
+import re
+from contextlib import nullcontext
 from utils import file_utils as fu
+from utils import version_utils as vu
 from deadline_tools import houdini_submitter
 from typing import Any
 
 
 proj = os.getenv("PROJ")
-database = os.getenv("DATABASE")
-shotnums = [i for i in io.read_json(fr"{database}\shotlist.json")]
 renders_root = os.path.join(proj, "45_render")
+RENDER_VERSION_PATTERN = re.compile(r"v(\d+)")
 
 
 def shot_menu_script(kwargs: dict[str, Any]) -> list[str]:
@@ -37,9 +38,9 @@ def version_menu_script(kwargs: dict[str, Any]) -> list[str]:
     """
     self = kwargs["node"]
     path = os.path.join(renders_root, f'sh{self.parm("shot").rawValue()}')
-    if len(os.listdir(path)) > 0:
-        versions = os.listdir(path)
-        vals = [i for j in versions for i in (j, j)]
+    versions = vu.all_versions(path, RENDER_VERSION_PATTERN, "folder")
+    if len(versions) > 0:
+        vals = [i for j in versions.values() for i in (j, j)]
         next = fu.get_next_render_folder(path)
         return [next, "New"] + sorted(vals, reverse=True)
     else:
@@ -64,8 +65,37 @@ def submit_to_deadline(kwargs: dict[str, Any]):
         hou.hipFile.saveAndIncrementFileName()
 
     if confirm != 2:
-        submitter = houdini_submitter.HoudiniSubmitter(kwargs)
-        submitter.submit_to_deadline()
+        with reserve_render_version(kwargs):
+            submitter = houdini_submitter.HoudiniSubmitter(kwargs)
+            submitter.submit_to_deadline()
+
+
+def reserve_render_version(kwargs: dict[str, Any]) -> vu.VersionReservation | nullcontext:
+    """
+    Claims the selected render version folder before submitting.
+
+    If another artist claimed the same new version first, the next free version
+    is reserved instead and the version parameter is updated to match.
+
+    Args:
+        kwargs (dict[str, Any]): Keyword arguments from usd importer node.
+
+    Returns:
+        VersionReservation | nullcontext: Reservation, released if submission fails.
+    """
+    self = kwargs["node"]
+    shot_path = os.path.join(renders_root, f'sh{self.parm("shot").rawValue()}')
+    version = self.parm("version").rawValue()
+
+    if os.path.isdir(os.path.join(shot_path, version)):
+        return nullcontext()
+
+    reservation = fu.reserve_render_folder(shot_path, version)
+    reserved = os.path.basename(reservation.path)
+    if reserved != version:
+        self.parm("version").set(reserved)
+
+    return reservation
 
 
 def rop_export_path() -> str:
@@ -0,0 +1,64 @@
+import os
+import threading
+from utils import io_utils as io
+from typing import Any, Mapping
+
+
+def structure() -> Mapping[str, Any]:
+    """
+    Gets project structure, re-read only when structure.json changes.
+
+    Returns:
+        Mapping[str, Any]: Read-only structure data.
+    """
+    return io.read_json_cached(fr"{os.getenv('DATABASE')}\structure.json")
+
+
+def shotlist() -> Mapping[str, Any]:
+    """
+    Gets shot list, re-read only when shotlist.json changes.
+
+    Returns:
+        Mapping[str, Any]: Read-only shot data keyed by shot number.
+    """
+    return io.read_json_cached(fr"{os.getenv('DATABASE')}\shotlist.json")
+
+
+def assetlist() -> Mapping[str, Any]:
+    """
+    Gets asset list, re-read only when assetlist.json changes.
+
+    Returns:
+        Mapping[str, Any]: Read-only asset data keyed by asset id.
+    """
+    return io.read_json_cached(fr"{os.getenv('DATABASE')}\assetlist.json")
+
+
+def warm(background=True) -> threading.Thread | None:
+    """
+    Reads the database files ahead of the first menu that needs them.
+
+    Args:
+        background (bool, optional): Read in a daemon thread instead of blocking. Defaults to True.
+
+    Returns:
+        threading.Thread | None: Warming thread if run in the background.
+    """
+    def read_all():
+        for reader in (structure, shotlist, assetlist):
+            try:
+                reader()
+            except (OSError, ValueError):
+                pass
+
+    if not background:
+        read_all()
+        return None
+
+    thread = threading.Thread(target=read_all, name="project_database_warm", daemon=True)
+    thread.start()
+    return thread
+
+
+if os.getenv("WARM_PROJECT_DATABASE", "0") == "1":
+    warm()
@@ -1,5 +1,6 @@
 import os
-from utils import io_utils as io
+from houdini_modules import project_database as db
+from utils import version_utils as vu
 from typing import Any
 
 try:
@@ -8,13 +9,7 @@ except ImportError:
     pass
 
 
-database = os.getenv("DATABASE")
 depot = os.path.join(os.getenv("PROJ"), "35_depot")
-structure = io.read_json(fr"{database}\structure.json")
-assets = structure["assets"]
-shots = structure["shots"]
-shotnums = [i for i in io.read_json(fr"{database}\shotlist.json")]
-assetlist = io.read_json(fr"{database}\assetlist.json")
 
 
 def root_menu_script(kwargs: dict[str, Any], mode="LOP") -> list[str]:
@@ -28,6 +23,9 @@ def root_menu_script(kwargs: dict[str, Any], mode="LOP") -> list[str]:
     Returns:
         list[str]: Menu of assets for user to select from.
     """
+    structure = db.structure()
+    assets = structure["assets"]
+    shots = structure["shots"]
 
     if mode == "LOP":
         unique = sorted(set(assets) | set(shots))
@@ -51,7 +49,8 @@ def type_menu_script(kwargs: dict[str, Any], mode="LOP") -> list[str]:
     """
     self = kwargs["node"]
     current = self.parm("root").rawValue()
-    unique = set(assets.get(current, [])) | set(shots.get(current, []))
+    structure = db.structure()
+    unique = set(structure["assets"].get(current, [])) | set(structure["shots"].get(current, []))
     unique.discard("rig")
 
     if mode == "SOP":
@@ -73,7 +72,7 @@ def shot_menu_script(kwargs: dict[str, Any]) -> list[str]:
     Returns:
         list[str]: Menu of shot numbers for user to select from.
     """
-    return sorted([i for j in shotnums for i in (j, j)])
+    return sorted([i for j in db.shotlist() for i in (j, j)])
 
 
 def asset_menu_script(kwargs: dict[str, Any]) -> list[str]:
@@ -88,6 +87,7 @@ def asset_menu_script(kwargs: dict[str, Any]) -> list[str]:
     """
     self = kwargs["node"]
     current = self.parm("root").rawValue()
+    assetlist = db.assetlist()
     asset_vals = [i for i in assetlist if i.startswith(current.capitalize())]
     names = [assetlist[i]["name"] for i in asset_vals]
 
@@ -112,8 +112,9 @@ def version_menu_script(kwargs: dict[str, Any]) -> list[str]:
     asset = self.parm("asset").rawValue()
     curr_type = self.parm("type").rawValue().lower()
     shotnum = self.parm("shot").rawValue()
-    asset_types = assets.get(root, [])
-    shot_types = shots.get(root, [])
+    structure = db.structure()
+    asset_types = structure["assets"].get(root, [])
+    shot_types = structure["shots"].get(root, [])
 
     if asset == "N/A":
         return ["Empty", "Empty"]
@@ -127,16 +128,13 @@ def version_menu_script(kwargs: dict[str, Any]) -> list[str]:
     if path == "":
         return ["Empty", "Empty"]
     
-    vals = []
-    for i in os.listdir(path):
-        version = i.split(".")[0][-4:]
-        vals.extend([version, version])
+    labels = vu.version_labels(path)
 
-    if len(vals) == 0:
+    if len(labels) == 0:
         return ["Empty", "Empty"]
-    else:
-        vals = sorted(vals, reverse=True)
-        vals = [vals[0], "latest"] + vals
+    
+    vals = [i for j in labels for i in (j, j)]
+    vals = [vals[0], "latest"] + vals
     return vals
 
 
@@ -153,8 +151,9 @@ def import_path() -> str:
     shotnum = hou.parm("../shot").rawValue()
     version = hou.parm("../version").rawValue()
 
-    asset_types = assets.get(root, [])
-    shot_types = shots.get(root, [])
+    structure = db.structure()
+    asset_types = structure["assets"].get(root, [])
+    shot_types = structure["shots"].get(root, [])
 
     path = ""
     if curr_type in asset_types:
@@ -165,10 +164,9 @@ def import_path() -> str:
     if path == "":
         return ""
     
-    for i in os.listdir(path):
-        ver = i.split(".")[0][-4:]
-        if ver == version:
-            return os.path.join(path, i)
+    file = vu.version_labels(path).get(version)
+    if file:
+        return os.path.join(path, file)
 
     return ""
 
@@ -0,0 +1,39 @@
+import importlib
+from utils import io_utils
+from houdini_modules import project_database as db
+
+
+def write_database(folder, shots):
+    io_utils.write_json(fr"{folder}\shotlist.json", shots)
+
+
+def test_import_reads_nothing(tmp_path, monkeypatch):
+    monkeypatch.setenv("PROJ", str(tmp_path))
+    monkeypatch.setenv("DATABASE", str(tmp_path / "missing"))
+    from houdini_modules import usd_importer
+
+    # Raises if the database is read at import.
+    importlib.reload(usd_importer)
+
+
+def test_menus_see_new_shots_without_restart(tmp_path, monkeypatch):
+    monkeypatch.setenv("PROJ", str(tmp_path))
+    monkeypatch.setenv("DATABASE", str(tmp_path))
+    from houdini_modules import usd_importer
+
+    write_database(tmp_path, {"010": {}})
+    assert usd_importer.shot_menu_script({}) == ["010", "010"]
+
+    write_database(tmp_path, {"010": {}, "020": {"frames": [1, 10]}})
+    assert usd_importer.shot_menu_script({}) == ["010", "010", "020", "020"]
+
+
+def test_warm_fills_cache_and_skips_missing_files(tmp_path, monkeypatch):
+    monkeypatch.setenv("DATABASE", str(tmp_path))
+    write_database(tmp_path, {"010": {}})
+    io_utils.clear_json_cache()
+
+    db.warm(background=False)
+    assert io_utils.json_cache_stats()["entries"] == 1
+    db.warm().join()
+    assert io_utils.json_cache_stats()["hits"] >= 1
@@ -8,17 +8,22 @@
 # )
 
 import os
+from utils import version_utils as vu
 try:
     import maya.cmds as cmds
 except ModuleNotFoundError:
     pass
 
 
+# Ways to bring an asset in, "Reference" being a Maya file reference.
+LOAD_MODES = ["Reference", "Proxy", "Proxy Unloaded"]
+
+
 class AssetReferencerLogic:
     """
     Logic class for asset referencer.
     """
-    def __init__(self, asset_name: str, asset_type: str, reference_object: str, version_num: str):
+    def __init__(self, asset_name: str, asset_type: str, reference_object: str, version_num: str, load_mode="Reference"):
         """
         Initialise asset properties to find file with.
 
@@ -27,11 +32,14 @@ class AssetReferencerLogic:
             asset_type (str): Type of asset to reference.
             reference_object (str): Object to reference.
             version_num (str): Version of asset to reference.
+            load_mode (str, optional): One of LOAD_MODES. "Proxy" opens the file in a Usd proxy shape,
+                "Proxy Unloaded" does so with payloads unloaded. Defaults to "Reference".
         """
         self.asset_name = asset_name
         self.asset_type = asset_type
         self.reference_object = reference_object
         self.version_num = version_num
+        self.load_mode = load_mode
         self.proj = os.getenv("PROJ")
 
 
@@ -41,11 +49,13 @@ class AssetReferencerLogic:
         """
         root_path = os.path.join(self.proj, "35_depot", "assets", self.asset_type, self.asset_name, self.reference_object)
         path = ""
-        for i in os.listdir(root_path):
-            version = i.split(".")[0][-4:]
-            if version == self.version_num:
-                path = os.path.join(root_path, i)
-                break
+        file = vu.version_labels(root_path).get(self.version_num)
+        if file:
+            path = os.path.join(root_path, file)
+
+        if self.load_mode != "Reference":
+            self.proxy(path, self.load_mode == "Proxy")
+            return
         
         cmds.file(
             path,
@@ -53,4 +63,24 @@ class AssetReferencerLogic:
             namespace=":",
             mergeNamespacesOnClash=True
         )
-        
\ No newline at end of file
+
+
+    def proxy(self, path: str, load_payloads=True) -> str:
+        """
+        Opens a Usd file in a mayaUsdProxyShape, so payloads can be loaded selectively.
+
+        Args:
+            path (str): Usd file to open.
+            load_payloads (bool, optional): Load payloads when the stage opens. Defaults to True.
+
+        Returns:
+            str: Proxy shape node.
+        """
+        if not cmds.pluginInfo("mayaUsdPlugin", query=True, loaded=True):
+            cmds.loadPlugin("mayaUsdPlugin")
+
+        shape = cmds.createNode("mayaUsdProxyShape", name=f"{self.asset_name}Shape")
+        cmds.setAttr(f"{shape}.loadPayloads", load_payloads)
+        cmds.setAttr(f"{shape}.filePath", path, type="string")
+        cmds.connectAttr("time1.outTime", f"{shape}.time")
+        return shape
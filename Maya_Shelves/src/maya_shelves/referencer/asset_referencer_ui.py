@@ -8,6 +8,7 @@ import sys
 import os
 
 from utils import ui_utils
+from utils import version_utils as vu
 from utils import io_utils as io
 from project_manager.asset_manager import add_asset_ui as aa
 from maya_shelves.referencer import asset_referencer_logic as logic
@@ -39,7 +40,7 @@ class AssetReferencerUi(QtWidgets.QMainWindow):
         self.proj = os.getenv('PROJ')
         self.depot = fr"{self.proj}\35_depot"
         self.database = os.getenv("DATABASE")
-        self.structure = io.read_json(fr"{self.database}\structure.json")
+        self.structure = io.read_json_cached(fr"{self.database}\structure.json")
 
         self.asset_type_combobox = None
         self.asset_name_combobox = None
@@ -90,6 +91,7 @@ class AssetReferencerUi(QtWidgets.QMainWindow):
 
         self.reference_object = ui_utils.new_parm("Reference:", middle_layout, font, box_width, "QComboBox")
         self.version = ui_utils.new_parm("Version:", middle_layout, font, box_width, "QComboBox")
+        self.load_mode = ui_utils.new_parm("Load As:", middle_layout, font, box_width, "QComboBox")
 
         middle_layout.addStretch(1)
 
@@ -118,6 +120,7 @@ class AssetReferencerUi(QtWidgets.QMainWindow):
         # Modify any widgets previously defined
 
         self.asset_type_combobox.addItems([i for i in self.structure["assets"]])
+        self.load_mode.addItems(logic.LOAD_MODES)
         self.update_asset_name_combobox()
         self.update_reference_object_combobox()
         self.update_version()
@@ -188,7 +191,8 @@ class AssetReferencerUi(QtWidgets.QMainWindow):
         if asset_name == "Empty" or asset_type == "Empty" or reference_object == "Empty" or version_num == "Empty":
             ui_utils.popup_warning("Please select a valid asset to reference.", self)
         else:
-            referencer = logic.AssetReferencerLogic(asset_name, asset_type, reference_object, version_num)
+            referencer = logic.AssetReferencerLogic(asset_name, asset_type, reference_object, version_num,
+                                                    self.load_mode.currentText())
             referencer.reference()
             self.close()
 
@@ -210,12 +214,12 @@ class AssetReferencerUi(QtWidgets.QMainWindow):
             path = os.path.join(os.getenv("PROJ"), "35_depot", "assets", asset_type, name, ref_type)
             if not os.path.exists(path):
                 ver.addItems(["Empty"])
-            elif len(os.listdir(path)) <= 0:
-                ver.addItems(["Empty"])
             else:
-                for i in os.listdir(path):
-                    version = i.split(".")[0][-4:]
-                    ver.addItems([version])
+                labels = vu.version_labels(path)
+                if len(labels) <= 0:
+                    ver.addItems(["Empty"])
+                else:
+                    ver.addItems(list(labels))
 
 
 def main():
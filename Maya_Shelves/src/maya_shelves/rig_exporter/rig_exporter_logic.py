@@ -1,5 +1,6 @@
 import os
 from utils import file_utils as fu
+from utils import store_utils
 
 try:
     import maya.cmds as cmds
@@ -38,20 +39,7 @@ class RigExporterLogic:
         scene_path = cmds.file(q=True, sn=True)
         name = f"{self.asset_name}_rig"
         path = os.path.join(self.proj, "35_depot", "assets", self.asset_type, self.asset_name, "rig")
-        new_file = fu.get_next_ma_file(name, path)
-
-        self.save_file()
-        self.re_write(scene_path, new_file)
-
-
-    def re_write(self, input_ma: str, output_ma: str):
-        """Re-writes file to correct location
-
-        Args:
-            input_ma (str): Input .ma file.
-            output_ma (str): Output .ma file.
-        """
-        with open(input_ma, "r") as infile, open(output_ma, "w") as outfile:
-            for line in infile:
-                    outfile.write(line)
 
+        with fu.reserve_next_ma_file(name, path) as reservation:
+            self.save_file()
+            store_utils.publish_file(scene_path, reservation.path)
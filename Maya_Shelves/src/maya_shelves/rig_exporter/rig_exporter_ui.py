@@ -39,7 +39,7 @@ class RigExporterUi(QtWidgets.QMainWindow):
         self.proj = os.getenv('PROJ')
         self.depot = fr"{self.proj}\35_depot"
         self.database = os.getenv("DATABASE")
-        self.structure = io.read_json(fr"{self.database}\structure.json")
+        self.structure = io.read_json_cached(fr"{self.database}\structure.json")
 
         self.asset_type_combobox = None
         self.asset_name_combobox = None
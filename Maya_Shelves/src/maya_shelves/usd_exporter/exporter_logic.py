@@ -77,13 +77,16 @@ class MayaUsdExporterLogic:
         logic = rex.ReExporter(path, self.asset_name, self.asset_type, self.shot_num)
 
         if self.export_type == "Cam":
-            logic.export_cam()
+            published = logic.export_cam()
 
         if self.export_type == "Geo":
-            logic.export_mesh()
+            published = logic.export_mesh()
         
         if self.export_type == "Anim":
-            logic.export_anim()
+            published = logic.export_anim()
+
+        if logic.unchanged:
+            ui_utils.popup_info(f"Nothing changed since {os.path.basename(published)}, publish skipped.")
 
 
     # Should put this in file utils.
@@ -36,7 +36,7 @@ class MayaUsdExporterUi(QtWidgets.QMainWindow):
         self.proj = os.getenv('PROJ')
         self.depot = fr"{self.proj}\35_depot"
         self.database = os.getenv("DATABASE")
-        self.structure = io.read_json(fr"{self.database}\structure.json")
+        self.structure = io.read_json_cached(fr"{self.database}\structure.json")
 
         self.asset_type_combobox = None
         self.asset_name_combobox = None
@@ -93,7 +93,7 @@ class MayaUsdExporterUi(QtWidgets.QMainWindow):
         self.export_type = ui_utils.new_parm("Export Type:", middle_layout, font, box_width, "QComboBox")
 
         self.shot_num = ui_utils.new_parm("Shot Num:", middle_layout, font, box_width, "QComboBox")
-        data = io.read_json(fr"{self.database}\shotlist.json")
+        data = io.read_json_cached(fr"{self.database}\shotlist.json")
         shotnums = []
 
         for num in data:
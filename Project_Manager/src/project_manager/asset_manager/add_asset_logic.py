@@ -14,14 +14,13 @@ def add_asset(asset_name: str, asset_type: str):
     """
     asset_name = su.to_camel_case(asset_name)
     database = os.getenv("DATABASE")
-    structure = io.read_json(fr"{database}\structure.json")
+    structure = io.read_json_cached(fr"{database}\structure.json")
     depot = fr"{os.getenv('PROJ')}\35_depot"
-    assetlist = io.read_json(fr"{database}\assetlist.json")
     logger = asset_logger.AssetLogger()
     
     if not logger.asset_exists(asset_name, asset_type):
 
-        shotnums = [i for i in io.read_json(fr"{database}\shotlist.json")]
+        shotnums = [i for i in io.read_json_cached(fr"{database}\shotlist.json")]
         asset_folders = [i for i in structure["assets"][asset_type]]
         shot_folders = [i for i in structure["shots"].get(asset_type, [])]
         
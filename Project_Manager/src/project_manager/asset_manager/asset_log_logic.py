@@ -1,6 +1,7 @@
 from utils import io_utils as io
 from utils import codec_utils as codec
 from utils import ui_utils
+from project_manager.registry import registry_logic
 import os
 import hashlib
 from datetime import datetime
@@ -26,6 +27,7 @@ class AssetLogger:
         self.proj = os.getenv("PROJ")
         self.database = os.getenv("DATABASE")
         self.assetlist = os.path.join(self.database, "assetlist.json")
+        self.registry = registry_logic.get_registry(self.database)
 
 
     def asset_exists(self, asset_name: str, asset_type: str) -> bool:
@@ -40,11 +42,7 @@ class AssetLogger:
             bool: Returns true if asset has already been logged.
         """
         hash = codec.hash_encode([asset_type, asset_name])
-        assets = io.read_json(self.assetlist)
-        
-        if hash in [assets[i]["hash"] for i in assets]:
-            return True
-        return False
+        return self.registry.asset_exists(hash)
 
 
     def log_asset(self, asset_name: str, asset_type: str):
@@ -56,19 +54,16 @@ class AssetLogger:
             asset_type (str): Asset type to log.
         """
         hash = codec.hash_encode([asset_type, asset_name])
-        assets = io.read_json(self.assetlist)
-        
-        if not self.asset_exists(asset_name, asset_type):
-            id = f"{asset_type}:{asset_name}"
-            data = {
-                "id":id,
-                "name":asset_name,
-                "type":asset_type,
-                "hash":hash,
-                "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                "created_by": os.getlogin()
-                }
-            assets[id] = data
-            io.write_json(self.assetlist, assets)
+        id = f"{asset_type}:{asset_name}"
+        data = {
+            "id":id,
+            "name":asset_name,
+            "type":asset_type,
+            "hash":hash,
+            "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "created_by": os.getlogin()
+            }
+
+        self.registry.add_asset(data)
 
             
\ No newline at end of file
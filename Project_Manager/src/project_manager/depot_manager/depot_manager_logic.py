@@ -11,7 +11,7 @@ class DepotManagerLogic:
         self.proj = os.getenv("PROJ")
         self.database = os.getenv("DATABASE")
         self.depot = fr"{self.proj}\35_depot"
-        self.structure = io.read_json(fr"{self.database}\structure.json")
+        self.structure = io.read_json_cached(fr"{self.database}\structure.json")
 
     
     def update_depot(self):
@@ -21,7 +21,7 @@ class DepotManagerLogic:
         structure = self.structure
         assets = structure["assets"]
         shots = structure["shots"]
-        shotnums = [i for i in io.read_json(fr"{self.database}\shotlist.json")]
+        shotnums = [i for i in io.read_json_cached(fr"{self.database}\shotlist.json")]
 
         asset_paths = [os.path.join(self.depot, "assets", i) for i in assets]
         shot_paths = [os.path.join(self.depot, "shots", i, j) for i in shotnums for j in shots]
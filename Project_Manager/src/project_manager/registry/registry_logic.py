@@ -0,0 +1,403 @@
+from utils import io_utils as io
+import os
+import json
+import sqlite3
+import threading
+
+
+class JsonRegistry:
+    """
+    Asset and shot registry stored in the assetlist.json and shotlist.json database files.
+    """
+    def __init__(self, database=None):
+        """
+        Initialise json files to read from.
+
+        Args:
+            database (str, optional): Database folder. Defaults to the DATABASE environment variable.
+        """
+        self.database = database or os.getenv("DATABASE")
+        self.assetlist = os.path.join(self.database, "assetlist.json")
+        self.shotlist = os.path.join(self.database, "shotlist.json")
+
+
+    def asset_exists(self, hash: str) -> bool:
+        """
+        Checks if an asset hash has been logged.
+
+        Args:
+            hash (str): Asset hash to check.
+
+        Returns:
+            bool: Returns true if asset has already been logged.
+        """
+        assets = io.read_json_cached(self.assetlist)
+        return hash in {assets[i]["hash"] for i in assets}
+
+
+    def add_asset(self, data: dict[str, str]) -> bool:
+        """
+        Logs an asset if its hash isn't already logged.
+
+        Args:
+            data (dict[str, str]): Asset data, including "id" and "hash".
+
+        Returns:
+            bool: Returns true if the asset was added.
+        """
+        def add(assets: dict[str, dict]) -> dict[str, dict] | None:
+            if data["hash"] in {assets[i]["hash"] for i in assets}:
+                return None
+            assets[data["id"]] = data
+            return assets
+
+        return io.update_json(self.assetlist, add) is not None
+
+
+    def assets(self) -> dict[str, dict]:
+        """
+        Gets all logged assets.
+
+        Returns:
+            dict[str, dict]: Asset data keyed by asset id.
+        """
+        return io.read_json(self.assetlist)
+
+
+    def shot_exists(self, shot_num: str) -> bool:
+        """
+        Checks if a shot has been added.
+
+        Args:
+            shot_num (str): Shot number to check.
+
+        Returns:
+            bool: Returns true if the shot exists.
+        """
+        return shot_num in io.read_json_cached(self.shotlist)
+
+
+    def add_shot(self, shot_num: str, data: dict[str, str]) -> bool:
+        """
+        Adds a shot if it doesn't already exist.
+
+        Args:
+            shot_num (str): Shot number to add.
+            data (dict[str, str]): Shot data.
+
+        Returns:
+            bool: Returns true if the shot was added.
+        """
+        def add(shots: dict[str, dict]) -> dict[str, dict] | None:
+            if shot_num in shots:
+                return None
+            shots[shot_num] = data
+            return shots
+
+        return io.update_json(self.shotlist, add) is not None
+
+
+    def shots(self) -> dict[str, dict]:
+        """
+        Gets all shots.
+
+        Returns:
+            dict[str, dict]: Shot data keyed by shot number.
+        """
+        return io.read_json(self.shotlist)
+
+
+class SqliteRegistry(JsonRegistry):
+    """
+    Asset and shot registry stored in an indexed SQLite database.
+
+    Entries in the json files are merged in when the registry is opened and the
+    files have changed since they were last merged, and new entries are added
+    to them, so machines still on the json backend and tools reading
+    assetlist.json and shotlist.json keep working.
+    """
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS assets (
+            id TEXT PRIMARY KEY,
+            name TEXT NOT NULL,
+            type TEXT NOT NULL,
+            hash TEXT NOT NULL UNIQUE,
+            data TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS assets_type ON assets (type);
+        CREATE TABLE IF NOT EXISTS shots (
+            shot_num TEXT PRIMARY KEY,
+            data TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS json_sources (
+            file TEXT PRIMARY KEY,
+            signature TEXT NOT NULL
+        );
+    """
+
+    def __init__(self, database=None, db_path=None, export_json=True, journal_mode="DELETE"):
+        """
+        Initialise connection to the registry database.
+
+        Args:
+            database (str, optional): Database folder. Defaults to the DATABASE environment variable.
+            db_path (str, optional): SQLite file. Defaults to the REGISTRY_DB environment variable,
+                or registry.db in the database folder.
+            export_json (bool, optional): Add new entries to the json files. Defaults to True.
+            journal_mode (str, optional): SQLite journal mode. WAL needs shared memory between
+                every process using the file, which network shares don't provide, so only use
+                it for a database on a local disk. Defaults to "DELETE".
+        """
+        super().__init__(database)
+        self.db_path = db_path or os.getenv("REGISTRY_DB") or os.path.join(self.database, "registry.db")
+        self.export_json_files = export_json
+        self.journal_mode = journal_mode
+        self._local = threading.local()
+
+        with self.connect() as conn:
+            conn.executescript(self.SCHEMA)
+        self.migrate_from_json()
+
+
+    def connect(self) -> sqlite3.Connection:
+        """
+        Gets this thread's connection to the registry.
+
+        Returns:
+            sqlite3.Connection: Database connection.
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30.0)
+            conn.execute(f"PRAGMA journal_mode={self.journal_mode}")
+            if self.journal_mode.upper() == "WAL":
+                conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+
+    def migrate_from_json(self):
+        """
+        Merges entries from assetlist.json and shotlist.json into the database.
+
+        Runs when the registry is opened, so entries added by machines on the json
+        backend are picked up. Each file is only read if its size or modification
+        time changed since it was last merged. Existing database entries are kept.
+        """
+        for file in (self.assetlist, self.shotlist):
+            try:
+                stat = os.stat(file)
+            except FileNotFoundError:
+                continue
+
+            signature = f"{stat.st_size}:{stat.st_mtime_ns}"
+            conn = self.connect()
+            row = conn.execute("SELECT signature FROM json_sources WHERE file = ?", (os.path.basename(file),)).fetchone()
+            if row and row[0] == signature:
+                continue
+
+            entries = io.read_json(file)
+            self._insert(entries, {}) if file == self.assetlist else self._insert({}, entries)
+            with conn:
+                conn.execute("INSERT OR REPLACE INTO json_sources (file, signature) VALUES (?, ?)",
+                             (os.path.basename(file), signature))
+
+
+    def _insert(self, assets: dict[str, dict], shots: dict[str, dict]):
+        """
+        Inserts assets and shots that aren't in the database yet.
+
+        Args:
+            assets (dict[str, dict]): Asset data keyed by asset id.
+            shots (dict[str, dict]): Shot data keyed by shot number.
+        """
+        conn = self.connect()
+        with conn:
+            conn.executemany(
+                "INSERT OR IGNORE INTO assets (id, name, type, hash, data) VALUES (?, ?, ?, ?, ?)",
+                [(id, data["name"], data["type"], data["hash"], json.dumps(data)) for id, data in assets.items()]
+            )
+            conn.executemany(
+                "INSERT OR IGNORE INTO shots (shot_num, data) VALUES (?, ?)",
+                [(shot_num, json.dumps(data)) for shot_num, data in shots.items()]
+            )
+
+
+    def asset_exists(self, hash: str) -> bool:
+        """
+        Checks if an asset hash has been logged, using the hash index.
+
+        Args:
+            hash (str): Asset hash to check.
+
+        Returns:
+            bool: Returns true if asset has already been logged.
+        """
+        row = self.connect().execute("SELECT 1 FROM assets WHERE hash = ?", (hash,)).fetchone()
+        return row is not None
+
+
+    def add_asset(self, data: dict[str, str]) -> bool:
+        """
+        Logs an asset if its hash isn't already logged.
+
+        Args:
+            data (dict[str, str]): Asset data, including "id" and "hash".
+
+        Returns:
+            bool: Returns true if the asset was added.
+        """
+        conn = self.connect()
+        with conn:
+            cursor = conn.execute(
+                "INSERT OR IGNORE INTO assets (id, name, type, hash, data) VALUES (?, ?, ?, ?, ?)",
+                (data["id"], data["name"], data["type"], data["hash"], json.dumps(data))
+            )
+
+        added = cursor.rowcount > 0
+        if added and self.export_json_files:
+            self._add_json(self.assetlist, data["id"], data)
+        return added
+
+
+    def assets(self, asset_type=None) -> dict[str, dict]:
+        """
+        Gets logged assets.
+
+        Args:
+            asset_type (str, optional): Only get assets of this type. Defaults to None.
+
+        Returns:
+            dict[str, dict]: Asset data keyed by asset id.
+        """
+        if asset_type is None:
+            rows = self.connect().execute("SELECT id, data FROM assets ORDER BY rowid")
+        else:
+            rows = self.connect().execute("SELECT id, data FROM assets WHERE type = ? ORDER BY rowid", (asset_type,))
+        return {id: json.loads(data) for id, data in rows}
+
+
+    def shot_exists(self, shot_num: str) -> bool:
+        """
+        Checks if a shot has been added.
+
+        Args:
+            shot_num (str): Shot number to check.
+
+        Returns:
+            bool: Returns true if the shot exists.
+        """
+        row = self.connect().execute("SELECT 1 FROM shots WHERE shot_num = ?", (shot_num,)).fetchone()
+        return row is not None
+
+
+    def add_shot(self, shot_num: str, data: dict[str, str]) -> bool:
+        """
+        Adds a shot if it doesn't already exist.
+
+        Args:
+            shot_num (str): Shot number to add.
+            data (dict[str, str]): Shot data.
+
+        Returns:
+            bool: Returns true if the shot was added.
+        """
+        conn = self.connect()
+        with conn:
+            cursor = conn.execute(
+                "INSERT OR IGNORE INTO shots (shot_num, data) VALUES (?, ?)",
+                (shot_num, json.dumps(data))
+            )
+
+        added = cursor.rowcount > 0
+        if added and self.export_json_files:
+            self._add_json(self.shotlist, shot_num, data)
+        return added
+
+
+    def shots(self) -> dict[str, dict]:
+        """
+        Gets all shots.
+
+        Returns:
+            dict[str, dict]: Shot data keyed by shot number.
+        """
+        rows = self.connect().execute("SELECT shot_num, data FROM shots ORDER BY rowid")
+        return {shot_num: json.loads(data) for shot_num, data in rows}
+
+
+    def export_json(self):
+        """
+        Merges the whole registry out to assetlist.json and shotlist.json.
+
+        Adds only write their own entry, so this is only needed to bring json
+        files written elsewhere up to date.
+        """
+        self._merge_json(self.assetlist, self.assets())
+        self._merge_json(self.shotlist, self.shots())
+
+
+    def _merge_json(self, file: str, entries: dict[str, dict]):
+        """
+        Adds database entries missing from a json file, keeping everything already in it.
+
+        The file is updated under its lock, and entries found only in the file are
+        merged into the database at the same time.
+
+        Args:
+            file (str): Json file to merge into.
+            entries (dict[str, dict]): Database entries.
+        """
+        def merge(data: dict[str, dict]) -> dict[str, dict] | None:
+            missing = {key: value for key, value in data.items() if key not in entries}
+            if missing:
+                self._insert(missing, {}) if file == self.assetlist else self._insert({}, missing)
+
+            hashes = {value["hash"] for value in data.values() if "hash" in value}
+            added = {key: value for key, value in entries.items() if key not in data and value.get("hash", key) not in hashes}
+            if not added:
+                return None
+            data.update(added)
+            return data
+
+        io.update_json(file, merge)
+
+
+    def _add_json(self, file: str, key: str, entry: dict[str, str]):
+        """
+        Adds one new entry to a json file, unless its key or hash is already in it.
+
+        Args:
+            file (str): Json file to add to.
+            key (str): Asset id or shot number.
+            entry (dict[str, str]): Entry data.
+        """
+        def add(data: dict[str, dict]) -> dict[str, dict] | None:
+            if key in data or ("hash" in entry and entry["hash"] in {value.get("hash") for value in data.values()}):
+                return None
+            data[key] = entry
+            return data
+
+        io.update_json(file, add)
+
+
+def get_registry(database=None) -> JsonRegistry:
+    """
+    Gets the registry backend selected by the REGISTRY_BACKEND environment variable.
+
+    The SQLite file can be moved, e.g. to a local disk, with the REGISTRY_DB environment variable.
+
+    Args:
+        database (str, optional): Database folder. Defaults to the DATABASE environment variable.
+
+    Returns:
+        JsonRegistry: Json registry by default, SqliteRegistry if REGISTRY_BACKEND is "sqlite".
+    """
+    if os.getenv("REGISTRY_BACKEND", "json").lower() == "sqlite":
+        return SqliteRegistry(database)
+    return JsonRegistry(database)
+
+
+if __name__ == "__main__":
+    registry = SqliteRegistry()
+    registry.export_json()
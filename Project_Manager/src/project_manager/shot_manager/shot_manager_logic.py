@@ -1,6 +1,7 @@
 import os
 from utils import io_utils as io
 from project_manager.depot_manager import depot_manager_logic
+from project_manager.registry import registry_logic
 try:
     from PySide6 import QtWidgets
 except ImportError:
@@ -24,27 +25,24 @@ class ShotManagerLogic:
         self.database = os.getenv("DATABASE")
         self.shotlist = fr"{self.database}\shotlist.json"
         self.structure = fr"{self.database}\structure.json"
+        self.registry = registry_logic.get_registry(self.database)
 
 
     def add_shot(self):
         """
         Adds shot information to shotlist json file.
         """
-        self.data = io.read_json(self.shotlist)
-
         shot_num = self.ui.shot_num_lineedit.text()
-        if shot_num not in self.data:
-            
-            new_data = {}
-            parms = ["lens_length", "aperture", "camera_height", 
-                     "iso", "nd_filter", "white_balance",
-                     "startframe", "endframe", "hdri"]
-
-            for i in parms:
-                new_data[i] = getattr(self.ui, f"{i}_lineedit").text()
-
-            self.data[shot_num] = new_data
-            io.write_json(self.shotlist, self.data)
+
+        new_data = {}
+        parms = ["lens_length", "aperture", "camera_height", 
+                 "iso", "nd_filter", "white_balance",
+                 "startframe", "endframe", "hdri"]
+
+        for i in parms:
+            new_data[i] = getattr(self.ui, f"{i}_lineedit").text()
+
+        if self.registry.add_shot(shot_num, new_data):
             logic = depot_manager_logic.DepotManagerLogic()
             logic.update_depot()
 
@@ -0,0 +1,74 @@
+import sqlite3
+import pytest
+from utils import io_utils
+from project_manager.registry import registry_logic
+
+
+def asset(id, hash):
+    return {"id": id, "name": f"asset_{id}", "type": "Prop", "hash": hash}
+
+
+def test_default_journal_mode_is_not_wal(tmp_path):
+    registry = registry_logic.SqliteRegistry(str(tmp_path))
+    mode = registry.connect().execute("PRAGMA journal_mode").fetchone()[0]
+    assert mode.lower() == "delete"
+
+
+def test_db_path_can_be_moved(tmp_path, monkeypatch):
+    db_path = str(tmp_path / "local" / "registry.db")
+    (tmp_path / "local").mkdir()
+    monkeypatch.setenv("REGISTRY_BACKEND", "sqlite")
+    monkeypatch.setenv("REGISTRY_DB", db_path)
+
+    registry = registry_logic.get_registry(str(tmp_path))
+    registry.add_asset(asset("a", "1"))
+    assert registry.db_path == db_path
+    assert sqlite3.connect(db_path).execute("SELECT id FROM assets").fetchall() == [("a",)]
+    assert not (tmp_path / "registry.db").exists()
+
+
+def test_json_entries_are_merged_on_every_open(tmp_path):
+    registry_logic.SqliteRegistry(str(tmp_path)).add_asset(asset("a", "1"))
+
+    # Added by a machine still on the json backend.
+    registry_logic.JsonRegistry(str(tmp_path)).add_asset(asset("b", "2"))
+
+    registry = registry_logic.SqliteRegistry(str(tmp_path))
+    assert set(registry.assets()) == {"a", "b"}
+    assert registry.asset_exists("2")
+
+
+def test_export_keeps_json_only_entries(tmp_path):
+    registry = registry_logic.SqliteRegistry(str(tmp_path))
+    registry.add_asset(asset("a", "1"))
+
+    registry_logic.JsonRegistry(str(tmp_path)).add_asset(asset("b", "2"))
+    registry.add_asset(asset("c", "3"))
+    registry.export_json()
+
+    assert set(io_utils.read_json(registry.assetlist)) == {"a", "b", "c"}
+    assert set(registry.assets()) == {"a", "b", "c"}
+
+
+def test_unchanged_json_is_not_read_on_open(tmp_path, monkeypatch):
+    registry_logic.JsonRegistry(str(tmp_path)).add_asset(asset("a", "1"))
+    registry_logic.SqliteRegistry(str(tmp_path))
+
+    reads = []
+    read_json = io_utils.read_json
+    monkeypatch.setattr(io_utils, "read_json", lambda file: reads.append(file) or read_json(file))
+    registry = registry_logic.SqliteRegistry(str(tmp_path))
+    assert reads == []
+    assert set(registry.assets()) == {"a"}
+
+
+def test_add_only_writes_its_own_entry(tmp_path, monkeypatch):
+    registry = registry_logic.SqliteRegistry(str(tmp_path))
+    registry.add_asset(asset("a", "1"))
+    monkeypatch.setattr(registry, "assets", lambda *args: pytest.fail("add read every asset"))
+
+    assert registry.add_asset(asset("b", "2"))
+    assert not registry.add_asset(asset("c", "2"))
+    assert registry.add_shot("010", {"startframe": "1001"})
+    assert set(io_utils.read_json(registry.assetlist)) == {"a", "b"}
+    assert set(io_utils.read_json(registry.shotlist)) == {"010"}
@@ -0,0 +1,92 @@
+import numpy as np
+from pxr import Usd, UsdGeom, Vt
+from usd_tools import transforms
+
+
+def compute_extent(points: np.ndarray) -> np.ndarray:
+    """
+    Gets the extent of a points array.
+
+    Args:
+        points (np.ndarray): Points, shape (n, 3).
+
+    Returns:
+        np.ndarray: Min and max corners, shape (2, 3).
+    """
+    return np.stack([points.min(axis=0), points.max(axis=0)])
+
+
+def compute_extents(stage: Usd.Stage) -> int:
+    """
+    Authors extent on every point based primitive from its points, for each time sample.
+
+    Args:
+        stage (Usd.Stage): Stage to author extents on.
+
+    Returns:
+        int: Number of primitives given an extent.
+    """
+    count = 0
+    for prim in stage.Traverse():
+        if not prim.IsA(UsdGeom.PointBased):
+            continue
+
+        point_based = UsdGeom.PointBased(prim)
+        points_attr = point_based.GetPointsAttr()
+        if not points_attr.HasAuthoredValue():
+            continue
+
+        times = points_attr.GetTimeSamples()
+        extents = {}
+        for t in times or [None]:
+            points = points_attr.Get(Usd.TimeCode.Default() if t is None else t)
+            if points is None or not len(points):
+                continue
+            extent = compute_extent(np.asarray(points, dtype=np.float32))
+            extents[t] = Vt.Vec3fArray.FromNumpy(extent)
+
+        if not extents:
+            continue
+
+        # Old samples would override a static default, and outlive animated ones.
+        extent_attr = point_based.CreateExtentAttr()
+        extent_attr.Clear()
+        transforms.write_values(extent_attr, extents)
+        count += 1
+
+    return count
+
+
+def author_extents_hint(prim: Usd.Prim) -> int:
+    """
+    Authors extentsHint on a model root from the extents below it.
+
+    The hint is sampled at every time an extent or transform below the primitive
+    is sampled, so bounds stay correct for animated assets.
+
+    Args:
+        prim (Usd.Prim): Model root primitive, e.g. /Scene/Assets/Prop/Birdfeeder.
+
+    Returns:
+        int: Number of time samples authored, 0 for a single static hint.
+    """
+    times = set()
+    for child in Usd.PrimRange(prim):
+        if child.IsA(UsdGeom.Boundable):
+            times.update(UsdGeom.Boundable(child).GetExtentAttr().GetTimeSamples())
+        if child.IsA(UsdGeom.Xformable):
+            for op in UsdGeom.Xformable(child).GetOrderedXformOps():
+                times.update(op.GetTimeSamples())
+
+    purposes = [UsdGeom.Tokens.default_, UsdGeom.Tokens.render, UsdGeom.Tokens.proxy]
+    bbox_cache = UsdGeom.BBoxCache(Usd.TimeCode.Default(), purposes, useExtentsHint=False)
+    model_api = UsdGeom.ModelAPI.Apply(prim)
+
+    if not times:
+        model_api.SetExtentsHint(model_api.ComputeExtentsHint(bbox_cache))
+        return 0
+
+    for t in sorted(times):
+        bbox_cache.SetTime(t)
+        model_api.SetExtentsHint(model_api.ComputeExtentsHint(bbox_cache), t)
+    return len(times)
@@ -1,4 +1,7 @@
+import time
 from pxr import Usd, UsdShade, UsdGeom, Sdf
+from usd_tools import rules
+from usd_tools.edit_session import edit_session
 
 
 def recursive_move_prims(stage: Usd.Stage, root_prim: Usd.Prim, path: str) -> Usd.Stage:
@@ -13,23 +16,147 @@ def recursive_move_prims(stage: Usd.Stage, root_prim: Usd.Prim, path: str) -> Us
     Returns:
         Usd.Stage: Stage with reparented prims.
     """
-    for prim in root_prim.GetChildren():
-        type = prim.GetTypeName()
-        name = prim.GetName()
-        
-        new_path = f"{path}/{name}"
-        new_prim = stage.DefinePrim(new_path, type)
+    with edit_session(stage) as session:
+        for prim in root_prim.GetChildren():
+            type = prim.GetTypeName()
+            name = prim.GetName()
+            
+            new_path = f"{path}/{name}"
+            new_prim = stage.DefinePrim(new_path, type)
+            
+            transfer_all(prim, new_prim)
+            transfer_material(prim, new_prim)
+
+            if len(prim.GetChildren()) > 0:
+                stage = recursive_move_prims(stage, prim, new_path)
         
-        transfer_all(prim, new_prim)
-        transfer_material(prim, new_prim)
+        session.remove_prim(root_prim.GetPath())
+    return stage
+
+
+def relocate_prims(stage: Usd.Stage, root_prim: Usd.Prim, path: str) -> Usd.Stage:
+    """
+    Reparents all children of given primitive to a new parent with a single layer namespace edit.
+
+    Whole subtrees are moved as specs on the root layer rather than re-created prim
+    by prim. Material bindings are replaced by a mat primvar and non-integer time
+    samples are dropped, matching recursive_move_prims. Falls back to
+    recursive_move_prims if the root layer doesn't hold the prims or the edit fails.
+
+    Args:
+        stage (Usd.Stage): Input Stage, expected to be flattened.
+        root_prim (Usd.Prim): Primitive whose children are moved.
+        path (str): New path to move primitives under.
+
+    Returns:
+        Usd.Stage: Stage with reparented prims.
+    """
+    layer = stage.GetRootLayer()
+    src_root = root_prim.GetPath()
+    dst_root = Sdf.Path(path)
+    root_spec = layer.GetPrimAtPath(src_root)
+
+    if root_spec is None or any(layer.GetPrimAtPath(dst_root.AppendChild(c.name)) for c in root_spec.nameChildren):
+        return recursive_move_prims(stage, root_prim, path)
+
+    # Read material names before the move, while bindings still resolve.
+    materials = {}
+    for prim in Usd.PrimRange(root_prim):
+        if prim == root_prim:
+            continue
+        name = get_material_name(prim)
+        if name:
+            materials[prim.GetPath().ReplacePrefix(src_root, dst_root)] = name
+
+    edit = Sdf.BatchNamespaceEdit()
+    moved = []
+    for child in root_spec.nameChildren:
+        moved.append(dst_root.AppendChild(child.name))
+        edit.Add(child.path, moved[-1])
+    edit.Add(Sdf.NamespaceEdit.Remove(src_root))
+
+    if not layer.Apply(edit):
+        return recursive_move_prims(stage, root_prim, path)
+
+    prim_paths = []
+    attr_paths = []
+    def collect(spec_path):
+        if spec_path.IsPrimPath():
+            prim_paths.append(spec_path)
+        elif spec_path.IsPropertyPath() and layer.GetAttributeAtPath(spec_path):
+            attr_paths.append(spec_path)
+
+    with Sdf.ChangeBlock():
+        for moved_path in moved:
+            layer.Traverse(moved_path, collect)
+
+        for attr_path in attr_paths:
+            for t in layer.ListTimeSamplesForPath(attr_path):
+                if not float(t).is_integer():
+                    layer.EraseTimeSample(attr_path, t)
+
+        for prim_path in prim_paths:
+            prim_spec = layer.GetPrimAtPath(prim_path)
+            for rel in list(prim_spec.relationships):
+                if rel.name.startswith("material:binding"):
+                    prim_spec.RemoveProperty(rel)
+            _remove_api_schema(prim_spec, "MaterialBindingAPI")
+
+            name = materials.get(prim_path)
+            if name:
+                mat_spec = layer.GetAttributeAtPath(prim_path.AppendProperty("primvars:mat"))
+                if mat_spec is None:
+                    mat_spec = Sdf.AttributeSpec(prim_spec, "primvars:mat", Sdf.ValueTypeNames.String)
+                mat_spec.default = name
 
-        if len(prim.GetChildren()) > 0:
-            stage = recursive_move_prims(stage, prim, new_path)
-    
-    stage.RemovePrim(root_prim.GetPath())
     return stage
 
 
+def move_prims(stage: Usd.Stage, root_prim: Usd.Prim, path: str, mode="layer") -> Usd.Stage:
+    """
+    Reparents all children of given primitive to a new parent.
+
+    Args:
+        stage (Usd.Stage): Input Stage.
+        root_prim (Usd.Prim): Primitive whose children are moved.
+        path (str): New path to move primitives under.
+        mode (str, optional): "layer" for a single namespace edit, "prim" to re-create
+            prims one by one. Defaults to "layer".
+
+    Returns:
+        Usd.Stage: Stage with reparented prims.
+    """
+    if mode == "prim":
+        return recursive_move_prims(stage, root_prim, path)
+    return relocate_prims(stage, root_prim, path)
+
+
+def _remove_api_schema(prim_spec: Sdf.PrimSpec, schema: str):
+    """
+    Removes an applied API schema from a prim spec's apiSchemas list op.
+
+    The list op is cleared once no items are left, rather than left behind empty.
+
+    Args:
+        prim_spec (Sdf.PrimSpec): Prim spec to edit.
+        schema (str): API schema name to remove.
+    """
+    if not prim_spec.HasInfo("apiSchemas"):
+        return
+
+    op = prim_spec.GetInfo("apiSchemas")
+    if op.isExplicit:
+        op.explicitItems = [i for i in op.explicitItems if i != schema]
+    else:
+        op.prependedItems = [i for i in op.prependedItems if i != schema]
+        op.appendedItems = [i for i in op.appendedItems if i != schema]
+
+    if any((op.explicitItems, op.addedItems, op.prependedItems, op.appendedItems, op.deletedItems, op.orderedItems)):
+        prim_spec.SetInfo("apiSchemas", op)
+    else:
+        prim_spec.ClearInfo("apiSchemas")
+
+
 def set_prim_defaults(prim: Usd.Prim):
     """
     Sets intended default values on given primitive.
@@ -39,9 +166,10 @@ def set_prim_defaults(prim: Usd.Prim):
     """
     if prim.IsA("Mesh"):
         mesh = UsdGeom.Mesh(prim)
-        mesh.GetNormalsAttr().Clear()
-        mesh.GetSubdivisionSchemeAttr().Set("catmullClark")
-        mesh.GetOrientationAttr().Set(UsdGeom.Tokens.rightHanded)
+        with edit_session(prim.GetStage()) as session:
+            session.clear_values(mesh.GetNormalsAttr())
+            session.set_default(mesh.GetSubdivisionSchemeAttr(), "catmullClark")
+            session.set_default(mesh.GetOrientationAttr(), UsdGeom.Tokens.rightHanded)
 
 
 def transfer_material(from_prim: Usd.Prim, to_prim: Usd.Prim):
@@ -52,30 +180,168 @@ def transfer_material(from_prim: Usd.Prim, to_prim: Usd.Prim):
         from_prim (Usd.Prim): Primitive with material.
         to_prim (Usd.Prim): Primitive to put mat primvar on.
     """
-    binding_api = UsdShade.MaterialBindingAPI(from_prim)
-    material = binding_api.GetDirectBinding().GetMaterial()
+    name = get_material_name(from_prim)
     
-    if material:
-        name = str(material.GetPath()).split("/")[-1]
+    if name:
         primvars_api = UsdGeom.PrimvarsAPI(to_prim)
         var = primvars_api.CreatePrimvar("mat", Sdf.ValueTypeNames.String)
         var.Set(name)
 
 
-def flatten_stage(stage: Usd.Stage) -> Usd.Stage:
+def get_material_name(prim: Usd.Prim) -> str | None:
+    """
+    Gets name of the material directly bound to given primitive.
+
+    Args:
+        prim (Usd.Prim): Primitive with material.
+
+    Returns:
+        str | None: Material name, None if no material is bound.
+    """
+    binding_api = UsdShade.MaterialBindingAPI(prim)
+    material = binding_api.GetDirectBinding().GetMaterial()
+
+    if material:
+        return str(material.GetPath()).split("/")[-1]
+    return None
+
+
+def flatten_stage(stage: Usd.Stage, root=None) -> Usd.Stage:
     """
     Flattens Usd stage.
 
     Args:
         stage (Usd.Stage): Stage to flatten.
+        root (str, optional): Only flatten the subtree at this prim path. Defaults to None.
 
     Returns:
         Usd.Stage: Flattened Stage.
     """
-    layer = stage.Flatten()
+    layer = flatten_layer(stage, root)
     return Usd.Stage.Open(layer)
 
 
+def flatten_layer(stage: Usd.Stage, root=None, add_source_comment=False) -> Sdf.Layer:
+    """
+    Flattens Usd stage into an anonymous layer without composing a new stage.
+
+    With a root path the stage's layers are reopened with a population mask, so
+    only the subtree and its ancestors are composed and written.
+
+    Args:
+        stage (Usd.Stage): Stage to flatten.
+        root (str, optional): Only flatten the subtree at this prim path. Defaults to None.
+        add_source_comment (bool, optional): Name the source layer in the layer's
+            documentation. Defaults to False, so identical stages flatten to identical layers.
+
+    Returns:
+        Sdf.Layer: Flattened layer.
+    """
+    if root is not None:
+        mask = Usd.StagePopulationMask([Sdf.Path(root)])
+        stage = Usd.Stage.OpenMasked(stage.GetRootLayer(), stage.GetSessionLayer(), mask)
+
+    return stage.Flatten(addSourceFileComment=add_source_comment)
+
+
+def flatten_to_file(stage: Usd.Stage, path: str, root=None) -> str:
+    """
+    Flattens Usd stage and writes the result straight to disk.
+
+    Args:
+        stage (Usd.Stage): Stage to flatten.
+        path (str): File to write.
+        root (str, optional): Only flatten the subtree at this prim path. Defaults to None.
+
+    Raises:
+        RuntimeError: If the layer fails to export.
+
+    Returns:
+        str: Written file path.
+    """
+    layer = flatten_layer(stage, root)
+    if not layer.Export(path):
+        raise RuntimeError(f"Failed to export flattened Usd file: {path}")
+    return path
+
+
+def get_layer_stack(layer: Sdf.Layer) -> list[Sdf.Layer]:
+    """
+    Gets a layer and all of its sublayers, strongest first, without composing a stage.
+
+    Args:
+        layer (Sdf.Layer): Root layer.
+
+    Returns:
+        list[Sdf.Layer]: Layers in the layer stack.
+    """
+    layers = [layer]
+    for sub_path in layer.subLayerPaths:
+        sub_layer = Sdf.Layer.FindOrOpenRelativeToLayer(layer, sub_path)
+        if sub_layer and sub_layer not in layers:
+            layers.extend(get_layer_stack(sub_layer))
+    return layers
+
+
+def find_prim_specs(layer: Sdf.Layer, predicate) -> list[Sdf.Path]:
+    """
+    Finds prim specs in a layer stack without composing a stage.
+
+    Args:
+        layer (Sdf.Layer): Root layer.
+        predicate (Callable[[Sdf.PrimSpec], bool]): Returns true for specs to find.
+
+    Returns:
+        list[Sdf.Path]: Paths of matching prim specs.
+    """
+    paths = []
+    seen = set()
+    for stack_layer in get_layer_stack(layer):
+        def visit(path, stack_layer=stack_layer):
+            if path.IsPrimPath() and path not in seen and predicate(stack_layer.GetPrimAtPath(path)):
+                seen.add(path)
+                paths.append(path)
+        stack_layer.Traverse(Sdf.Path.absoluteRootPath, visit)
+    return paths
+
+
+def mask_excluding(layer: Sdf.Layer, names: list[str]) -> Usd.StagePopulationMask:
+    """
+    Builds a population mask holding every prim in a layer stack except named subtrees.
+
+    Args:
+        layer (Sdf.Layer): Root layer.
+        names (list[str]): Prim names to leave out, e.g. ["mtl"].
+
+    Returns:
+        Usd.StagePopulationMask: Mask of all other prims.
+    """
+    excluded = find_prim_specs(layer, lambda spec: spec.name in names)
+    if not excluded:
+        return Usd.StagePopulationMask.All()
+
+    layers = get_layer_stack(layer)
+    mask = Usd.StagePopulationMask()
+
+    def include(path):
+        children = []
+        for stack_layer in layers:
+            spec = stack_layer.GetPrimAtPath(path)
+            if spec:
+                children += [c.path for c in spec.nameChildren if c.path not in children]
+
+        for child in children:
+            if child in excluded:
+                continue
+            if any(e.HasPrefix(child) for e in excluded):
+                include(child)
+            else:
+                mask.Add(child)
+
+    include(Sdf.Path.absoluteRootPath)
+    return mask
+
+
 def get_stage_root_prims(stage: Usd.Stage) -> list[Usd.Prim]:
     """
     Gets all primitives under root of the stage.
@@ -129,16 +395,9 @@ def remove_meshes(stage: Usd.Stage) -> Usd.Stage:
     Returns:
         Usd.Stage: Stage with meshes removed.
     """
-    to_remove = []
-
-    for prim in stage.Traverse():
-        if prim.IsA("Mesh"):
-            to_remove.append(prim)
-
-    for prim in to_remove:
-        stage.RemovePrim(prim.GetPath())
-    
-    return stage
+    engine = rules.RuleEngine()
+    engine.remove_type("Mesh")
+    return engine.run(stage)
 
 
 def remove_mats(stage: Usd.Stage) -> Usd.Stage:
@@ -153,80 +412,71 @@ def remove_mats(stage: Usd.Stage) -> Usd.Stage:
     """
 
     "Currently designed to remove materials from USD files coming from Maya."
-    to_remove = []
-
-    for prim in stage.Traverse():
-        if prim.GetName() == "mtl":
-            to_remove.append(prim)
-
-    for prim in to_remove:
-        stage.RemovePrim(prim.GetPath())
-
-    return stage
+    engine = rules.RuleEngine()
+    engine.remove_name("mtl")
+    return engine.run(stage)
 
 
-def create_new_camera(stage: Usd.Stage, path: str) -> Usd.Stage:
+def create_new_camera(stage: Usd.Stage, path: str, prims=None) -> Usd.Stage:
     """
-    Creates camera primitive.
+    Creates camera primitive from the camera and its parent transform on the stage.
 
     Args:
-        stage (Usd.Stage): Stage to create camera on.
+        stage (Usd.Stage): Stage to create camera on, with kind metadata already cleared.
         path (str): Path for the camera primitive to be made.
+        prims (list[Usd.Prim], optional): Primitives on the stage, as gathered by the cleanup pass.
+            Defaults to None, traversing the stage.
 
     Returns:
         Usd.Stage: Stage with camera primitive.
     """
-    prims = []
+    if prims is None:
+        prims = list(stage.Traverse())
 
-    for prim in stage.Traverse():
+    with edit_session(stage) as session:
+        stage = define_asset_hierarchy(stage, path)
 
-        if prim.HasAuthoredMetadata("kind"):
-            prim.ClearMetadata("kind")
-        prims.append(prim)
+        new_path = f"{path}/RenderCam"
+        new_prim = UsdGeom.Camera.Define(stage, new_path).GetPrim()
 
-    stage = define_asset_hierarchy(stage, path)
+        stage.SetDefaultPrim(stage.GetPrimAtPath(new_path))
 
-    new_path = f"{path}/RenderCam"
-    new_prim = UsdGeom.Camera.Define(stage, new_path).GetPrim()
-
-    stage.SetDefaultPrim(stage.GetPrimAtPath(new_path))
-
-    if len(prims) == 1:
-        cam = prims[0]
-        for src_attr in cam.GetAttributes():
+        if len(prims) == 1:
+            cam = prims[0]
+            for src_attr in cam.GetAttributes():
             
-            if not src_attr.HasAuthoredValue() or src_attr.GetName().startswith("xformOp"):
-                continue
+                if not src_attr.HasAuthoredValue() or src_attr.GetName().startswith("xformOp"):
+                    continue
             
-            dst_attr = new_prim.CreateAttribute(src_attr.GetName(), src_attr.GetTypeName())
-            handle_attribute_transfer(src_attr, dst_attr)
+                dst_attr = new_prim.CreateAttribute(src_attr.GetName(), src_attr.GetTypeName())
+                handle_attribute_transfer(src_attr, dst_attr)
         
-        transfer_xform_ops(new_prim, cam)
+            transfer_xform_ops(new_prim, cam)
 
-    elif len(prims) == 2:
-        cam = None
-        xform = None
+        elif len(prims) == 2:
+            cam = None
+            xform = None
 
-        for prim in prims:
-            if prim.IsA("Camera"):
-                cam = prim
-            if prim.IsA("Xform"):
-                xform = prim
+            for prim in prims:
+                if prim.IsA("Camera"):
+                    cam = prim
+                if prim.IsA("Xform"):
+                    xform = prim
 
-        for attr in cam.GetAttributes():
+            for attr in cam.GetAttributes():
             
-            if not attr.HasAuthoredValue():
-                continue
+                if not attr.HasAuthoredValue():
+                    continue
             
-            new_attr = new_prim.CreateAttribute(attr.GetName(), attr.GetTypeName())
+                new_attr = new_prim.CreateAttribute(attr.GetName(), attr.GetTypeName())
 
-            if attr.Get():
-                new_attr.Set(attr.Get())
+                if attr.Get():
+                    new_attr.Set(attr.Get())
 
-        transfer_xform_ops(new_prim, xform)
+            transfer_xform_ops(new_prim, xform)
     
-    for prim in prims:
-        stage.RemovePrim(prim.GetPath())
+        for prim in prims:
+            session.remove_prim(prim.GetPath())
 
     return stage
 
@@ -242,16 +492,18 @@ def transfer_xform_ops(src_prim: Usd.Prim, dst_prim: Usd.Prim):
     dst_xf = UsdGeom.Xformable(dst_prim)
     src_xf = UsdGeom.Xformable(src_prim)
 
+    existing_ops = {(op.GetOpName().split(":")[-1], op.GetOpType()) for op in dst_xf.GetOrderedXformOps()}
+
     for src_op in src_xf.GetOrderedXformOps():
         op_type = src_op.GetOpType()
         precision = src_op.GetPrecision()
         op_name = src_op.GetOpName().split(":")[-1]
 
         # Check if operation already exists in the destination Xformable
-        existing_ops = dst_xf.GetOrderedXformOps()
-        if any(op.GetOpName().split(":")[-1] == op_name and op.GetOpType() == op_type for op in existing_ops):
+        if (op_name, op_type) in existing_ops:
             # If operation already exists then continue
             continue
+        existing_ops.add((op_name, op_type))
 
         # If operation doesn't exist, add it to the destination Xformable
         dst_op = dst_xf.AddXformOp(
@@ -295,8 +547,8 @@ def transfer_primvars(src_prim: Usd.Prim, dst_prim: Usd.Prim):
             # If primvar indices exist, create on dest primvar and set
 
             if src_pv_indices.ValueMightBeTimeVarying():
-                for t in src_pv_indices.GetTimeSamples():
-                    dst_pv.SetIndices(src_pv_indices.Get(t), t)
+                dst_pv_indices = dst_pv.CreateIndicesAttr()
+                transfer_time_samples(dst_pv_indices, src_pv_indices, integer_only=False)
             else:
                 dst_pv.SetIndices(src_pv_indices.Get())
 
@@ -338,21 +590,101 @@ def transfer_all(src_prim: Usd.Prim, dst_prim: Usd.Prim):
         handle_attribute_transfer(dst_attr, attr)
 
 
-def handle_attribute_transfer(new: Usd.Attribute, old: Usd.Attribute):
+def handle_attribute_transfer(new: Usd.Attribute, old: Usd.Attribute, bulk=None):
     """
     Transfers one attribute from one primitive to another.
 
     Args:
         new (Usd.Attribute): Primitive to transfer values to.
         old (Usd.Attribute): Primitive to transfer values from.
+        bulk (bool, optional): Write time samples straight to the edit target layer in
+            one change block. Defaults to BULK_TRANSFER.
     """
 
     if old.ValueMightBeTimeVarying() or old.GetNumTimeSamples() > 0:
         new.Clear()
-        for t in old.GetTimeSamples():
-            if float(t).is_integer():
-                new.Set(old.Get(t), t)
+        transfer_time_samples(new, old, integer_only=True, bulk=bulk)
             
     else:
         new.Set(old.Get())
 
+
+# Toggles the bulk time sample path used by handle_attribute_transfer and transfer_primvars.
+BULK_TRANSFER = True
+
+_transfer_stats = {
+    "bulk": {"samples": 0, "seconds": 0.0},
+    "per_sample": {"samples": 0, "seconds": 0.0},
+}
+
+
+def transfer_time_samples(new: Usd.Attribute, old: Usd.Attribute, integer_only=True, bulk=None) -> int:
+    """
+    Copies time samples from one attribute to another.
+
+    The bulk path reads samples through a Usd.AttributeQuery and writes them to the
+    edit target layer inside a single Sdf.ChangeBlock, so the stage processes one
+    change notification instead of one per sample. Falls back to per-sample
+    Usd authoring when the values need Usd's type casting.
+
+    Args:
+        new (Usd.Attribute): Attribute to transfer samples to.
+        old (Usd.Attribute): Attribute to transfer samples from.
+        integer_only (bool, optional): Only transfer samples on whole frames. Defaults to True.
+        bulk (bool, optional): Use the bulk path. Defaults to BULK_TRANSFER.
+
+    Returns:
+        int: Number of samples transferred.
+    """
+    if bulk is None:
+        bulk = BULK_TRANSFER
+
+    start = time.perf_counter()
+    query = Usd.AttributeQuery(old)
+    samples = [(t, query.Get(t)) for t in query.GetTimeSamples() if not integer_only or float(t).is_integer()]
+
+    edit_target = new.GetStage().GetEditTarget()
+    layer = edit_target.GetLayer()
+    spec_path = edit_target.MapToSpecPath(new.GetPath())
+
+    # Plain python values would be stored as python's types rather than the attribute's.
+    if bulk and layer.GetAttributeAtPath(spec_path) and not any(isinstance(v, (bool, int, float, str)) for _, v in samples):
+        mode = "bulk"
+        with Sdf.ChangeBlock():
+            for t, value in samples:
+                layer.SetTimeSample(spec_path, t, value)
+    else:
+        mode = "per_sample"
+        for t, value in samples:
+            new.Set(value, t)
+
+    _transfer_stats[mode]["samples"] += len(samples)
+    _transfer_stats[mode]["seconds"] += time.perf_counter() - start
+    return len(samples)
+
+
+def get_transfer_stats() -> dict[str, dict[str, float]]:
+    """
+    Gets time sample transfer throughput for the bulk and per-sample paths.
+
+    Returns:
+        dict[str, dict[str, float]]: Samples, seconds and samples per second for each path.
+    """
+    stats = {}
+    for mode, values in _transfer_stats.items():
+        seconds = values["seconds"]
+        stats[mode] = {
+            "samples": values["samples"],
+            "seconds": seconds,
+            "samples_per_second": values["samples"] / seconds if seconds else 0.0,
+        }
+    return stats
+
+
+def reset_transfer_stats():
+    """
+    Resets time sample transfer throughput counters.
+    """
+    for values in _transfer_stats.values():
+        values["samples"] = 0
+        values["seconds"] = 0.0
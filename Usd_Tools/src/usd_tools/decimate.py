@@ -0,0 +1,210 @@
+import numpy as np
+from pxr import Usd, UsdGeom, Sdf, Vt
+from usd_tools import bounds
+
+
+# Meshes with fewer points than this are light enough to use as their own proxy.
+MIN_POINTS = 500
+
+# Passes spent adjusting the cell size towards the target point count.
+CELL_ITERATIONS = 8
+
+
+def triangulate(counts: np.ndarray, indices: np.ndarray) -> np.ndarray:
+    """
+    Fan triangulates polygons.
+
+    Args:
+        counts (np.ndarray): Face vertex counts.
+        indices (np.ndarray): Face vertex indices.
+
+    Returns:
+        np.ndarray: Triangle vertex indices, shape (n, 3).
+    """
+    counts = counts.astype(np.int64)
+    valid = counts >= 3
+    starts = (np.cumsum(counts) - counts)[valid]
+    tri_counts = counts[valid] - 2
+
+    face_starts = np.repeat(starts, tri_counts)
+    local = np.arange(tri_counts.sum()) - np.repeat(np.cumsum(tri_counts) - tri_counts, tri_counts)
+    return np.stack([indices[face_starts], indices[face_starts + 1 + local], indices[face_starts + 2 + local]], axis=1)
+
+
+def cluster_points(points: np.ndarray, cell_size: float) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Merges points that share a grid cell into their mean.
+
+    Args:
+        points (np.ndarray): Points, shape (n, 3).
+        cell_size (float): Grid cell size.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: Cluster index of each point and the cluster points.
+    """
+    cells = np.floor((points - points.min(axis=0)) / cell_size).astype(np.int64)
+    _, clusters = np.unique(cells, axis=0, return_inverse=True)
+    clusters = clusters.reshape(-1)
+
+    sizes = np.bincount(clusters)
+    clustered = np.stack([np.bincount(clusters, weights=points[:, i]) for i in range(3)], axis=1)
+    return clusters, clustered / sizes[:, None]
+
+
+def find_cell_size(points: np.ndarray, target: int) -> float:
+    """
+    Finds a grid cell size that clusters points down to roughly a target count.
+
+    Args:
+        points (np.ndarray): Points, shape (n, 3).
+        target (int): Wanted number of clusters.
+
+    Returns:
+        float: Cell size, 1.0 if the points have no extent, as any size puts them in one cell.
+    """
+    target = max(target, 1)
+    diagonal = np.linalg.norm(points.max(axis=0) - points.min(axis=0))
+    if diagonal == 0.0:
+        return 1.0
+
+    cell_size = diagonal / np.sqrt(target)
+    for _ in range(CELL_ITERATIONS):
+        count = len(np.unique(np.floor((points - points.min(axis=0)) / cell_size).astype(np.int64), axis=0))
+        if abs(count - target) <= 0.1 * target:
+            break
+        # Surface meshes gain points with the square of the cell count along an edge.
+        cell_size *= np.sqrt(count / target)
+    return cell_size
+
+
+def decimate(counts: np.ndarray, indices: np.ndarray, points: np.ndarray, ratio: float) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Decimates a mesh by vertex clustering.
+
+    Points are snapped to a grid sized so roughly ratio of them remain, then
+    triangles that collapse or repeat are dropped.
+
+    Args:
+        counts (np.ndarray): Face vertex counts.
+        indices (np.ndarray): Face vertex indices.
+        points (np.ndarray): Points, shape (n, 3).
+        ratio (float): Fraction of points to keep, e.g. 0.1.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray, np.ndarray]: Face vertex counts, face vertex indices
+            and points of the triangulated result.
+    """
+    clusters, clustered = cluster_points(points, find_cell_size(points, int(len(points) * ratio)))
+    triangles = clusters[triangulate(counts, indices)]
+
+    collapsed = (triangles[:, 0] == triangles[:, 1]) | (triangles[:, 1] == triangles[:, 2]) | (triangles[:, 0] == triangles[:, 2])
+    triangles = triangles[~collapsed]
+    _, first = np.unique(np.sort(triangles, axis=1), axis=0, return_index=True)
+    triangles = triangles[np.sort(first)]
+
+    used, triangles = np.unique(triangles, return_inverse=True)
+    triangles = triangles.reshape(-1, 3)
+    return np.full(len(triangles), 3, dtype=np.int32), triangles.reshape(-1).astype(np.int32), clustered[used]
+
+
+def is_constant_primvar(prim: Usd.Prim, name: str) -> bool:
+    """
+    Checks if a primvar has constant interpolation, the fallback when none is authored.
+
+    Args:
+        prim (Usd.Prim): Primitive with the primvar.
+        name (str): Primvar attribute name, e.g. primvars:mat.
+
+    Returns:
+        bool: Returns true if the primvar is constant.
+    """
+    primvar = UsdGeom.Primvar(prim.GetAttribute(name))
+    return bool(primvar) and primvar.GetInterpolation() == UsdGeom.Tokens.constant
+
+
+def author_proxy(prim: Usd.Prim, ratio: float) -> Usd.Prim | None:
+    """
+    Authors a decimated proxy purpose copy of a mesh next to it.
+
+    The original becomes render purpose and points at the proxy with proxyPrim.
+    Only constant primvars are kept on the proxy, as the rest no longer line up
+    with its points and faces.
+
+    Args:
+        prim (Usd.Prim): Static mesh.
+        ratio (float): Fraction of points to keep.
+
+    Returns:
+        Usd.Prim | None: Proxy mesh, None if the mesh is animated, too small or
+            already has a purpose or proxy.
+    """
+    mesh = UsdGeom.Mesh(prim)
+    proxy_path = prim.GetPath().GetParentPath().AppendChild(f"{prim.GetName()}_proxy")
+    if mesh.GetPurposeAttr().Get() != UsdGeom.Tokens.default_ or prim.GetStage().GetPrimAtPath(proxy_path):
+        return None
+
+    points_attr = mesh.GetPointsAttr()
+    if points_attr.ValueMightBeTimeVarying():
+        return None
+
+    points = points_attr.Get()
+    counts = mesh.GetFaceVertexCountsAttr().Get()
+    indices = mesh.GetFaceVertexIndicesAttr().Get()
+    if not points or len(points) < MIN_POINTS or not counts or not indices:
+        return None
+
+    new_counts, new_indices, new_points = decimate(np.asarray(counts), np.asarray(indices), np.asarray(points, dtype=np.float64), ratio)
+    if not len(new_counts):
+        return None
+
+    layer = prim.GetStage().GetEditTarget().GetLayer()
+    Sdf.CopySpec(layer, prim.GetPath(), layer, proxy_path)
+
+    proxy_spec = layer.GetPrimAtPath(proxy_path)
+    for child in list(proxy_spec.nameChildren):
+        proxy_spec.RemoveNameChild(child)
+    for prop in list(proxy_spec.properties):
+        keep = prop.name.startswith("xformOp") or prop.name in ("purpose", "visibility", "orientation", "doubleSided")
+        if prop.name.startswith("primvars:"):
+            keep = is_constant_primvar(prim, prop.name.removesuffix(":indices"))
+        if not keep:
+            proxy_spec.RemoveProperty(prop)
+
+    proxy = UsdGeom.Mesh(prim.GetStage().GetPrimAtPath(proxy_path))
+    points = new_points.astype(np.float32)
+    proxy.CreatePointsAttr().Set(Vt.Vec3fArray.FromNumpy(points))
+    proxy.CreateFaceVertexCountsAttr().Set(Vt.IntArray.FromNumpy(new_counts))
+    proxy.CreateFaceVertexIndicesAttr().Set(Vt.IntArray.FromNumpy(new_indices))
+    proxy.CreateExtentAttr().Set(Vt.Vec3fArray.FromNumpy(bounds.compute_extent(points)))
+    proxy.CreateSubdivisionSchemeAttr().Set(UsdGeom.Tokens.none)
+    proxy.CreatePurposeAttr().Set(UsdGeom.Tokens.proxy)
+
+    mesh.CreatePurposeAttr().Set(UsdGeom.Tokens.render)
+    mesh.CreateProxyPrimRel().SetTargets([proxy_path])
+    return proxy.GetPrim()
+
+
+def author_proxies(stage: Usd.Stage, root: str, ratio=0.1) -> dict[str, int]:
+    """
+    Authors decimated proxy purpose meshes for every static mesh below a primitive.
+
+    Args:
+        stage (Usd.Stage): Stage to edit.
+        root (str): Primitive to search below, e.g. the asset's Geo prim.
+        ratio (float, optional): Fraction of points to keep. Defaults to 0.1.
+
+    Returns:
+        dict[str, int]: Meshes given a proxy, and their render and proxy point counts.
+    """
+    meshes = [prim for prim in Usd.PrimRange(stage.GetPrimAtPath(root)) if prim.IsA(UsdGeom.Mesh)]
+    stats = {"meshes": 0, "points": 0, "proxy_points": 0}
+
+    for prim in meshes:
+        proxy = author_proxy(prim, ratio)
+        if proxy is None:
+            continue
+        stats["meshes"] += 1
+        stats["points"] += len(UsdGeom.Mesh(prim).GetPointsAttr().Get())
+        stats["proxy_points"] += len(UsdGeom.Mesh(proxy).GetPointsAttr().Get())
+
+    return stats
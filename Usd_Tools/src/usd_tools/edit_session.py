@@ -0,0 +1,284 @@
+import os
+import threading
+from contextlib import contextmanager
+from pxr import Usd, Sdf
+
+
+# Set USD_TOOLS_EDIT_SESSIONS=0 to author every edit immediately, e.g. when debugging.
+EDIT_SESSIONS = os.getenv("USD_TOOLS_EDIT_SESSIONS", "1") != "0"
+
+_active = threading.local()
+
+
+class EditSession:
+    """
+    Collects edits to a stage and applies them together.
+
+    Edits are written to the edit target layer's specs inside one Sdf.ChangeBlock
+    and prim removals are applied as one namespace edit, so the stage processes a
+    single change notification. Edits without a spec on the edit target layer are
+    authored through the Usd API after the block.
+    """
+    def __init__(self, stage: Usd.Stage, enabled=None):
+        """
+        Initialise empty edit lists.
+
+        Args:
+            stage (Usd.Stage): Stage to edit.
+            enabled (bool, optional): Defer edits, otherwise apply them immediately. Defaults to EDIT_SESSIONS.
+        """
+        self.stage = stage
+        self.enabled = EDIT_SESSIONS if enabled is None else enabled
+        self.prims_to_remove = []
+        self.edits = []
+
+
+    def remove_prim(self, path: Sdf.Path):
+        """
+        Removes primitive at path.
+
+        Args:
+            path (Sdf.Path): Path of primitive to remove.
+        """
+        if not self.enabled:
+            self.stage.RemovePrim(path)
+            return
+        self.prims_to_remove.append(Sdf.Path(path))
+
+
+    def remove_property(self, prim: Usd.Prim, name: str):
+        """
+        Removes property from primitive.
+
+        Args:
+            prim (Usd.Prim): Primitive to edit.
+            name (str): Property name.
+        """
+        if not self.enabled:
+            prim.RemoveProperty(name)
+            return
+        self.edits.append(("remove_property", prim.GetPath().AppendProperty(name), prim, name))
+
+
+    def clear_metadata(self, prim: Usd.Prim, key: str):
+        """
+        Clears metadata on primitive.
+
+        Args:
+            prim (Usd.Prim): Primitive to edit.
+            key (str): Metadata key.
+        """
+        if not self.enabled:
+            prim.ClearMetadata(key)
+            return
+        self.edits.append(("clear_metadata", prim.GetPath(), prim, key))
+
+
+    def clear_values(self, attr: Usd.Attribute):
+        """
+        Clears default value and time samples of attribute.
+
+        Args:
+            attr (Usd.Attribute): Attribute to clear.
+        """
+        if not self.enabled:
+            attr.Clear()
+            return
+        self.edits.append(("clear_values", attr.GetPath(), attr, None))
+
+
+    def clear_at_time(self, attr: Usd.Attribute, time: float):
+        """
+        Clears a single time sample of attribute.
+
+        Args:
+            attr (Usd.Attribute): Attribute to edit.
+            time (float): Time sample to clear.
+        """
+        if not self.enabled:
+            attr.ClearAtTime(time)
+            return
+        self.edits.append(("clear_at_time", attr.GetPath(), attr, time))
+
+
+    def set_default(self, attr: Usd.Attribute, value, clear_samples=False):
+        """
+        Sets default value of attribute.
+
+        Args:
+            attr (Usd.Attribute): Attribute to edit.
+            value (Any): Value to set.
+            clear_samples (bool, optional): Clear all values first so the default is used at every time. Defaults to False.
+        """
+        if not self.enabled:
+            if clear_samples:
+                attr.Clear()
+            attr.Set(value)
+            return
+        if clear_samples:
+            self.clear_values(attr)
+        self.edits.append(("set_default", attr.GetPath(), attr, value))
+
+
+    def set_time_sample(self, attr: Usd.Attribute, time: float, value):
+        """
+        Sets a time sample of attribute.
+
+        Args:
+            attr (Usd.Attribute): Attribute to edit.
+            time (float): Time to set.
+            value (Any): Value to set.
+        """
+        if not self.enabled:
+            attr.Set(value, time)
+            return
+        self.edits.append(("set_time_sample", attr.GetPath(), attr, (time, value)))
+
+
+    def flush(self):
+        """
+        Applies all collected edits.
+        """
+        layer = self.stage.GetEditTarget().GetLayer()
+        removed = self._pruned_removals()
+        fallback = []
+
+        with Sdf.ChangeBlock():
+            for op, path, obj, arg in self.edits:
+                if any(path.HasPrefix(r) for r in removed):
+                    continue
+                if not self._apply_spec_edit(layer, op, path, arg):
+                    fallback.append((op, obj, arg))
+
+        for op, obj, arg in fallback:
+            if op == "remove_property":
+                obj.RemoveProperty(arg)
+            elif op == "clear_metadata":
+                obj.ClearMetadata(arg)
+            elif op == "clear_values":
+                obj.Clear()
+            elif op == "clear_at_time":
+                obj.ClearAtTime(arg)
+            elif op == "set_default":
+                obj.Set(arg)
+            elif op == "set_time_sample":
+                obj.Set(arg[1], arg[0])
+
+        self._remove_prims(layer, removed)
+        self.prims_to_remove = []
+        self.edits = []
+
+
+    def _apply_spec_edit(self, layer: Sdf.Layer, op: str, path: Sdf.Path, arg) -> bool:
+        """
+        Applies one edit to the edit target layer's specs.
+
+        Args:
+            layer (Sdf.Layer): Edit target layer.
+            op (str): Edit type.
+            path (Sdf.Path): Stage path of the edited object.
+            arg (Any): Edit argument.
+
+        Returns:
+            bool: False if the layer has no spec to edit.
+        """
+        spec_path = self.stage.GetEditTarget().MapToSpecPath(path)
+
+        if op == "remove_property":
+            spec = layer.GetPropertyAtPath(spec_path)
+            if spec is None:
+                return not self.stage.GetPrimAtPath(path.GetPrimPath()).HasProperty(arg)
+            spec.owner.RemoveProperty(spec)
+            return True
+
+        if op == "clear_metadata":
+            spec = layer.GetPrimAtPath(spec_path)
+            if spec is None:
+                return False
+            spec.ClearInfo(arg)
+            return True
+
+        spec = layer.GetAttributeAtPath(spec_path)
+        if spec is None:
+            return False
+
+        if op == "clear_values":
+            spec.ClearInfo("default")
+            spec.ClearInfo("timeSamples")
+        elif op == "clear_at_time":
+            layer.EraseTimeSample(spec_path, arg)
+        elif op == "set_default":
+            spec.default = arg
+        elif op == "set_time_sample":
+            layer.SetTimeSample(spec_path, *arg)
+        return True
+
+
+    def _pruned_removals(self) -> list[Sdf.Path]:
+        """
+        Gets prim removals without paths already covered by a removed ancestor.
+
+        Returns:
+            list[Sdf.Path]: Paths to remove.
+        """
+        removed = []
+        for path in sorted(set(self.prims_to_remove)):
+            if not any(path.HasPrefix(r) for r in removed):
+                removed.append(path)
+        return removed
+
+
+    def _remove_prims(self, layer: Sdf.Layer, paths: list[Sdf.Path]):
+        """
+        Removes prims from the edit target layer with one namespace edit.
+
+        Args:
+            layer (Sdf.Layer): Edit target layer.
+            paths (list[Sdf.Path]): Paths to remove.
+        """
+        if not paths:
+            return
+
+        edit_target = self.stage.GetEditTarget()
+        edit = Sdf.BatchNamespaceEdit()
+        for path in paths:
+            spec_path = edit_target.MapToSpecPath(path)
+            if layer.GetPrimAtPath(spec_path):
+                edit.Add(Sdf.NamespaceEdit.Remove(spec_path))
+
+        if not layer.Apply(edit):
+            for path in paths:
+                self.stage.RemovePrim(path)
+
+
+@contextmanager
+def edit_session(stage: Usd.Stage, enabled=None):
+    """
+    Runs a block of edits inside an edit session on given stage.
+
+    Nested calls on the same stage join the outermost session, which applies the
+    edits when it exits. Edits are dropped if the block raises.
+
+    Args:
+        stage (Usd.Stage): Stage to edit.
+        enabled (bool, optional): Defer edits, otherwise apply them immediately. Defaults to EDIT_SESSIONS.
+
+    Yields:
+        EditSession: Session to add edits to.
+    """
+    sessions = getattr(_active, "sessions", None)
+    if sessions is None:
+        sessions = _active.sessions = []
+
+    for session in sessions:
+        if session.stage == stage:
+            yield session
+            return
+
+    session = EditSession(stage, enabled)
+    sessions.append(session)
+    try:
+        yield session
+        session.flush()
+    finally:
+        sessions.remove(session)
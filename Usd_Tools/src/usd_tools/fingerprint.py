@@ -0,0 +1,187 @@
+import hashlib
+import numpy as np
+from pxr import Usd, Sdf, Gf, Tf
+
+
+# customLayerData key the fingerprint is published under.
+FINGERPRINT_KEY = "usd_tools:fingerprint"
+
+
+# Sdf list op fields, hashed in this order.
+LIST_OP_FIELDS = ("isExplicit", "explicitItems", "addedItems", "prependedItems", "appendedItems", "deletedItems", "orderedItems")
+
+LIST_OP_TYPES = (Sdf.TokenListOp, Sdf.StringListOp, Sdf.PathListOp, Sdf.ReferenceListOp, Sdf.PayloadListOp,
+                 Sdf.IntListOp, Sdf.Int64ListOp, Sdf.UIntListOp, Sdf.UInt64ListOp)
+
+QUAT_TYPES = (Gf.Quath, Gf.Quatf, Gf.Quatd)
+
+RANGE_TYPES = (Gf.Range1f, Gf.Range1d, Gf.Range2f, Gf.Range2d, Gf.Range3f, Gf.Range3d)
+
+
+def hash_value(digest, value):
+    """
+    Adds a value to a digest in a form that is the same in every process.
+
+    Each value is hashed with its type name, so equal bytes of different types
+    don't collide. Arrays and Gf vectors and matrices are hashed by their raw
+    bytes, and Sdf values by their fields, never by repr, which for some types
+    holds a memory address.
+
+    Args:
+        digest (hashlib._Hash): Digest to update.
+        value: Usd value, e.g. a Vt array, Gf type, token, list op or dictionary.
+
+    Raises:
+        TypeError: If the value's type isn't handled.
+    """
+    digest.update(f"<{type(value).__name__}>".encode())
+
+    if value is None:
+        return
+
+    if isinstance(value, (bool, int, float, str)):
+        digest.update(repr(value).encode())
+        return
+
+    if isinstance(value, bytes):
+        digest.update(value)
+        return
+
+    if isinstance(value, (Sdf.Path, Tf.Enum)):
+        digest.update(str(value).encode())
+        return
+
+    if isinstance(value, Sdf.AssetPath):
+        digest.update(value.path.encode())
+        return
+
+    if isinstance(value, Sdf.TimeCode):
+        digest.update(repr(value.GetValue()).encode())
+        return
+
+    if isinstance(value, dict):
+        for key in sorted(value):
+            digest.update(key.encode())
+            hash_value(digest, value[key])
+        return
+
+    if isinstance(value, LIST_OP_TYPES):
+        for field in LIST_OP_FIELDS:
+            hash_value(digest, getattr(value, field))
+        return
+
+    if isinstance(value, (Sdf.Reference, Sdf.Payload)):
+        hash_value(digest, value.assetPath)
+        hash_value(digest, value.primPath)
+        hash_value(digest, value.layerOffset)
+        if isinstance(value, Sdf.Reference):
+            hash_value(digest, dict(value.customData))
+        return
+
+    if isinstance(value, Sdf.LayerOffset):
+        hash_value(digest, value.offset)
+        hash_value(digest, value.scale)
+        return
+
+    if isinstance(value, QUAT_TYPES):
+        value = (value.GetReal(), *value.GetImaginary())
+    elif isinstance(value, RANGE_TYPES):
+        value = (value.GetMin(), value.GetMax())
+
+    array = np.asarray(value)
+    if array.dtype.kind in "biuf":
+        digest.update(f"{array.dtype.str}{array.shape}".encode())
+        digest.update(np.ascontiguousarray(array).view(np.uint8))
+        return
+
+    if isinstance(value, (list, tuple)) or (array.dtype.kind in "UO" and array.ndim == 1):
+        digest.update(str(len(value)).encode())
+        for item in value:
+            hash_value(digest, item)
+        return
+
+    raise TypeError(f"Can't fingerprint value of type {type(value).__name__}")
+
+
+def prim_fingerprint(prim: Usd.Prim) -> str:
+    """
+    Fingerprints a primitive's metadata, attribute values and relationship targets.
+
+    Properties and metadata are hashed in name order, so authoring order doesn't matter.
+
+    Args:
+        prim (Usd.Prim): Primitive to fingerprint.
+
+    Returns:
+        str: Hex digest.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(str(prim.GetPath()).encode())
+
+    metadata = prim.GetAllAuthoredMetadata()
+    metadata.pop("customLayerData", None)
+    hash_value(digest, metadata)
+
+    for prop in sorted(prim.GetAuthoredProperties(), key=lambda p: p.GetName()):
+        digest.update(prop.GetName().encode())
+        if isinstance(prop, Usd.Relationship):
+            hash_value(digest, [str(target) for target in prop.GetTargets()])
+            continue
+
+        digest.update(str(prop.GetTypeName()).encode())
+        hash_value(digest, prop.Get(Usd.TimeCode.Default()))
+        for t in prop.GetTimeSamples():
+            hash_value(digest, t)
+            hash_value(digest, prop.Get(t))
+
+    return digest.hexdigest()
+
+
+def stage_fingerprint(stage: Usd.Stage) -> str:
+    """
+    Fingerprints the data of a stage.
+
+    Every primitive, including classes and overs, is fingerprinted on its own and
+    the results are combined in path order, so primitive order doesn't matter.
+    Layer metadata other than customLayerData is included via the pseudo root.
+
+    Args:
+        stage (Usd.Stage): Stage to fingerprint.
+
+    Returns:
+        str: Hex digest.
+    """
+    prims = Usd.PrimRange.AllPrims(stage.GetPseudoRoot())
+    digest = hashlib.blake2b(digest_size=16)
+    for prim_digest in sorted(prim_fingerprint(prim) for prim in prims):
+        digest.update(prim_digest.encode())
+    return digest.hexdigest()
+
+
+def stamp_fingerprint(layer: Sdf.Layer, fingerprint: str):
+    """
+    Records a fingerprint in a layer's customLayerData.
+
+    Args:
+        layer (Sdf.Layer): Layer to stamp, e.g. the stage's root layer before export.
+        fingerprint (str): Fingerprint to record.
+    """
+    data = dict(layer.customLayerData)
+    data[FINGERPRINT_KEY] = fingerprint
+    layer.customLayerData = data
+
+
+def read_fingerprint(path: str) -> str | None:
+    """
+    Reads the fingerprint a published Usd file was stamped with, without loading its contents.
+
+    Args:
+        path (str): Published Usd file.
+
+    Returns:
+        str | None: Fingerprint, None if the file can't be opened or wasn't stamped.
+    """
+    layer = Sdf.Layer.OpenAsAnonymous(path, metadataOnly=True)
+    if not layer:
+        return None
+    return layer.customLayerData.get(FINGERPRINT_KEY)
@@ -0,0 +1,425 @@
+import hashlib
+import numpy as np
+from pxr import Usd, UsdGeom, Sdf, Gf, Vt
+from usd_tools import fingerprint as fp
+
+
+# Instancing modes.
+REFERENCE = "reference"
+POINT_INSTANCER = "point_instancer"
+
+# Relative to a mesh's bounding box diagonal.
+MATCH_TOLERANCE = 1e-5
+
+# Mesh properties each instance keeps, everything else moves to the prototype.
+INSTANCE_PROPERTIES = ("xformOpOrder", "primvars:mat", "primvars:mat:indices")
+
+# Prototype properties whose values change when a mesh is moved or rotated.
+TRANSFORMED_PROPERTIES = ("points", "extent", "normals", "primvars:normals")
+
+# Properties whose values are checked after rigid matching rather than fingerprinted.
+NORMAL_PROPERTIES = ("normals", "primvars:normals")
+
+
+def hash_arrays(*arrays: np.ndarray) -> str:
+    """
+    Hashes the raw bytes of numpy arrays.
+
+    Args:
+        *arrays (np.ndarray): Arrays to hash.
+
+    Returns:
+        str: Hex digest.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for array in arrays:
+        array = np.ascontiguousarray(array)
+        digest.update(str(array.shape).encode())
+        digest.update(array.view(np.uint8))
+    return digest.hexdigest()
+
+
+def get_mesh_arrays(mesh: UsdGeom.Mesh) -> tuple[np.ndarray, np.ndarray, np.ndarray] | None:
+    """
+    Gets the topology and points of a static mesh.
+
+    Args:
+        mesh (UsdGeom.Mesh): Mesh to read.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray, np.ndarray] | None: Face vertex counts, face vertex
+            indices and points, None if the mesh is animated or empty.
+    """
+    points_attr = mesh.GetPointsAttr()
+    if points_attr.ValueMightBeTimeVarying():
+        return None
+
+    points = points_attr.Get()
+    counts = mesh.GetFaceVertexCountsAttr().Get()
+    indices = mesh.GetFaceVertexIndicesAttr().Get()
+    if not points or not counts or not indices:
+        return None
+
+    return np.asarray(counts), np.asarray(indices), np.asarray(points, dtype=np.float64)
+
+
+def is_instance_property(name: str) -> bool:
+    """
+    Checks if a mesh property stays on the instance rather than moving to the prototype.
+
+    Args:
+        name (str): Property name.
+
+    Returns:
+        bool: Returns true for placement and material properties.
+    """
+    return name.startswith("xformOp:") or name in INSTANCE_PROPERTIES
+
+
+def prototype_properties(prim: Usd.Prim) -> list[Usd.Property]:
+    """
+    Gets the authored properties of a mesh that move to its prototype.
+
+    Args:
+        prim (Usd.Prim): Mesh.
+
+    Returns:
+        list[Usd.Property]: Properties in name order.
+    """
+    props = [prop for prop in prim.GetAuthoredProperties() if not is_instance_property(prop.GetName())]
+    return sorted(props, key=lambda prop: prop.GetName())
+
+
+def property_fingerprint(prim: Usd.Prim, exclude=()) -> str:
+    """
+    Fingerprints every property that moves to the prototype, including primvar
+    values, indices, interpolation and element size.
+
+    Args:
+        prim (Usd.Prim): Mesh.
+        exclude (tuple[str], optional): Properties to leave out. Defaults to ().
+
+    Returns:
+        str: Hex digest.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for prop in prototype_properties(prim):
+        if prop.GetName() in exclude:
+            continue
+
+        digest.update(prop.GetName().encode())
+        if isinstance(prop, Usd.Relationship):
+            fp.hash_value(digest, [str(target) for target in prop.GetTargets()])
+            continue
+
+        digest.update(str(prop.GetTypeName()).encode())
+        for key in ("interpolation", "elementSize"):
+            fp.hash_value(digest, prop.GetMetadata(key))
+        fp.hash_value(digest, prop.Get(Usd.TimeCode.Default()))
+        for t in prop.GetTimeSamples():
+            digest.update(repr(t).encode())
+            fp.hash_value(digest, prop.Get(t))
+
+    return digest.hexdigest()
+
+
+def fingerprint(counts: np.ndarray, indices: np.ndarray, points: np.ndarray, transform_invariant=False) -> str:
+    """
+    Fingerprints a mesh by its topology and points.
+
+    The transform invariant fingerprint uses the sorted distances of the points from
+    their centroid, which don't change when the mesh is moved or rotated. Meshes that
+    share it still need checking with match_rigid.
+
+    Args:
+        counts (np.ndarray): Face vertex counts.
+        indices (np.ndarray): Face vertex indices.
+        points (np.ndarray): Points.
+        transform_invariant (bool, optional): Match meshes that differ by a rigid transform. Defaults to False.
+
+    Returns:
+        str: Fingerprint.
+    """
+    if not transform_invariant:
+        return hash_arrays(counts, indices, points.astype(np.float32))
+
+    centred = points - points.mean(axis=0)
+    distances = np.sort(np.linalg.norm(centred, axis=1))
+    step = max(distances[-1], 1e-9) * MATCH_TOLERANCE * 10.0
+    return hash_arrays(counts, indices, np.round(distances / step).astype(np.int64))
+
+
+def match_rigid(source: np.ndarray, target: np.ndarray) -> Gf.Matrix4d | None:
+    """
+    Finds the rigid transform mapping source points onto target points with the Kabsch algorithm.
+
+    Points correspond by index, as they do for copies of the same mesh.
+
+    Args:
+        source (np.ndarray): Source points, shape (n, 3).
+        target (np.ndarray): Target points, shape (n, 3).
+
+    Returns:
+        Gf.Matrix4d | None: Row vector matrix so source * matrix == target, None if no
+            rigid transform matches within tolerance.
+    """
+    if source.shape != target.shape:
+        return None
+
+    source_centre = source.mean(axis=0)
+    target_centre = target.mean(axis=0)
+    u, _, vt = np.linalg.svd((source - source_centre).T @ (target - target_centre))
+    if np.linalg.det(u @ vt) < 0.0:
+        u[:, -1] *= -1.0
+    rotation = u @ vt
+    translation = target_centre - source_centre @ rotation
+
+    diagonal = np.linalg.norm(source.max(axis=0) - source.min(axis=0))
+    if np.abs(source @ rotation + translation - target).max() > max(diagonal, 1e-9) * MATCH_TOLERANCE:
+        return None
+
+    matrix = np.identity(4)
+    matrix[:3, :3] = rotation
+    matrix[3, :3] = translation
+    return Gf.Matrix4d(*matrix.flatten().tolist())
+
+
+def normals_match(source: Usd.Prim, target: Usd.Prim, matrix: Gf.Matrix4d) -> bool:
+    """
+    Checks that a mesh's normals are another's carried by a rigid transform.
+
+    Args:
+        source (Usd.Prim): Source mesh.
+        target (Usd.Prim): Target mesh.
+        matrix (Gf.Matrix4d): Rigid transform from source to target.
+
+    Returns:
+        bool: Returns true if every normal attribute and primvar matches.
+    """
+    rotation = np.array(matrix)[:3, :3]
+    for name in NORMAL_PROPERTIES:
+        source_attr = source.GetAttribute(name)
+        target_attr = target.GetAttribute(name)
+        source_value = source_attr.Get() if source_attr else None
+        target_value = target_attr.Get() if target_attr else None
+        if source_value is None or target_value is None:
+            if source_value is not target_value:
+                return False
+            continue
+
+        source_value = np.asarray(source_value, dtype=np.float64).reshape(-1, 3)
+        target_value = np.asarray(target_value, dtype=np.float64).reshape(-1, 3)
+        if source_value.shape != target_value.shape:
+            return False
+        if len(source_value) and np.abs(source_value @ rotation - target_value).max() > 1e-4:
+            return False
+
+    return True
+
+
+def find_duplicates(stage: Usd.Stage, root: str, transform_invariant=False) -> list[list[tuple[Usd.Prim, Gf.Matrix4d]]]:
+    """
+    Groups static meshes below a primitive that share geometry.
+
+    Meshes match when their topology, points and every other property that
+    moves to the prototype match, including primvars and their interpolation.
+
+    Args:
+        stage (Usd.Stage): Stage to search.
+        root (str): Primitive to search below.
+        transform_invariant (bool, optional): Match meshes that differ by a rigid transform. Defaults to False.
+
+    Returns:
+        list[list[tuple[Usd.Prim, Gf.Matrix4d]]]: Groups of two or more meshes, each with the
+            transform from the group's first mesh to it.
+    """
+    candidates = {}
+    for prim in Usd.PrimRange(stage.GetPrimAtPath(root)):
+        if not prim.IsA(UsdGeom.Mesh) or prim.GetChildren():
+            continue
+        arrays = get_mesh_arrays(UsdGeom.Mesh(prim))
+        if arrays is None:
+            continue
+        # Transformed values are compared by match_rigid and normals_match instead.
+        exclude = TRANSFORMED_PROPERTIES if transform_invariant else ("points",)
+        key = (fingerprint(*arrays, transform_invariant), property_fingerprint(prim, exclude))
+        candidates.setdefault(key, []).append((prim, arrays[2]))
+
+    groups = []
+    for members in candidates.values():
+        remaining = members
+        while len(remaining) > 1:
+            source_prim, source_points = remaining[0]
+            group = [(source_prim, Gf.Matrix4d(1))]
+            unmatched = []
+            for prim, points in remaining[1:]:
+                matrix = match_rigid(source_points, points) if transform_invariant else Gf.Matrix4d(1)
+                if matrix is not None and transform_invariant and not normals_match(source_prim, prim, matrix):
+                    matrix = None
+                if matrix is None:
+                    unmatched.append((prim, points))
+                else:
+                    group.append((prim, matrix))
+            if len(group) > 1:
+                groups.append(group)
+            remaining = unmatched
+
+    return groups
+
+
+def create_prototype(stage: Usd.Stage, mesh: Usd.Prim, path: Sdf.Path) -> Sdf.Path:
+    """
+    Copies a mesh into a prototype Xform, under a class prim so it doesn't render itself.
+
+    Args:
+        stage (Usd.Stage): Stage to create prototype on.
+        mesh (Usd.Prim): Mesh to copy.
+        path (Sdf.Path): Prototype path.
+
+    Returns:
+        Sdf.Path: Path of prototype.
+    """
+    layer = stage.GetEditTarget().GetLayer()
+    prototypes = stage.GetPrimAtPath(path.GetParentPath())
+    if not prototypes:
+        prototypes = stage.DefinePrim(path.GetParentPath(), "Scope")
+        prototypes.SetSpecifier(Sdf.SpecifierClass)
+
+    UsdGeom.Xform.Define(stage, path)
+    mesh_path = path.AppendChild("mesh")
+    Sdf.CopySpec(layer, mesh.GetPath(), layer, mesh_path)
+
+    # The instance keeps its own placement and material.
+    mesh_spec = layer.GetPrimAtPath(mesh_path)
+    for prop in list(mesh_spec.properties):
+        if is_instance_property(prop.name):
+            mesh_spec.RemoveProperty(prop)
+    return path
+
+
+def make_instance(prim: Usd.Prim, prototype: Sdf.Path, matrix: Gf.Matrix4d):
+    """
+    Turns a mesh into an instanceable reference to a prototype.
+
+    Args:
+        prim (Usd.Prim): Mesh to convert.
+        prototype (Sdf.Path): Prototype to reference.
+        matrix (Gf.Matrix4d): Transform from prototype points to this mesh's points.
+    """
+    for prop in prototype_properties(prim):
+        prim.RemoveProperty(prop.GetName())
+
+    prim.SetTypeName("Xform")
+    prim.GetReferences().AddInternalReference(prototype)
+    prim.SetInstanceable(True)
+
+    if not Gf.IsClose(matrix, Gf.Matrix4d(1), 1e-9):
+        # Last in the op order, so it applies to the points first.
+        UsdGeom.Xformable(prim).AddTransformOp(UsdGeom.XformOp.PrecisionDouble, "instance").Set(matrix)
+
+
+def make_point_instancer(stage: Usd.Stage, path: Sdf.Path, prototype: Sdf.Path, group: list[tuple[Usd.Prim, Gf.Matrix4d]]):
+    """
+    Replaces a group of duplicate meshes with a PointInstancer.
+
+    Meshes are grouped by their mat primvar. Each material gets its own
+    prototype under the instancer, referencing the shared geometry with the
+    material authored on its mesh, so bindings survive instancing.
+
+    Args:
+        stage (Usd.Stage): Stage to edit.
+        path (Sdf.Path): PointInstancer path.
+        prototype (Sdf.Path): Prototype to instance.
+        group (list[tuple[Usd.Prim, Gf.Matrix4d]]): Meshes with their transform from the prototype.
+    """
+    instancer = UsdGeom.PointInstancer.Define(stage, path)
+    materials = [get_material(prim) for prim, _ in group]
+    unique = list(dict.fromkeys(materials))
+
+    targets = []
+    for i, material in enumerate(unique):
+        if material is None:
+            targets.append(prototype)
+            continue
+        target = path.AppendChild("Prototypes").AppendChild(f"{prototype.name}_{i}")
+        stage.DefinePrim(target, "Xform").GetReferences().AddInternalReference(prototype)
+        mesh = stage.OverridePrim(target.AppendChild("mesh"))
+        UsdGeom.PrimvarsAPI(mesh).CreatePrimvar("mat", Sdf.ValueTypeNames.String, UsdGeom.Tokens.constant).Set(material)
+        targets.append(target)
+    instancer.CreatePrototypesRel().SetTargets(targets)
+
+    xform_cache = UsdGeom.XformCache(stage.GetStartTimeCode())
+    parent_inverse = xform_cache.GetLocalToWorldTransform(stage.GetPrimAtPath(path.GetParentPath())).GetInverse()
+
+    positions, orientations, scales = [], [], []
+    for prim, matrix in group:
+        local = matrix * xform_cache.GetLocalToWorldTransform(prim) * parent_inverse
+        transform = Gf.Transform(local)
+        positions.append(Gf.Vec3f(transform.GetTranslation()))
+        orientations.append(Gf.Quath(transform.GetRotation().GetQuat()))
+        scales.append(Gf.Vec3f(transform.GetScale()))
+
+    instancer.CreateProtoIndicesAttr().Set(Vt.IntArray([unique.index(material) for material in materials]))
+    instancer.CreatePositionsAttr().Set(Vt.Vec3fArray(positions))
+    instancer.CreateOrientationsAttr().Set(Vt.QuathArray(orientations))
+    instancer.CreateScalesAttr().Set(Vt.Vec3fArray(scales))
+
+    for prim, _ in group:
+        stage.RemovePrim(prim.GetPath())
+
+
+def get_material(prim: Usd.Prim) -> str | None:
+    """
+    Gets the material name a mesh carries in its mat primvar.
+
+    Args:
+        prim (Usd.Prim): Mesh.
+
+    Returns:
+        str | None: Material name, None if the mesh has none.
+    """
+    primvar = UsdGeom.PrimvarsAPI(prim).GetPrimvar("mat")
+    if not primvar or not primvar.HasAuthoredValue():
+        return None
+    return primvar.Get()
+
+
+def instance_duplicates(stage: Usd.Stage, root: str, transform_invariant=False, mode=REFERENCE) -> dict[str, int]:
+    """
+    Moves duplicate meshes under root into shared prototypes.
+
+    Args:
+        stage (Usd.Stage): Stage to edit.
+        root (str): Prim to create prototypes and instancers under, e.g. the asset's Geo prim.
+        transform_invariant (bool, optional): Also match copies that were moved or rotated. Defaults to False.
+        mode (str, optional): "reference" for instanceable references, "point_instancer"
+            to replace each group with a PointInstancer. Defaults to "reference".
+
+    Raises:
+        ValueError: If mode is unknown.
+
+    Returns:
+        dict[str, int]: Prototypes made, meshes instanced and approximate bytes of geometry saved.
+    """
+    if mode not in (REFERENCE, POINT_INSTANCER):
+        raise ValueError(f"Unknown instancing mode: {mode}")
+
+    root = Sdf.Path(root)
+    groups = find_duplicates(stage, root, transform_invariant)
+    stats = {"prototypes": 0, "instances": 0, "bytes_saved": 0}
+
+    for i, group in enumerate(groups):
+        counts, indices, points = get_mesh_arrays(UsdGeom.Mesh(group[0][0]))
+        prototype = create_prototype(stage, group[0][0], root.AppendChild("Prototypes").AppendChild(f"proto_{i}"))
+
+        if mode == POINT_INSTANCER:
+            make_point_instancer(stage, root.AppendChild(f"instancer_{i}"), prototype, group)
+        else:
+            for prim, matrix in group:
+                make_instance(prim, prototype, matrix)
+
+        stats["prototypes"] += 1
+        stats["instances"] += len(group)
+        stats["bytes_saved"] += (len(group) - 1) * (counts.nbytes + indices.nbytes + points.size * 4)
+
+    return stats
@@ -0,0 +1,208 @@
+import argparse
+import glob
+import json
+import multiprocessing
+import os
+import sys
+import time
+import traceback
+import warnings
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from usd_tools.io import re_exporter as rex
+
+
+# Export type names match the Maya exporter's.
+EXPORT_METHODS = {
+    "Geo": "export_mesh",
+    "Anim": "export_anim",
+    "Cam": "export_cam",
+}
+
+
+def run_job(job: dict[str, str], skip_unchanged=True) -> dict[str, str | float | None]:
+    """
+    Re-exports one raw Usd export, catching any failure.
+
+    Args:
+        job (dict[str, str]): Job with "input", "asset_name", "asset_type", "shot_num" and "export_type".
+        skip_unchanged (bool, optional): Skip publishing when the latest version matches. Defaults to True.
+
+    Returns:
+        dict[str, str | float | None]: Input, published output, whether it was unchanged,
+            seconds taken and error traceback if it failed.
+    """
+    start = time.perf_counter()
+    result = {"input": None, "output": None, "unchanged": False, "seconds": 0.0, "error": None}
+    try:
+        result["input"] = job["input"]
+        logic = rex.ReExporter(job["input"], job["asset_name"], job["asset_type"], job.get("shot_num", "Empty"),
+                               skip_unchanged=skip_unchanged)
+        result["output"] = getattr(logic, EXPORT_METHODS[job["export_type"]])()
+        result["unchanged"] = logic.unchanged
+    except Exception:
+        result["error"] = traceback.format_exc()
+
+    result["seconds"] = time.perf_counter() - start
+    return result
+
+
+def run_batch(jobs: list[dict[str, str]], workers=None, tasks_per_child=1, skip_unchanged=True) -> list[dict[str, str | float | None]]:
+    """
+    Runs re-export jobs in a process pool.
+
+    Workers are replaced after tasks_per_child jobs, so Usd layer caches stay
+    isolated to the jobs that built them. This needs Python 3.11, older versions
+    warn and keep their workers. A worker crash takes its pool down, so jobs
+    caught in a broken pool are re-run one per pool to find the one that crashed.
+    Re-runs always skip unchanged exports, so a job that published before the
+    pool broke finds its own version instead of publishing it again.
+
+    Args:
+        jobs (list[dict[str, str]]): Jobs to run.
+        workers (int, optional): Number of worker processes. Defaults to the cpu count.
+        tasks_per_child (int, optional): Jobs each worker runs before being replaced. Defaults to 1.
+        skip_unchanged (bool, optional): Skip publishing when the latest version matches. Defaults to True.
+
+    Returns:
+        list[dict[str, str | float | None]]: Job results, in completion order.
+    """
+    if tasks_per_child and sys.version_info < (3, 11):
+        warnings.warn("Replacing pool workers needs Python 3.11, workers will run every job they are given.")
+
+    results = []
+    broken = _run_pool(jobs, workers, tasks_per_child, skip_unchanged, results, len(jobs))
+
+    for job in broken:
+        if _run_pool([job], 1, 1, True, results, len(jobs)):
+            _report({"input": job.get("input"), "output": None, "unchanged": False, "seconds": 0.0,
+                     "error": "Worker process crashed."}, results, len(jobs))
+
+    return results
+
+
+def _run_pool(jobs: list[dict[str, str]], workers, tasks_per_child: int, skip_unchanged: bool, results: list,
+              total: int) -> list[dict[str, str]]:
+    """
+    Runs jobs in one process pool, adding their results to a list.
+
+    Args:
+        jobs (list[dict[str, str]]): Jobs to run.
+        workers (int): Number of worker processes.
+        tasks_per_child (int): Jobs each worker runs before being replaced.
+        skip_unchanged (bool): Skip publishing when the latest version matches.
+        results (list): Results to add to.
+        total (int): Total number of jobs in the batch, for progress.
+
+    Returns:
+        list[dict[str, str]]: Jobs that didn't finish because the pool broke.
+    """
+    kwargs = {"max_workers": workers, "mp_context": multiprocessing.get_context("spawn")}
+    if sys.version_info >= (3, 11):
+        kwargs["max_tasks_per_child"] = tasks_per_child
+
+    broken = []
+    with ProcessPoolExecutor(**kwargs) as executor:
+        futures = {executor.submit(run_job, job, skip_unchanged): job for job in jobs}
+        for future in as_completed(futures):
+            try:
+                _report(future.result(), results, total)
+            except BrokenProcessPool:
+                broken.append(futures[future])
+
+    return broken
+
+
+def _report(result: dict[str, str | float | None], results: list, total: int):
+    """
+    Adds a job result to the results and prints progress.
+
+    Args:
+        result (dict[str, str | float | None]): Job result.
+        results (list): Results to add to.
+        total (int): Total number of jobs in the batch.
+    """
+    results.append(result)
+    status = "FAILED" if result["error"] else "unchanged" if result["unchanged"] else "ok"
+    print(f"[{len(results)}/{total}] {status} {result['input']} ({result['seconds']:.2f}s)", flush=True)
+
+
+def load_jobs(args: argparse.Namespace) -> list[dict[str, str]]:
+    """
+    Builds jobs from a manifest or from input globs.
+
+    A manifest is a json list of jobs. Jobs from globs take the asset name from
+    the file name unless one is given.
+
+    Args:
+        args (argparse.Namespace): Parsed command line arguments.
+
+    Raises:
+        ValueError: If globs are given without an asset type.
+
+    Returns:
+        list[dict[str, str]]: Jobs to run.
+    """
+    jobs = []
+    if args.manifest:
+        with open(args.manifest, "r") as f:
+            jobs.extend(json.load(f))
+
+    if args.inputs and not args.asset_type:
+        raise ValueError("--asset-type is required when re-exporting from globs.")
+
+    for pattern in args.inputs:
+        for path in sorted(glob.glob(pattern)):
+            jobs.append({
+                "input": path,
+                "asset_name": args.asset_name or os.path.splitext(os.path.basename(path))[0],
+                "asset_type": args.asset_type,
+                "shot_num": args.shot_num,
+                "export_type": args.export_type,
+            })
+
+    return jobs
+
+
+def main(argv=None) -> int:
+    """
+    Command line entry point for batch re-exports.
+
+    Args:
+        argv (list[str], optional): Arguments. Defaults to sys.argv.
+
+    Returns:
+        int: Exit code, 1 if any job failed.
+    """
+    parser = argparse.ArgumentParser(description="Re-export raw Usd exports into the depot in parallel.")
+    parser.add_argument("inputs", nargs="*", help="Globs of raw Usd exports.")
+    parser.add_argument("--manifest", help="Json list of jobs with input, asset_name, asset_type, shot_num and export_type.")
+    parser.add_argument("--export-type", choices=list(EXPORT_METHODS), default="Geo")
+    parser.add_argument("--asset-type")
+    parser.add_argument("--asset-name", help="Defaults to each input's file name.")
+    parser.add_argument("--shot-num", default="Empty")
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--tasks-per-child", type=int, default=1)
+    parser.add_argument("--force", action="store_true", help="Publish even if the latest version matches.")
+    args = parser.parse_args(argv)
+
+    jobs = load_jobs(args)
+    if not jobs:
+        parser.error("No inputs given.")
+
+    start = time.perf_counter()
+    results = run_batch(jobs, args.workers, args.tasks_per_child, not args.force)
+    elapsed = time.perf_counter() - start
+
+    failed = [r for r in results if r["error"]]
+    for result in failed:
+        print(f"\nFAILED {result['input']}\n{result['error']}")
+
+    unchanged = [r for r in results if r["unchanged"]]
+    print(f"\nJobs: {len(results)}, succeeded: {len(results) - len(failed)}, unchanged: {len(unchanged)}, failed: {len(failed)}")
+    print(f"Elapsed: {elapsed:.2f}s, throughput: {len(results) / elapsed:.2f} jobs/s")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
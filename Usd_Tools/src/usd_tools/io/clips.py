@@ -0,0 +1,277 @@
+from pxr import Usd, Sdf
+import math
+import os
+from utils import codec_utils as codec
+from utils import store_utils
+from usd_tools.io import payloads
+
+
+# Frames per clip file, chunks start on multiples of this so re-exports line up.
+CLIP_CHUNK_SIZE = 25
+
+
+def get_chunks(start: float, end: float, chunk_size=CLIP_CHUNK_SIZE) -> list[tuple[float, float]]:
+    """
+    Splits a frame range into chunks aligned to multiples of chunk size.
+
+    Args:
+        start (float): First frame.
+        end (float): Last frame.
+        chunk_size (int, optional): Frames per chunk. Defaults to CLIP_CHUNK_SIZE.
+
+    Returns:
+        list[tuple[float, float]]: First and last whole frame of each chunk.
+    """
+    chunks = []
+    chunk_start = math.floor(start / chunk_size) * chunk_size
+    while chunk_start <= end:
+        chunk_end = chunk_start + chunk_size
+        chunks.append((max(chunk_start, start), min(chunk_end - 1, end)))
+        chunk_start = chunk_end
+    return chunks
+
+
+def get_sampled_paths(layer: Sdf.Layer) -> list[Sdf.Path]:
+    """
+    Gets attribute paths holding time samples in a layer.
+
+    Args:
+        layer (Sdf.Layer): Layer to search.
+
+    Returns:
+        list[Sdf.Path]: Time sampled attribute paths.
+    """
+    paths = []
+    def visit(path):
+        if path.IsPropertyPath() and layer.GetNumTimeSamplesForPath(path) > 0:
+            paths.append(path)
+    layer.Traverse(Sdf.Path.absoluteRootPath, visit)
+    return paths
+
+
+def build_chunk(stage: Usd.Stage, sampled: list[Sdf.Path], start: float, end: float) -> Sdf.Layer:
+    """
+    Builds a clip layer holding the time samples of one chunk.
+
+    Each sampled attribute gets a sample at both ends of the chunk, holding the
+    stage's value there, so a chunk whose samples were all removed as held
+    values still resolves, and interpolation inside the chunk is unchanged.
+
+    Args:
+        stage (Usd.Stage): Stage on the flattened animation layer.
+        sampled (list[Sdf.Path]): Time sampled attribute paths in the layer.
+        start (float): First frame of chunk.
+        end (float): Last frame of chunk, inclusive.
+
+    Returns:
+        Sdf.Layer: Anonymous clip layer, with the chunk's start and end time codes.
+    """
+    layer = stage.GetRootLayer()
+    chunk = Sdf.Layer.CreateAnonymous()
+    chunk.TransferContent(layer)
+    chunk.startTimeCode = start
+    chunk.endTimeCode = end
+    sampled_set = set(sampled)
+
+    with Sdf.ChangeBlock():
+        strip_unsampled(chunk, sampled_set)
+
+        for path in sampled:
+            attr = stage.GetAttributeAtPath(path)
+            times = {t for t in layer.ListTimeSamplesForPath(path) if start <= t <= end}
+            chunk.GetAttributeAtPath(path).ClearInfo("timeSamples")
+            for t in sorted(times | {start, end}):
+                value = layer.QueryTimeSample(path, t) if t in times else attr.Get(t)
+                chunk.SetTimeSample(path, t, value)
+
+    return chunk
+
+
+def strip_unsampled(layer: Sdf.Layer, sampled: set[Sdf.Path]):
+    """
+    Removes attributes without time samples from a layer.
+
+    Args:
+        layer (Sdf.Layer): Layer to edit.
+        sampled (set[Sdf.Path]): Time sampled attribute paths to keep.
+    """
+    unsampled = []
+    def visit(path):
+        if path.IsPropertyPath() and path not in sampled and layer.GetAttributeAtPath(path):
+            unsampled.append(path)
+    layer.Traverse(Sdf.Path.absoluteRootPath, visit)
+    for path in unsampled:
+        spec = layer.GetAttributeAtPath(path)
+        spec.owner.RemoveProperty(spec)
+
+
+def build_topology(layer: Sdf.Layer, sampled: list[Sdf.Path]) -> Sdf.Layer:
+    """
+    Builds the topology layer for a set of clips, the animation without its time samples.
+
+    Args:
+        layer (Sdf.Layer): Flattened animation layer.
+        sampled (list[Sdf.Path]): Time sampled attribute paths in the layer.
+
+    Returns:
+        Sdf.Layer: Anonymous topology layer.
+    """
+    topology = Sdf.Layer.CreateAnonymous()
+    topology.TransferContent(layer)
+    with Sdf.ChangeBlock():
+        for path in sampled:
+            topology.GetAttributeAtPath(path).ClearInfo("timeSamples")
+    return topology
+
+
+def build_entry_layer(layer: Sdf.Layer, clip_path: str, clips: list[tuple[float, float, str]], topology_path: str,
+                      manifest_path: str, start: float, end: float) -> Sdf.Layer:
+    """
+    Builds the entry layer that sublayers the topology and activates each clip over its chunk.
+
+    Args:
+        layer (Sdf.Layer): Flattened animation layer, to copy layer metadata from.
+        clip_path (str): Root prim the clips apply to.
+        clips (list[tuple[float, float, str]]): First and last frame and asset path of each clip.
+        topology_path (str): Topology layer asset path.
+        manifest_path (str): Clip manifest asset path.
+        start (float): First frame.
+        end (float): Last frame.
+
+    Returns:
+        Sdf.Layer: Anonymous entry layer.
+    """
+    entry = Sdf.Layer.CreateAnonymous(".usda")
+    for key in payloads.LAYER_METADATA:
+        if layer.pseudoRoot.HasInfo(key):
+            entry.pseudoRoot.SetInfo(key, layer.pseudoRoot.GetInfo(key))
+    entry.startTimeCode = start
+    entry.endTimeCode = end
+    entry.defaultPrim = Sdf.Path(clip_path).name
+
+    # Authored before the topology is sublayered, so nothing is resolved yet.
+    entry_stage = Usd.Stage.Open(entry)
+    clips_api = Usd.ClipsAPI(entry_stage.OverridePrim(clip_path))
+    clips_api.SetClipPrimPath(clip_path)
+    clips_api.SetClipAssetPaths(Sdf.AssetPathArray([asset_path for _, _, asset_path in clips]))
+    clips_api.SetClipManifestAssetPath(Sdf.AssetPath(manifest_path))
+    clips_api.SetClipActive([(clip_start, i) for i, (clip_start, _, _) in enumerate(clips)])
+    clips_api.SetClipTimes([(t, t) for clip_start, clip_end, _ in clips for t in (clip_start, clip_end)])
+
+    entry.subLayerPaths.append(topology_path)
+    return entry
+
+
+def publish_layer(layer: Sdf.Layer, folder: str, name: str, extension: str) -> tuple[str, bool]:
+    """
+    Publishes a layer through the depot store, named by its content hash.
+
+    Args:
+        layer (Sdf.Layer): Layer to publish.
+        folder (str): Folder to publish to.
+        name (str): File name before the hash, e.g. Birdfeeder_010.0025-0049.
+        extension (str): File format.
+
+    Raises:
+        RuntimeError: If the layer fails to export.
+
+    Returns:
+        tuple[str, bool]: Published path and whether it was written rather than reused.
+    """
+    tmp_file = store_utils.temp_export_path(extension)
+    try:
+        if not layer.Export(tmp_file):
+            raise RuntimeError(f"Failed to export Usd file: {name}")
+        digest = codec.hash_file(tmp_file)
+        path = os.path.join(folder, f"{name}.{digest[:12]}.{extension}")
+
+        if os.path.exists(path):
+            return path, False
+        store_utils.publish_file(tmp_file, path)
+        return path, True
+    finally:
+        os.remove(tmp_file)
+
+
+def relative_asset_path(path: str, anchor: str) -> str:
+    """
+    Gets an asset path relative to the layer it is authored in.
+
+    Args:
+        path (str): File to point at.
+        anchor (str): Layer the asset path is authored in.
+
+    Returns:
+        str: Relative asset path, e.g. ./clips/Birdfeeder_010.topology.3f2a1c9e0b4d.usd
+    """
+    return "./" + os.path.relpath(path, os.path.dirname(anchor)).replace("\\", "/")
+
+
+def export_clips(stage: Usd.Stage, clip_path: str, result_path: str, clip_folder: str, file_base: str,
+                 chunk_size=CLIP_CHUNK_SIZE, extension="usdc", layer_data=None) -> dict[str, int]:
+    """
+    Writes a stage's animation as value clips with a clip-stitched entry layer.
+
+    Each chunk of frames is written to its own clip file, named by its content
+    hash and published through the depot store, so chunks that haven't changed
+    since a previous export are reused rather than rewritten. Each chunk also
+    holds the first frame of the next chunk so interpolation across the
+    boundary is unchanged. The topology and manifest layers go next to the
+    clips the same way, and the entry layer is published to result path.
+
+    Args:
+        stage (Usd.Stage): Animation stage.
+        clip_path (str): Root prim the clips apply to.
+        result_path (str): Entry layer to publish.
+        clip_folder (str): Folder to write clip files to.
+        file_base (str): Base name of clip files.
+        chunk_size (int, optional): Frames per clip file. Defaults to CLIP_CHUNK_SIZE.
+        extension (str, optional): Clip file format. Defaults to "usdc".
+        layer_data (dict, optional): customLayerData for the entry layer. Defaults to None.
+
+    Raises:
+        RuntimeError: If a layer fails to export.
+
+    Returns:
+        dict[str, int]: Number of chunks, and how many were written or reused.
+    """
+    layer = stage.Flatten(addSourceFileComment=False)
+    flat = Usd.Stage.Open(layer)
+    flat.SetInterpolationType(stage.GetInterpolationType())
+    sampled = get_sampled_paths(layer)
+    start = stage.GetStartTimeCode()
+    end = stage.GetEndTimeCode()
+
+    os.makedirs(clip_folder, exist_ok=True)
+    chunks = get_chunks(start, end, chunk_size)
+    clip_layers = []
+    clips = []
+    stats = {"chunks": len(chunks), "written": 0, "reused": 0}
+
+    for i, (chunk_start, chunk_end) in enumerate(chunks):
+        last_frame = chunks[i + 1][0] if i + 1 < len(chunks) else end
+        chunk = build_chunk(flat, sampled, chunk_start, last_frame)
+        clip_file, written = publish_layer(chunk, clip_folder, f"{file_base}.{int(chunk_start):04d}-{int(chunk_end):04d}", extension)
+        stats["written" if written else "reused"] += 1
+
+        clip_layers.append(chunk)
+        clips.append((chunk_start, last_frame, relative_asset_path(clip_file, result_path)))
+
+    topology_file, _ = publish_layer(build_topology(layer, sampled), clip_folder, f"{file_base}.topology", extension)
+    manifest = Usd.ClipsAPI.GenerateClipManifestFromLayers(clip_layers, Sdf.Path(clip_path))
+    manifest_file, _ = publish_layer(manifest, clip_folder, f"{file_base}.manifest", extension)
+
+    entry = build_entry_layer(layer, clip_path, clips, relative_asset_path(topology_file, result_path),
+                              relative_asset_path(manifest_file, result_path), start, end)
+    if layer_data:
+        entry.customLayerData = dict(layer_data)
+
+    tmp_file = store_utils.temp_export_path(os.path.splitext(result_path)[1][1:])
+    try:
+        if not entry.Export(tmp_file):
+            raise RuntimeError(f"Failed to export Usd file: {result_path}")
+        store_utils.publish_file(tmp_file, result_path)
+    finally:
+        os.remove(tmp_file)
+
+    return stats
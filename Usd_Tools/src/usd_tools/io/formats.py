@@ -0,0 +1,103 @@
+from pxr import Usd, Sdf
+import os
+import sys
+import time
+from utils import io_utils as io
+from utils import store_utils
+
+
+# Used when structure.json has no "export_formats" entry for an export type.
+DEFAULT_FORMATS = {
+    "geo": "usdc",
+    "anim": "usdc",
+    "cam": "usda",
+}
+
+# File extensions Usd picks the format from; .usd is written as crate.
+FORMATS = ("usd", "usda", "usdc")
+
+
+def get_export_format(export_type: str, database=None) -> str:
+    """
+    Gets the output format for an export type from the project structure.
+
+    Formats are set per export type under "export_formats" in structure.json,
+    e.g. {"geo": "usdc", "anim": "usdc", "cam": "usda"}.
+
+    Args:
+        export_type (str): Export type, "geo", "anim" or "cam".
+        database (str, optional): Database folder. Defaults to the DATABASE environment variable.
+
+    Raises:
+        ValueError: If the configured format isn't a Usd format.
+
+    Returns:
+        str: Format, used as the published file's extension.
+    """
+    database = database or os.getenv("DATABASE")
+    formats = {}
+    if database and os.path.exists(fr"{database}\structure.json"):
+        formats = io.read_json_cached(fr"{database}\structure.json").get("export_formats", {})
+
+    format = formats.get(export_type, DEFAULT_FORMATS.get(export_type, "usdc"))
+    if format not in FORMATS:
+        raise ValueError(f"Unknown Usd format for {export_type} exports: {format}")
+    return format
+
+
+def benchmark_formats(stage: Usd.Stage, formats=("usda", "usdc"), repeats=3) -> dict[str, dict[str, float]]:
+    """
+    Compares write time, file size and load time of a stage in each format.
+
+    Load time covers opening the file, composing it and reading every attribute
+    at the start frame, so lazily loaded crate data is counted.
+
+    Args:
+        stage (Usd.Stage): Stage to write.
+        formats (tuple[str], optional): Formats to compare. Defaults to ("usda", "usdc").
+        repeats (int, optional): Runs per format, the fastest is kept. Defaults to 3.
+
+    Returns:
+        dict[str, dict[str, float]]: Write seconds, bytes and load seconds per format.
+    """
+    results = {}
+    time_code = stage.GetStartTimeCode()
+
+    for format in formats:
+        write_times = []
+        load_times = []
+        size = 0
+
+        for _ in range(repeats):
+            path = store_utils.temp_export_path(format)
+            try:
+                start = time.perf_counter()
+                stage.Export(path, addSourceFileComment=False)
+                write_times.append(time.perf_counter() - start)
+                size = os.path.getsize(path)
+
+                start = time.perf_counter()
+                layer = Sdf.Layer.OpenAsAnonymous(path)
+                loaded = Usd.Stage.Open(layer)
+                for prim in loaded.Traverse():
+                    for attr in prim.GetAttributes():
+                        attr.Get(time_code)
+                load_times.append(time.perf_counter() - start)
+                del loaded, layer
+            finally:
+                os.remove(path)
+
+        results[format] = {
+            "write_seconds": min(write_times),
+            "bytes": size,
+            "load_seconds": min(load_times),
+        }
+
+    return results
+
+
+if __name__ == "__main__":
+    results = benchmark_formats(Usd.Stage.Open(sys.argv[1]))
+    for format, result in results.items():
+        print(f"{format}: write {result['write_seconds']:.3f}s, "
+              f"{result['bytes'] / 1024 / 1024:.2f} MB, load {result['load_seconds']:.3f}s")
@@ -0,0 +1,71 @@
+from pxr import Usd, UsdGeom, Sdf, Kind
+
+
+# Folder, next to the interface layers, that payload geometry is published to.
+PAYLOAD_FOLDER = "payload"
+
+# Layer metadata carried over to the interface layer.
+LAYER_METADATA = ("upAxis", "metersPerUnit", "defaultPrim", "startTimeCode", "endTimeCode", "timeCodesPerSecond")
+
+
+def build_interface_layer(stage: Usd.Stage, asset_path: str, payload_file: str) -> Sdf.Layer:
+    """
+    Builds a light asset layer that keeps the geometry behind a payload.
+
+    The interface holds the asset's model hierarchy with kinds and the asset's
+    extentsHint, so shots opened with payloads unloaded still have bounds.
+    Everything below the asset comes from the payload.
+
+    Args:
+        stage (Usd.Stage): Validated asset stage, as published to the payload.
+        asset_path (str): Asset primitive, e.g. /Scene/Assets/Prop/Birdfeeder.
+        payload_file (str): Payload asset path, relative to the interface layer.
+
+    Returns:
+        Sdf.Layer: Anonymous interface layer.
+    """
+    source = stage.GetRootLayer()
+    layer = Sdf.Layer.CreateAnonymous(".usda")
+    for key in LAYER_METADATA:
+        if source.pseudoRoot.HasInfo(key):
+            layer.pseudoRoot.SetInfo(key, source.pseudoRoot.GetInfo(key))
+
+    asset_path = Sdf.Path(asset_path)
+    with Sdf.ChangeBlock():
+        for path in asset_path.GetPrefixes():
+            prim = stage.GetPrimAtPath(path)
+            spec = Sdf.CreatePrimInLayer(layer, path)
+            spec.specifier = Sdf.SpecifierDef
+            spec.typeName = prim.GetTypeName() if prim else "Scope"
+            spec.SetInfo("kind", Kind.Tokens.component if path == asset_path else Kind.Tokens.group)
+
+        asset_spec = layer.GetPrimAtPath(asset_path)
+        asset_prim = stage.GetPrimAtPath(asset_path)
+        if asset_prim.HasAPI(UsdGeom.ModelAPI):
+            asset_spec.SetInfo("apiSchemas", Sdf.TokenListOp.CreateExplicit(["GeomModelAPI"]))
+
+        extents_hint = asset_prim.GetAttribute("extentsHint")
+        if extents_hint.IsAuthored():
+            attr_spec = Sdf.AttributeSpec(asset_spec, "extentsHint", Sdf.ValueTypeNames.Float3Array)
+            if extents_hint.HasValue() and not extents_hint.GetNumTimeSamples():
+                attr_spec.default = extents_hint.Get()
+            for t in extents_hint.GetTimeSamples():
+                layer.SetTimeSample(attr_spec.path, t, extents_hint.Get(t))
+
+        asset_spec.payloadList.Prepend(Sdf.Payload(payload_file, asset_path))
+
+    return layer
+
+
+def payload_asset_path(payload_path: str) -> str:
+    """
+    Gets a published payload's asset path relative to the interface layer.
+
+    Args:
+        payload_path (str): Published payload file.
+
+    Returns:
+        str: Relative asset path, e.g. ./payload/Birdfeeder_v003.usdc
+    """
+    file_name = payload_path.replace("\\", "/").rsplit("/", 1)[-1]
+    return f"./{PAYLOAD_FOLDER}/{file_name}"
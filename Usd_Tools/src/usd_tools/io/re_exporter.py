@@ -1,14 +1,24 @@
-from pxr import Usd
+from pxr import Usd, Sdf
 import os
-from utils import file_utils
-from usd_tools import core, validator
+import time
+from utils import file_utils, store_utils
+from usd_tools import bounds, core, decimate, fingerprint, instancing, rules, validator
+from usd_tools.io import clips, formats, payloads
 
 
 class ReExporter:
     """
     Export class for reformatting input USD file.
     """
-    def __init__(self, input_file: str, asset_name: str, asset_type: str, shot_num="Empty"):
+    # What each export type needs composed from the input file.
+    OPEN_REQUIREMENTS = {
+        "mesh": {"mask": None, "load": Usd.Stage.LoadAll},
+        "anim": {"mask": "skip_mtl", "load": Usd.Stage.LoadAll},
+        "cam": {"mask": "cameras", "load": Usd.Stage.LoadNone},
+    }
+
+    def __init__(self, input_file: str, asset_name: str, asset_type: str, shot_num="Empty", dedupe=True, bake_transforms=False,
+                 masked_open=True, compare_open=False, output_format=None, skip_unchanged=True):
         """
         Initialise attributes from Usd export.
 
@@ -17,6 +27,17 @@ class ReExporter:
             asset_name (str): Name of asset that was exported.
             asset_type (str): Type of asset that was exported.
             shot_num (str, optional): Shot number that asset is associated with. Defaults to "Empty".
+            dedupe (bool, optional): Publish through the content-addressed depot store. Defaults to True.
+            bake_transforms (bool, optional): Bake static transforms into points and collapse
+                animated op stacks when validating. Defaults to False.
+            masked_open (bool, optional): Open only what each export type needs, when it runs.
+                Defaults to True.
+            compare_open (bool, optional): Also time a full open of the input for open_stats.
+                Defaults to False.
+            output_format (str, optional): Format for every export, e.g. "usda" when debugging.
+                Defaults to the project's per export type formats.
+            skip_unchanged (bool, optional): Skip publishing when the validated stage matches
+                the latest version's fingerprint. Defaults to True.
 
         Raises:
             FileNotFoundError: If no Usd file is found.
@@ -28,64 +49,338 @@ class ReExporter:
         self.shot_num = shot_num
         self.asset_type = asset_type
         self.asset_name = asset_name
-        self.stage = Usd.Stage.Open(self.input_file)
+        self.dedupe = dedupe
+        self.bake_transforms = bake_transforms
+        self.publish_info = None
+        self.masked_open = masked_open
+        self.compare_open = compare_open
+        self.open_stats = None
+        self.rule_stats = None
+        self.output_format = output_format
+        self.clip_stats = None
+        self.instance_stats = None
+        self.proxy_stats = None
+        self.primvar_savings = None
+        self.skip_unchanged = skip_unchanged
+        self.fingerprint = None
+        self.unchanged = False
+        self.stage = None if masked_open else Usd.Stage.Open(self.input_file)
+
+
+    def open_stage(self, export_type: str):
+        """
+        Opens the input file with the population mask and load rule the export type needs.
+
+        Camera exports find camera prims from the layer specs and compose only those
+        and their parents, without loading payloads. Animation exports skip mtl scopes.
+        Does nothing if the stage is already open.
+
+        Args:
+            export_type (str): Key of OPEN_REQUIREMENTS, e.g. "cam".
+        """
+        if self.stage is not None:
+            return
+
+        requirements = self.OPEN_REQUIREMENTS[export_type]
+        start = time.perf_counter()
+        layer = Sdf.Layer.FindOrOpen(self.input_file)
+
+        match requirements["mask"]:
+            case "cameras":
+                paths = core.find_prim_specs(layer, lambda spec: spec.typeName == "Camera")
+                mask = Usd.StagePopulationMask(paths) if paths else Usd.StagePopulationMask.All()
+            case "skip_mtl":
+                mask = core.mask_excluding(layer, ["mtl"])
+            case _:
+                mask = Usd.StagePopulationMask.All()
 
+        if mask.IncludesSubtree(Sdf.Path.absoluteRootPath):
+            self.stage = Usd.Stage.Open(layer, requirements["load"])
+        else:
+            self.stage = Usd.Stage.OpenMasked(layer, mask, requirements["load"])
 
-    def export_mesh(self):
+        self.open_stats = {
+            "export_type": export_type,
+            "masked": not mask.IncludesSubtree(Sdf.Path.absoluteRootPath),
+            "seconds": time.perf_counter() - start,
+        }
+
+        # Layers are already parsed by now, so this understates the full open.
+        if self.compare_open:
+            self.open_stats["prims"] = len(list(self.stage.Traverse()))
+            start = time.perf_counter()
+            full_stage = Usd.Stage.Open(self.input_file)
+            self.open_stats["full_seconds"] = time.perf_counter() - start
+            self.open_stats["full_prims"] = len(list(full_stage.Traverse()))
+
+
+    def export_mesh(self, move_mode="layer", instance_mode=None, transform_invariant=False, payload=False,
+                    proxy_ratio=None):
         """
         Re-exports Usd using defined defaults for a mesh export.
+
+        Args:
+            move_mode (str, optional): "layer" to reparent prims with one namespace edit,
+                "prim" to re-create them one by one. Defaults to "layer".
+            instance_mode (str, optional): "reference" to turn duplicate meshes into instanceable
+                references to shared prototypes, "point_instancer" to replace them with
+                PointInstancers. Defaults to None, leaving duplicates as they are.
+            transform_invariant (bool, optional): Also instance duplicates that were moved or
+                rotated, e.g. after baking transforms. Defaults to False.
+            payload (bool, optional): Publish the geometry to a payload behind a light interface
+                layer holding the asset's kind and extentsHint. Defaults to False.
+            proxy_ratio (float, optional): Author a decimated proxy purpose mesh next to each
+                mesh, keeping this fraction of its points, e.g. 0.1. Defaults to None.
+
+        Returns:
+            str: Published Usd file path, the interface layer's if payload is on.
         """
 
         path = f'/Scene/Assets/{self.asset_type}/{self.asset_name}/Geo'
-        self.stage = core.flatten_stage(self.stage)
+        self.open_stage("mesh")
+        self.flatten()
         self.root_prims = core.get_stage_root_prims(self.stage)
         self.stage = core.define_asset_hierarchy(self.stage, path)
 
         self.stage.SetDefaultPrim(self.stage.GetPrimAtPath(path))
 
         for root_prim in self.root_prims:
-            core.recursive_move_prims(self.stage, root_prim, path)
+            core.move_prims(self.stage, root_prim, path, move_mode)
         
-        self.stage = validator.Validator().validate_geo(self.stage)
+        stage_validator = validator.Validator(self.bake_transforms)
+        self.stage = stage_validator.validate_geo(self.stage)
+        self.rule_stats = stage_validator.stats
+        self.primvar_savings = stage_validator.primvar_savings
         #self.stage = validator.Validator().clear_pivots(self.stage)
 
+        if proxy_ratio:
+            self.proxy_stats = decimate.author_proxies(self.stage, path, proxy_ratio)
+
+        if instance_mode:
+            self.instance_stats = instancing.instance_duplicates(self.stage, path, transform_invariant, instance_mode)
+
+        asset_prim = self.stage.GetPrimAtPath(path).GetParent()
+        bounds.author_extents_hint(asset_prim)
+
         output_folder = fr"{os.getenv('PROJ')}\35_depot\assets\{self.asset_type}\{self.asset_name}\Geo"
         output_file_base = fr"{self.asset_name}"
-        output_file = file_utils.get_next_usd_file(output_file_base, output_folder, "usda")
-
-        self.stage.Export(output_file)
+        if payload:
+            return self.write_payload(output_file_base, output_folder, asset_prim.GetPath(), self.get_format("geo"))
+        return self.write(output_file_base, output_folder, self.get_format("geo"))
 
 
-    def export_anim(self):
+    def export_anim(self, use_clips=False, chunk_size=clips.CLIP_CHUNK_SIZE):
         """
         Re-exports Usd using defined defaults for an animation export.
+
+        Args:
+            use_clips (bool, optional): Write value clip chunks with a clip-stitched entry layer,
+                if the animation has a single root prim. Defaults to False.
+            chunk_size (int, optional): Frames per clip file. Defaults to clips.CLIP_CHUNK_SIZE.
+
+        Returns:
+            str: Published Usd file path.
         """
-        self.stage = validator.Validator().validate_anim(self.stage)
+        self.open_stage("anim")
+        stage_validator = validator.Validator(self.bake_transforms)
+        self.stage = stage_validator.validate_anim(self.stage)
+        self.rule_stats = stage_validator.stats
+        self.primvar_savings = stage_validator.primvar_savings
 
         output_folder = fr"{os.getenv('PROJ')}\35_depot\shots\{self.shot_num}\{self.asset_type}\{self.asset_name}\Anim"
         output_file_base = fr"{self.asset_name}_{self.shot_num}"
-        output_file = file_utils.get_next_usd_file(output_file_base, output_folder)
 
-        self.stage.Export(output_file)
+        root_prims = core.get_stage_root_prims(self.stage)
+        for root_prim in root_prims:
+            bounds.author_extents_hint(root_prim)
+
+        if use_clips and len(root_prims) == 1:
+            return self.write_clips(output_file_base, output_folder, root_prims[0].GetPath(), chunk_size, self.get_format("anim"))
+        return self.write(output_file_base, output_folder, self.get_format("anim"))
         
     
     def export_cam(self):
         """
         Re-exports Usd using defined defaults for a camera export.
+
+        Returns:
+            str: Published Usd file path.
         """
-        self.stage = core.flatten_stage(self.stage)
-        self.stage = core.remove_meshes(self.stage)
-        self.stage = core.remove_mats(self.stage)
+        self.open_stage("cam")
+        self.flatten()
+
+        # One pass instead of separate mesh, material and kind walks, gathering
+        # the remaining prims for the camera on the way.
+        prims = []
+        engine = rules.RuleEngine()
+        engine.remove_type("Mesh")
+        engine.remove_name("mtl")
+        engine.clear_metadata("kind")
+        engine.add_rule("gather", lambda prim, session: prims.append(prim) or rules.SKIPPED)
+        self.stage = engine.run(self.stage)
+        self.rule_stats = engine.stats
 
         path = f'/Scene/Cameras/RenderCam'
-        self.stage = core.create_new_camera(self.stage, path)
+        self.stage = core.create_new_camera(self.stage, path, prims)
 
         output_folder = fr"{os.getenv('PROJ')}\35_depot\shots\{self.shot_num}\Cameras"
         output_file_base = fr"Camera_{self.shot_num}"
-        output_file = file_utils.get_next_usd_file(output_file_base, output_folder, "usda")
+        return self.write(output_file_base, output_folder, self.get_format("cam"))
+
+
+    def get_format(self, export_type: str) -> str:
+        """
+        Gets the output format for an export type.
+
+        Args:
+            export_type (str): Export type, "geo", "anim" or "cam".
+
+        Returns:
+            str: Usd file extension to publish with.
+        """
+        return self.output_format or formats.get_export_format(export_type)
+
+
+    def flatten(self, root=None):
+        """
+        Flattens the stage, releasing the source stage before the flattened one is composed.
+
+        Args:
+            root (str, optional): Only flatten the subtree at this prim path. Defaults to None.
+        """
+        layer = core.flatten_layer(self.stage, root)
+        self.stage = None
+        self.stage = Usd.Stage.Open(layer)
+
+
+    def write(self, file_base: str, folder: str, extension="usd", layer=None) -> str:
+        """
+        Reserves the next version in the depot and exports the stage into it.
+
+        With dedupe on, the stage is exported to a local temp file and published
+        through the depot store, so identical publishes share one stored file.
+        Nothing is written if the stage is unchanged since the latest version.
+
+        Args:
+            file_base (str): Base file name.
+            folder (str): Depot folder to publish to.
+            extension (str, optional): Extension of Usd file. Defaults to "usd".
+            layer (Sdf.Layer, optional): Layer to publish as is, keeping its composition arcs.
+                Defaults to None, publishing the flattened stage.
+
+        Raises:
+            RuntimeError: If the stage fails to export.
+
+        Returns:
+            str: Published Usd file path, the latest version's if unchanged.
+        """
+        latest = self.find_unchanged(file_base, folder, layer)
+        if latest:
+            return latest
+
+        with file_utils.reserve_next_usd_file(file_base, folder, extension) as reservation:
+            if not self.dedupe:
+                exported = layer.Export(reservation.path) if layer else self.stage.Export(reservation.path)
+                if not exported:
+                    raise RuntimeError(f"Failed to export Usd file: {reservation.path}")
+                return reservation.path
+
+            tmp_file = store_utils.temp_export_path(extension)
+            try:
+                # No source comment, it names the temp file and would defeat dedupe.
+                exported = layer.Export(tmp_file) if layer else self.stage.Export(tmp_file, addSourceFileComment=False)
+                if not exported:
+                    raise RuntimeError(f"Failed to export Usd file: {reservation.path}")
+                self.publish_info = store_utils.publish_file(tmp_file, reservation.path)
+            finally:
+                os.remove(tmp_file)
+
+        return reservation.path
+
+
+    def write_payload(self, file_base: str, folder: str, asset_path: Sdf.Path, extension="usd") -> str:
+        """
+        Publishes the stage as payload geometry, then an interface layer that loads it.
+
+        Payloads go in a payload folder next to the interface layers and are
+        versioned on their own, so an unchanged payload is shared by new interfaces.
+
+        Args:
+            file_base (str): Base file name.
+            folder (str): Depot folder to publish the interface layer to.
+            asset_path (Sdf.Path): Asset primitive the payload is attached to.
+            extension (str, optional): Extension of the payload file. Defaults to "usd".
+
+        Returns:
+            str: Published interface layer path, the latest version's if unchanged.
+        """
+        payload_folder = fr"{folder}\{payloads.PAYLOAD_FOLDER}"
+        os.makedirs(payload_folder, exist_ok=True)
+        payload_path = self.write(file_base, payload_folder, extension)
+        layer = payloads.build_interface_layer(self.stage, asset_path, payloads.payload_asset_path(payload_path))
+        return self.write(file_base, folder, "usda", layer)
+
+
+    def write_clips(self, file_base: str, folder: str, clip_path: Sdf.Path, chunk_size: int, extension="usd") -> str:
+        """
+        Reserves the next version in the depot and exports the stage into it as value clips.
+
+        Clip files go in a clips folder shared by every version, named by content hash,
+        so re-exporting part of a frame range only writes the chunks that changed.
+
+        Args:
+            file_base (str): Base file name.
+            folder (str): Depot folder to publish to.
+            clip_path (Sdf.Path): Root prim the clips apply to.
+            chunk_size (int): Frames per clip file.
+            extension (str, optional): Extension of Usd files. Defaults to "usd".
+
+        Returns:
+            str: Published entry layer path, the latest version's if unchanged.
+        """
+        latest = self.find_unchanged(file_base, folder)
+        if latest:
+            return latest
+
+        with file_utils.reserve_next_usd_file(file_base, folder, extension) as reservation:
+            clip_folder = fr"{folder}\clips"
+            self.clip_stats = clips.export_clips(self.stage, str(clip_path), reservation.path, clip_folder,
+                                                 file_base, chunk_size, extension,
+                                                 {fingerprint.FINGERPRINT_KEY: self.fingerprint})
+
+        return reservation.path
+
+
+    def find_unchanged(self, file_base: str, folder: str, layer=None) -> str | None:
+        """
+        Fingerprints the stage, stamps it on the root layer and compares it with the latest version.
+
+        Args:
+            file_base (str): Base file name.
+            folder (str): Depot folder to publish to.
+            layer (Sdf.Layer, optional): Layer to fingerprint and stamp instead, composed
+                without loading payloads. Defaults to None.
+
+        Returns:
+            str | None: Latest version's path if it has the same fingerprint, otherwise None.
+        """
+        self.unchanged = False
+        if layer:
+            self.fingerprint = fingerprint.stage_fingerprint(Usd.Stage.Open(layer, Usd.Stage.LoadNone))
+            fingerprint.stamp_fingerprint(layer, self.fingerprint)
+        else:
+            self.fingerprint = fingerprint.stage_fingerprint(self.stage)
+            fingerprint.stamp_fingerprint(self.stage.GetRootLayer(), self.fingerprint)
+
+        if not self.skip_unchanged:
+            return None
+
+        latest = file_utils.get_latest_usd_file(file_base, folder)
+        if latest and fingerprint.read_fingerprint(latest) == self.fingerprint:
+            self.unchanged = True
+            return latest
+        return None
 
-        self.stage.Export(output_file)
-    
 
 if __name__ == "__main__":
     exp = ReExporter(r"S:\usd_testing\removing_pivots\in_01.usda", "Birdfeeder", "Prop")
@@ -0,0 +1,89 @@
+import numpy as np
+from pxr import Usd, UsdGeom, Vt
+from usd_tools import transforms
+
+
+# Bytes per element of a primvar's indices, stored as int.
+INDEX_BYTES = 4
+
+
+def index_values(values: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Splits an array into its unique elements and indices into them.
+
+    Elements are compared by their bytes, so values like -0.0 and NaN are kept
+    exactly as they were. Unique elements stay in order of first use.
+
+    Args:
+        values (np.ndarray): Array with one element per row, e.g. shape (n, 2) for texture coordinates.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: Unique elements and the index of each original element.
+    """
+    rows = np.ascontiguousarray(values.reshape(len(values), -1))
+    keys = rows.view(np.dtype((np.void, rows.dtype.itemsize * rows.shape[1]))).reshape(-1)
+    _, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+
+    order = np.argsort(first)
+    remap = np.empty_like(order)
+    remap[order] = np.arange(len(order))
+    return values[first[order]], remap[inverse.reshape(-1)]
+
+
+def index_primvar(primvar: UsdGeom.Primvar) -> int:
+    """
+    Converts a flat primvar to indexed form when that stores fewer bytes.
+
+    Args:
+        primvar (UsdGeom.Primvar): Primvar to convert.
+
+    Returns:
+        int: Bytes saved, 0 if the primvar was left unchanged.
+    """
+    if primvar.IsIndexed() or primvar.GetInterpolation() == UsdGeom.Tokens.constant:
+        return 0
+
+    attr = primvar.GetAttr()
+    if not attr.HasAuthoredValue() or attr.ValueMightBeTimeVarying():
+        return 0
+
+    value = attr.Get()
+    if value is None or not hasattr(value, "__len__") or len(value) < 2:
+        return 0
+
+    values = np.asarray(value)
+    if values.dtype.kind not in "biuf":
+        return 0
+
+    unique, indices = index_values(values)
+    saved = values.nbytes - unique.nbytes - len(indices) * INDEX_BYTES
+    if saved <= 0:
+        return 0
+
+    transforms.write_values(attr, {None: type(value).FromNumpy(unique)})
+    primvar.SetIndices(Vt.IntArray.FromNumpy(indices.astype(np.int32)))
+    return saved
+
+
+def index_primvars(stage: Usd.Stage) -> dict[str, int]:
+    """
+    Converts flat primvars on every geometric primitive to indexed form where it saves space.
+
+    Values are unchanged once indices are applied.
+
+    Args:
+        stage (Usd.Stage): Stage to convert.
+
+    Returns:
+        dict[str, int]: Bytes saved, keyed by primitive path.
+    """
+    report = {}
+    for prim in stage.Traverse():
+        if not prim.IsA(UsdGeom.Gprim):
+            continue
+
+        saved = sum(index_primvar(primvar) for primvar in UsdGeom.PrimvarsAPI(prim).GetAuthoredPrimvars())
+        if saved:
+            report[str(prim.GetPath())] = saved
+
+    return report
@@ -0,0 +1,228 @@
+import os
+import numpy as np
+from pxr import Usd, UsdGeom, Sdf, Vt
+from utils import store_utils
+from usd_tools import transforms
+
+
+# Quantization modes.
+HALF = "half"
+ROUND = "round"
+
+
+def quantize_array(array: np.ndarray, mode: str, bound: float) -> np.ndarray:
+    """
+    Reduces the precision of a float array.
+
+    "half" rounds every value through float16. "round" snaps values to the largest
+    power of two grid whose rounding error stays within bound.
+
+    Args:
+        array (np.ndarray): Float array.
+        mode (str): "half" or "round".
+        bound (float): Largest allowed absolute error, used by "round".
+
+    Raises:
+        ValueError: If mode is unknown.
+
+    Returns:
+        np.ndarray: Quantized array, same dtype as the input.
+    """
+    if mode == HALF:
+        return array.astype(np.float16).astype(array.dtype)
+    if mode == ROUND:
+        if bound <= 0.0:
+            return array
+        step = 2.0 ** np.floor(np.log2(2.0 * bound))
+        return (np.round(array / step) * step).astype(array.dtype)
+    raise ValueError(f"Unknown quantization mode: {mode}")
+
+
+def quantize_values(attr: Usd.Attribute, mode: str, bound: float) -> tuple[dict, float] | None:
+    """
+    Quantizes the default value and every time sample of a float array attribute.
+
+    Args:
+        attr (Usd.Attribute): Attribute to read, e.g. points.
+        mode (str): "half" or "round".
+        bound (float): Largest allowed absolute error.
+
+    Returns:
+        tuple[dict, float] | None: Quantized arrays keyed by time, None for the default value,
+            and the max deviation. None if the attribute isn't a float array or the result
+            would deviate by more than bound.
+    """
+    if not attr or not attr.HasAuthoredValue():
+        return None
+
+    values = {t: attr.Get(t) for t in attr.GetTimeSamples()}
+    default = attr.Get(Usd.TimeCode.Default())
+    if default is not None:
+        values[None] = default
+
+    quantized = {}
+    max_deviation = 0.0
+    for t, value in values.items():
+        array = np.asarray(value)
+        if array.dtype.kind != "f" or not array.size:
+            return None
+
+        quantized[t] = quantize_array(array, mode, bound)
+        max_deviation = max(max_deviation, float(np.abs(quantized[t].astype(np.float64) - array).max()))
+
+    if max_deviation > bound:
+        return None
+    return quantized, max_deviation
+
+
+def quantize_attribute(attr: Usd.Attribute, mode: str, bound: float) -> dict[str, float] | None:
+    """
+    Quantizes a float array attribute in place, keeping its type.
+
+    Nothing is written if the result would deviate by more than bound.
+
+    Args:
+        attr (Usd.Attribute): Attribute to quantize, e.g. points.
+        mode (str): "half" or "round".
+        bound (float): Largest allowed absolute error.
+
+    Returns:
+        dict[str, float] | None: Max deviation, None if the attribute was left unchanged.
+    """
+    result = quantize_values(attr, mode, bound)
+    if result is None:
+        return None
+
+    quantized, max_deviation = result
+    value_type = attr.GetTypeName().type.pythonClass
+    transforms.write_values(attr, {t: value_type.FromNumpy(array) for t, array in quantized.items()})
+    return {"max_deviation": max_deviation}
+
+
+def half_normals(prim: Usd.Prim, bound: float) -> tuple[Usd.Attribute, dict[str, float]] | None:
+    """
+    Re-authors a primitive's normals as a half precision primvars:normals, which takes
+    precedence over the normals attribute.
+
+    Indices and interpolation are kept, and the float normals are removed.
+
+    Args:
+        prim (Usd.Prim): Point based primitive.
+        bound (float): Largest allowed absolute error.
+
+    Returns:
+        tuple[Usd.Attribute, dict[str, float]] | None: New primvar attribute and max deviation,
+            None if the normals were left unchanged.
+    """
+    point_based = UsdGeom.PointBased(prim)
+    primvar = UsdGeom.PrimvarsAPI(prim).GetPrimvar("normals")
+    if primvar and primvar.GetAttr().HasAuthoredValue():
+        source = primvar.GetAttr()
+        interpolation = primvar.GetInterpolation()
+    else:
+        source = point_based.GetNormalsAttr()
+        interpolation = point_based.GetNormalsInterpolation()
+
+    if source.GetTypeName() == Sdf.ValueTypeNames.Normal3hArray:
+        return None
+
+    result = quantize_values(source, HALF, bound)
+    if result is None:
+        return None
+
+    quantized, max_deviation = result
+    prim.RemoveProperty(source.GetName())
+    attr = UsdGeom.PrimvarsAPI(prim).CreatePrimvar("normals", Sdf.ValueTypeNames.Normal3hArray, interpolation).GetAttr()
+    transforms.write_values(attr, {t: Vt.Vec3hArray.FromNumpy(array.astype(np.float16)) for t, array in quantized.items()})
+    return attr, {"max_deviation": max_deviation}
+
+
+def get_points_diagonal(attr: Usd.Attribute) -> float:
+    """
+    Gets the bounding box diagonal of a points attribute over all time samples.
+
+    Args:
+        attr (Usd.Attribute): Points attribute.
+
+    Returns:
+        float: Bounding box diagonal length.
+    """
+    lo = None
+    hi = None
+    for t in attr.GetTimeSamples() or [Usd.TimeCode.Default()]:
+        value = attr.Get(t)
+        if value is None or not len(value):
+            continue
+        points = np.asarray(value, dtype=np.float64)
+        lo = points.min(axis=0) if lo is None else np.minimum(lo, points.min(axis=0))
+        hi = points.max(axis=0) if hi is None else np.maximum(hi, points.max(axis=0))
+
+    if lo is None:
+        return 0.0
+    return float(np.linalg.norm(hi - lo))
+
+
+def quantize_points(stage: Usd.Stage, mode=HALF, error_bound=1e-4) -> dict[str, dict[str, float]]:
+    """
+    Quantizes points and normals of every point based primitive on the stage.
+
+    "half" re-authors normals as half precision primvars, halving their size in the
+    published file. Points stay float3, as the schema types them, so both modes only
+    round them, which doesn't shrink the file but lets held sample elimination drop
+    samples that become equal.
+
+    The error bound for points is relative to each primitive's bounding box
+    diagonal; for normals, which are unit length, it is used as is.
+
+    Args:
+        stage (Usd.Stage): Stage to quantize.
+        mode (str, optional): "half" or "round". Defaults to "half".
+        error_bound (float, optional): Largest allowed error relative to the bounding box. Defaults to 1e-4.
+
+    Returns:
+        dict[str, dict[str, float]]: Max deviation and allowed error of each quantized
+            attribute, keyed by attribute path.
+    """
+    report = {}
+    for prim in stage.Traverse():
+        if not prim.IsA(UsdGeom.PointBased):
+            continue
+
+        points = UsdGeom.PointBased(prim).GetPointsAttr()
+        bound = error_bound * get_points_diagonal(points)
+        result = quantize_attribute(points, mode, bound)
+        if result is not None:
+            report[str(points.GetPath())] = {**result, "bound": bound}
+
+        if mode == HALF:
+            result = half_normals(prim, error_bound)
+            if result is not None:
+                attr, result = result
+                report[str(attr.GetPath())] = {**result, "bound": error_bound}
+            continue
+
+        for attr in (UsdGeom.PointBased(prim).GetNormalsAttr(), UsdGeom.PrimvarsAPI(prim).GetPrimvar("normals").GetAttr()):
+            result = quantize_attribute(attr, mode, error_bound)
+            if result is not None:
+                report[str(attr.GetPath())] = {**result, "bound": error_bound}
+
+    return report
+
+
+def exported_size(stage: Usd.Stage, extension="usdc") -> int:
+    """
+    Gets the size of a stage written to a Usd file, for reporting what quantization saved.
+
+    Args:
+        stage (Usd.Stage): Stage to measure.
+        extension (str, optional): Format to write. Defaults to "usdc".
+
+    Returns:
+        int: File size in bytes.
+    """
+    path = store_utils.temp_export_path(extension)
+    try:
+        stage.Export(path, addSourceFileComment=False)
+        return os.path.getsize(path)
+    finally:
+        os.remove(path)
@@ -0,0 +1,133 @@
+import time
+from pxr import Usd
+from usd_tools.edit_session import edit_session
+
+
+# Rule results.
+SKIPPED = 0
+EDITED = 1
+REMOVED = 2
+
+
+class RuleEngine:
+    """
+    Cleanup rules applied to a stage in a single traversal.
+
+    Rules run in the order they were added. Once a rule removes a prim the
+    remaining rules are skipped for it and its children are pruned from the
+    traversal. All edits go through one edit session.
+    """
+    def __init__(self):
+        """
+        Initialise empty rule list.
+        """
+        self.rules = []
+        self.stats = {}
+
+
+    def add_rule(self, name: str, fn):
+        """
+        Adds a rule run on every prim.
+
+        Args:
+            name (str): Rule name used in stats.
+            fn (Callable[[Usd.Prim, EditSession], int]): Applies the rule to a prim,
+                returning SKIPPED, EDITED or REMOVED.
+        """
+        self.rules.append((name, fn))
+        self.stats[name] = {"hits": 0, "seconds": 0.0}
+
+
+    def remove_type(self, type_name: str):
+        """
+        Adds a rule removing prims of a type.
+
+        Args:
+            type_name (str): Schema type, e.g. "Mesh".
+        """
+        def rule(prim, session):
+            if prim.IsA(type_name):
+                session.remove_prim(prim.GetPath())
+                return REMOVED
+            return SKIPPED
+
+        self.add_rule(f"remove_type:{type_name}", rule)
+
+
+    def remove_name(self, name: str):
+        """
+        Adds a rule removing prims with a name.
+
+        Args:
+            name (str): Prim name, e.g. "mtl".
+        """
+        def rule(prim, session):
+            if prim.GetName() == name:
+                session.remove_prim(prim.GetPath())
+                return REMOVED
+            return SKIPPED
+
+        self.add_rule(f"remove_name:{name}", rule)
+
+
+    def clear_metadata(self, key: str):
+        """
+        Adds a rule clearing authored metadata from every prim.
+
+        Args:
+            key (str): Metadata key, e.g. "kind".
+        """
+        def rule(prim, session):
+            if prim.HasAuthoredMetadata(key):
+                session.clear_metadata(prim, key)
+                return EDITED
+            return SKIPPED
+
+        self.add_rule(f"clear_metadata:{key}", rule)
+
+
+    def attribute_policy(self, type_name: str, fn):
+        """
+        Adds a rule run on every authored attribute of prims of a type.
+
+        Args:
+            type_name (str): Schema type, e.g. "Mesh".
+            fn (Callable[[EditSession, Usd.Prim, Usd.Attribute], None]): Policy applied to each attribute.
+        """
+        def rule(prim, session):
+            if not prim.IsA(type_name):
+                return SKIPPED
+            for attr in prim.GetAuthoredAttributes():
+                fn(session, prim, attr)
+            return EDITED
+
+        self.add_rule(f"attributes:{type_name}", rule)
+
+
+    def run(self, stage: Usd.Stage) -> Usd.Stage:
+        """
+        Applies all rules to the stage in one traversal.
+
+        Args:
+            stage (Usd.Stage): Stage to clean.
+
+        Returns:
+            Usd.Stage: Cleaned Stage.
+        """
+        with edit_session(stage) as session:
+            prim_range = iter(stage.Traverse())
+            for prim in prim_range:
+                for name, fn in self.rules:
+                    start = time.perf_counter()
+                    result = fn(prim, session)
+                    stats = self.stats[name]
+                    stats["seconds"] += time.perf_counter() - start
+
+                    if result == SKIPPED:
+                        continue
+                    stats["hits"] += 1
+                    if result == REMOVED:
+                        prim_range.PruneChildren()
+                        break
+
+        return stage
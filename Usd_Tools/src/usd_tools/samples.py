@@ -0,0 +1,132 @@
+import numpy as np
+from pxr import Usd
+from usd_tools.edit_session import edit_session
+
+
+def held_sample_mask(values: list, tolerance=0.0) -> np.ndarray:
+    """
+    Finds time samples that repeat the samples around them.
+
+    The first and last sample of every run of equal values are kept, so linear
+    interpolation into and out of the run is unchanged.
+
+    Args:
+        values (list): Sample values in time order, as numpy arrays.
+        tolerance (float, optional): Largest absolute difference treated as equal,
+            0 for exact comparison. Defaults to 0.0.
+
+    Returns:
+        np.ndarray: Boolean mask, true for samples that can be dropped.
+    """
+    count = len(values)
+    same = np.zeros(count, dtype=bool)
+    if count < 3:
+        return same
+
+    shapes = {v.shape for v in values}
+    if len(shapes) == 1 and tolerance == 0.0:
+        stacked = np.stack(values).reshape(count, -1)
+        same[1:] = (stacked[1:] == stacked[:-1]).all(axis=1)
+    else:
+        # Compare against the start of the run so slow drift isn't collapsed.
+        anchor = values[0]
+        for i in range(1, count):
+            value = values[i]
+            if value.shape == anchor.shape and _within(value, anchor, tolerance):
+                same[i] = True
+            else:
+                anchor = value
+
+    # A sample is held if it matches the one before and the one after matches it.
+    held = np.zeros(count, dtype=bool)
+    held[1:-1] = same[1:-1] & same[2:]
+    return held
+
+
+def eliminate_held_samples(stage: Usd.Stage, tolerance=0.0) -> dict[str, int]:
+    """
+    Removes time samples that hold the same value, demoting fully static attributes to defaults.
+
+    Args:
+        stage (Usd.Stage): Stage to clean.
+        tolerance (float, optional): Largest absolute difference treated as equal,
+            0 for exact comparison. Defaults to 0.0.
+
+    Returns:
+        dict[str, int]: Approximate bytes of sample data removed, keyed by prim path.
+    """
+    saved = {}
+    with edit_session(stage) as session:
+        for prim in stage.Traverse():
+            prim_saved = 0
+            for attr in prim.GetAuthoredAttributes():
+                prim_saved += eliminate_attribute_samples(attr, session, tolerance)
+            if prim_saved:
+                saved[str(prim.GetPath())] = prim_saved
+
+    return saved
+
+
+def eliminate_attribute_samples(attr: Usd.Attribute, session, tolerance=0.0) -> int:
+    """
+    Removes held time samples from one attribute.
+
+    Args:
+        attr (Usd.Attribute): Attribute to clean.
+        session (EditSession): Session to add edits to.
+        tolerance (float, optional): Largest absolute difference treated as equal. Defaults to 0.0.
+
+    Returns:
+        int: Approximate bytes of sample data removed.
+    """
+    times = attr.GetTimeSamples()
+    if len(times) < 2:
+        return 0
+
+    query = Usd.AttributeQuery(attr)
+    raw = [query.Get(t) for t in times]
+    values = [np.asarray(v) for v in raw]
+    if any(v.dtype.kind not in "biuf" for v in values):
+        return 0
+
+    sizes = [max(v.nbytes, 1) for v in values]
+    if all(v.shape == values[0].shape for v in values) and _all_equal(values, tolerance):
+        session.set_default(attr, raw[0], clear_samples=True)
+        return sum(sizes) - sizes[0]
+
+    held = held_sample_mask(values, tolerance)
+    for t, drop in zip(times, held):
+        if drop:
+            session.clear_at_time(attr, t)
+    return int(sum(size for size, drop in zip(sizes, held) if drop))
+
+
+def _all_equal(values: list, tolerance: float) -> bool:
+    """
+    Checks if every value is within tolerance of the first.
+
+    Args:
+        values (list): Numpy arrays of equal shape.
+        tolerance (float): Largest absolute difference treated as equal.
+
+    Returns:
+        bool: Returns true if all values are equal.
+    """
+    return _within(np.stack(values), values[0], tolerance)
+
+
+def _within(a: np.ndarray, b: np.ndarray, tolerance: float) -> bool:
+    """
+    Checks if two arrays are equal within tolerance.
+
+    Args:
+        a (np.ndarray): First array.
+        b (np.ndarray): Second array, broadcast against the first.
+        tolerance (float): Largest absolute difference treated as equal.
+
+    Returns:
+        bool: Returns true if all elements are within tolerance.
+    """
+    if tolerance == 0.0 or a.dtype.kind == "b":
+        return bool((a == b).all())
+    return bool((np.abs(a.astype(np.float64) - b) <= tolerance).all())
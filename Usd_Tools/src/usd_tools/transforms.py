@@ -0,0 +1,257 @@
+import numpy as np
+from pxr import Usd, UsdGeom, Sdf, Gf, Vt
+from usd_tools.edit_session import edit_session
+
+
+def bake_transforms(stage: Usd.Stage, bake_static=True, collapse_animated=True) -> Usd.Stage:
+    """
+    Bakes transforms on given stage so downstream stages evaluate fewer xform ops.
+
+    Point based primitives whose world transform is static get it applied to
+    their points, normals and extent, and the xform ops of those primitives and
+    their static parents are dropped. Primitives with animated transforms keep
+    their placement, with their op stack collapsed into one matrix op.
+
+    Args:
+        stage (Usd.Stage): Stage to bake transforms on.
+        bake_static (bool, optional): Bake static transforms into points. Defaults to True.
+        collapse_animated (bool, optional): Collapse remaining op stacks into a matrix op. Defaults to True.
+
+    Returns:
+        Usd.Stage: Stage with baked transforms.
+    """
+    animated = get_animated_prims(stage)
+    baked = set()
+
+    if bake_static:
+        # Only primitives that lose their ops get points baked, anything else
+        # would be transformed twice, e.g. a static mesh with an animated child.
+        baked = get_bakeable_prims(stage, animated)
+        xform_cache = UsdGeom.XformCache(stage.GetStartTimeCode())
+        for path in baked:
+            prim = stage.GetPrimAtPath(path)
+            if prim.IsA(UsdGeom.PointBased):
+                bake_points(prim, xform_cache.GetLocalToWorldTransform(prim))
+
+        with edit_session(stage) as session:
+            for path in baked:
+                # Parents that keep their ops must not move the baked points again.
+                reset = path.GetParentPath() not in baked
+                clear_xform_ops(stage.GetPrimAtPath(path), session, reset)
+
+    if collapse_animated:
+        with edit_session(stage) as session:
+            for prim in stage.Traverse():
+                if prim.GetPath() not in baked and prim.IsA(UsdGeom.Xformable):
+                    collapse_xform_ops(prim, session)
+
+    return stage
+
+
+def get_animated_prims(stage: Usd.Stage) -> set[Sdf.Path]:
+    """
+    Gets primitives whose world transform changes over time.
+
+    Args:
+        stage (Usd.Stage): Stage to check.
+
+    Returns:
+        set[Sdf.Path]: Paths of primitives with an animated transform or animated parent.
+    """
+    animated = set()
+    for prim in stage.Traverse():
+        if prim.GetParent().GetPath() in animated:
+            animated.add(prim.GetPath())
+        elif prim.IsA(UsdGeom.Xformable) and UsdGeom.Xformable(prim).TransformMightBeTimeVarying():
+            animated.add(prim.GetPath())
+
+    return animated
+
+
+def get_bakeable_prims(stage: Usd.Stage, animated: set[Sdf.Path]) -> set[Sdf.Path]:
+    """
+    Gets xformable primitives whose ops can be dropped once points are baked.
+
+    A primitive qualifies when nothing at or under it is animated and every
+    xformable at or under it is either point based or a plain Xform.
+
+    Args:
+        stage (Usd.Stage): Stage to check.
+        animated (set[Sdf.Path]): Paths of animated primitives.
+
+    Returns:
+        set[Sdf.Path]: Paths of primitives to clear xform ops on.
+    """
+    blocked = set()
+    for prim in stage.Traverse():
+        path = prim.GetPath()
+        placed = prim.IsA(UsdGeom.Xformable) and not prim.IsA(UsdGeom.PointBased) and not prim.IsA(UsdGeom.Xform)
+        if path in animated or placed:
+            while path != Sdf.Path.absoluteRootPath and path not in blocked:
+                blocked.add(path)
+                path = path.GetParentPath()
+
+    return {prim.GetPath() for prim in stage.Traverse()
+            if prim.IsA(UsdGeom.Xformable) and prim.GetPath() not in blocked}
+
+
+def bake_points(prim: Usd.Prim, matrix: Gf.Matrix4d):
+    """
+    Applies a transform to the points, normals and extent of a point based primitive.
+
+    Args:
+        prim (Usd.Prim): Point based primitive.
+        matrix (Gf.Matrix4d): Transform to apply.
+    """
+    if Gf.IsClose(matrix, Gf.Matrix4d(1), 1e-9):
+        return
+
+    m = np.array(matrix, dtype=np.float64)
+    rotate_scale = m[:3, :3]
+    translate = m[3, :3]
+    normal_matrix = np.linalg.inv(rotate_scale).T
+
+    def transform_points(points):
+        return points @ rotate_scale + translate
+
+    def transform_extent(extent):
+        lo, hi = extent
+        corners = np.array([[x, y, z] for x in (lo[0], hi[0]) for y in (lo[1], hi[1]) for z in (lo[2], hi[2])])
+        corners = transform_points(corners)
+        return np.array([corners.min(axis=0), corners.max(axis=0)])
+
+    def transform_normals(normals):
+        normals = normals @ normal_matrix
+        length = np.linalg.norm(normals, axis=1, keepdims=True)
+        return normals / np.where(length == 0.0, 1.0, length)
+
+    point_based = UsdGeom.PointBased(prim)
+    transform_values(point_based.GetPointsAttr(), transform_points)
+    transform_values(point_based.GetExtentAttr(), transform_extent)
+    transform_values(point_based.GetNormalsAttr(), transform_normals)
+
+    normals_pv = UsdGeom.PrimvarsAPI(prim).GetPrimvar("normals")
+    if normals_pv:
+        transform_values(normals_pv.GetAttr(), transform_normals)
+
+    # Mirroring flips the winding order.
+    if np.linalg.det(rotate_scale) < 0.0:
+        orientation = point_based.GetOrientationAttr()
+        if orientation.Get() == UsdGeom.Tokens.leftHanded:
+            orientation.Set(UsdGeom.Tokens.rightHanded)
+        else:
+            orientation.Set(UsdGeom.Tokens.leftHanded)
+
+
+def transform_values(attr: Usd.Attribute, fn):
+    """
+    Applies a function to the default value and every time sample of an array attribute.
+
+    Args:
+        attr (Usd.Attribute): Array attribute to transform, e.g. points.
+        fn (Callable[[np.ndarray], np.ndarray]): Function run on each value as a float64 array.
+    """
+    if not attr or not attr.HasAuthoredValue():
+        return
+
+    values = {t: attr.Get(t) for t in attr.GetTimeSamples()}
+    default = attr.Get(Usd.TimeCode.Default())
+    if default is not None:
+        values[None] = default
+
+    for t, value in values.items():
+        if not len(value):
+            continue
+        array = np.asarray(value)
+        values[t] = type(value).FromNumpy(fn(array.astype(np.float64)).astype(array.dtype))
+
+    write_values(attr, values)
+
+
+def write_values(attr: Usd.Attribute, values: dict):
+    """
+    Writes a default value and time samples to an attribute in one change block.
+
+    Args:
+        attr (Usd.Attribute): Attribute to write to.
+        values (dict): Values keyed by time, None for the default value.
+    """
+    edit_target = attr.GetStage().GetEditTarget()
+    layer = edit_target.GetLayer()
+    spec_path = edit_target.MapToSpecPath(attr.GetPath())
+    spec = layer.GetAttributeAtPath(spec_path)
+
+    if spec is None:
+        for t, value in values.items():
+            attr.Set(value, Usd.TimeCode.Default() if t is None else t)
+        return
+
+    with Sdf.ChangeBlock():
+        for t, value in values.items():
+            if t is None:
+                spec.default = value
+            else:
+                layer.SetTimeSample(spec_path, t, value)
+
+
+def clear_xform_ops(prim: Usd.Prim, session, reset=False):
+    """
+    Removes all xform ops from a primitive.
+
+    Args:
+        prim (Usd.Prim): Xformable primitive.
+        session (EditSession): Session to add edits to.
+        reset (bool, optional): Stop parent transforms applying to the primitive. Defaults to False.
+    """
+    xf = UsdGeom.Xformable(prim)
+    for attr in prim.GetAuthoredAttributes():
+        if attr.GetName().startswith("xformOp:"):
+            session.remove_property(prim, attr.GetName())
+
+    order = xf.GetXformOpOrderAttr()
+    if reset:
+        session.set_default(order, Vt.TokenArray([UsdGeom.XformOpTypes.resetXformStack]), clear_samples=True)
+    elif order.HasAuthoredValue():
+        session.remove_property(prim, order.GetName())
+
+
+def collapse_xform_ops(prim: Usd.Prim, session):
+    """
+    Replaces a primitive's xform op stack with a single matrix op.
+
+    The local transform is evaluated at every time any op is sampled, so the
+    result matches the original stack on those times.
+
+    Args:
+        prim (Usd.Prim): Xformable primitive.
+        session (EditSession): Session to add edits to.
+    """
+    xf = UsdGeom.Xformable(prim)
+    ops = xf.GetOrderedXformOps()
+    if not ops or (len(ops) == 1 and ops[0].GetOpType() == UsdGeom.XformOp.TypeTransform):
+        return
+
+    times = sorted({t for op in ops for t in op.GetTimeSamples()})
+    if times:
+        matrices = {t: xf.GetLocalTransformation(t) for t in times}
+    else:
+        matrices = {None: xf.GetLocalTransformation(Usd.TimeCode.Default())}
+
+    name = "xformOp:transform"
+    order = [name]
+    if xf.GetResetXformStack():
+        order.insert(0, UsdGeom.XformOpTypes.resetXformStack)
+
+    for op in ops:
+        if op.GetAttr().GetName() != name:
+            session.remove_property(prim, op.GetAttr().GetName())
+
+    attr = prim.GetAttribute(name) or prim.CreateAttribute(name, Sdf.ValueTypeNames.Matrix4d, custom=False)
+    session.clear_values(attr)
+    for t, matrix in matrices.items():
+        if t is None:
+            session.set_default(attr, matrix)
+        else:
+            session.set_time_sample(attr, t, matrix)
+
+    session.set_default(xf.GetXformOpOrderAttr(), Vt.TokenArray(order), clear_samples=True)
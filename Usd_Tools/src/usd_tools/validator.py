@@ -1,8 +1,78 @@
 from pxr import Usd, UsdShade, UsdGeom, Gf
-from usd_tools import core
+from usd_tools import bounds, core, primvars, quantize, rules, samples, transforms
+from usd_tools.edit_session import edit_session
+
+
+def remove_material_binding(prim: Usd.Prim, session) -> int:
+    """
+    Rule removing a prim's direct material binding.
+
+    Unbinding would author an empty binding, removing the relationship covers it.
+
+    Args:
+        prim (Usd.Prim): Prim to clean.
+        session (EditSession): Session to add edits to.
+
+    Returns:
+        int: Rule result.
+    """
+    if prim.HasAPI(UsdShade.MaterialBindingAPI) or prim.GetRelationship('material:binding'):
+        session.remove_property(prim, 'material:binding')
+        return rules.EDITED
+    return rules.SKIPPED
+
+
+def set_prim_defaults(prim: Usd.Prim, session) -> int:
+    """
+    Rule setting intended default values on meshes.
+
+    Args:
+        prim (Usd.Prim): Prim to edit.
+        session (EditSession): Session to add edits to.
+
+    Returns:
+        int: Rule result.
+    """
+    if not prim.IsA("Mesh"):
+        return rules.SKIPPED
+    core.set_prim_defaults(prim)
+    return rules.EDITED
 
 
 class Validator:
+    def __init__(self, bake_transforms=False, eliminate_held=True, sample_tolerance=0.0, quantize_mode=None, quantize_error=1e-4,
+                 index_primvars=True):
+        """
+        Initialise validation options.
+
+        Args:
+            bake_transforms (bool, optional): Bake static transforms into points and collapse
+                animated op stacks into matrix ops, instead of clearing pivots. Defaults to False.
+            eliminate_held (bool, optional): Drop animation time samples that hold the same value.
+                Defaults to True.
+            sample_tolerance (float, optional): Largest difference between samples treated as
+                held, 0 for exact comparison. Defaults to 0.0.
+            quantize_mode (str, optional): Reduce precision of animated points and normals,
+                "half" or "round". Points stay float3, so this doesn't make the published file
+                smaller, but samples that quantize the same are dropped as held. quantize_report
+                holds the exported size before and after. Defaults to None, keeping full precision.
+            quantize_error (float, optional): Largest quantization error relative to each mesh's
+                bounding box. Defaults to 1e-4.
+            index_primvars (bool, optional): Convert flat primvars to indexed form where that
+                stores fewer bytes. Defaults to True.
+        """
+        self.bake_transforms = bake_transforms
+        self.eliminate_held = eliminate_held
+        self.sample_tolerance = sample_tolerance
+        self.quantize_mode = quantize_mode
+        self.quantize_error = quantize_error
+        self.quantize_report = {}
+        self.stats = {}
+        self.bytes_saved = {}
+        self.index_primvars = index_primvars
+        self.primvar_savings = {}
+
+
     def validate_anim(self, stage: Usd.Stage) -> Usd.Stage:
         """
         Cleans up unneccessary animation attributes.
@@ -13,31 +83,33 @@ class Validator:
         Returns:
             Usd.Stage: Cleaned Stage.
         """
-        to_remove = []
-        for prim in stage.Traverse():
-            if prim.GetName() == "mtl" or prim.IsA("GeomSubset"):
-                to_remove.append(prim.GetPath())
-                continue
+        engine = rules.RuleEngine()
+        engine.remove_name("mtl")
+        engine.remove_type("GeomSubset")
+        engine.clear_metadata("kind")
+        engine.clear_metadata("apiSchemas")
+        engine.add_rule("remove_material_binding", remove_material_binding)
+        engine.attribute_policy("Mesh", lambda session, prim, attr: self.validate_attribute(stage, prim, attr, "Anim"))
 
-            if prim.HasAuthoredMetadata("kind"):
-                prim.ClearMetadata("kind")
+        stage = engine.run(stage)
+        self.stats = engine.stats
 
-            if prim.HasAuthoredMetadata("apiSchemas"):
-                prim.ClearMetadata("apiSchemas")
+        if self.bake_transforms:
+            stage = transforms.bake_transforms(stage)
 
-            if prim.HasAPI(UsdShade.MaterialBindingAPI):
-                binding_api = UsdShade.MaterialBindingAPI(prim)
-                binding_api.UnbindDirectBinding()
+        # Before held samples, so values that quantize the same are collapsed too.
+        if self.quantize_mode:
+            size = quantize.exported_size(stage)
+            attributes = quantize.quantize_points(stage, self.quantize_mode, self.quantize_error)
+            self.quantize_report = {"bytes": size, "quantized_bytes": quantize.exported_size(stage), "attributes": attributes}
 
-            if prim.GetRelationship('material:binding'):
-                prim.RemoveProperty('material:binding')
+        bounds.compute_extents(stage)
 
-            if prim.IsA("Mesh"):
-                for attr in prim.GetAuthoredAttributes():
-                    self.validate_attribute(stage, prim, attr, "Anim")
+        if self.index_primvars:
+            self.primvar_savings = primvars.index_primvars(stage)
 
-        for path in to_remove:
-            stage.RemovePrim(path)
+        if self.eliminate_held:
+            self.bytes_saved = samples.eliminate_held_samples(stage, self.sample_tolerance)
 
         return stage
 
@@ -52,21 +124,27 @@ class Validator:
         Returns:
             Usd.Stage: Cleaned Stage.
         """
-        to_remove = []
-        
-        for prim in stage.Traverse():
-            if prim.GetName() == "mtl" or prim.IsA("GeomSubset") or prim.IsA("Material"):
-                to_remove.append(prim.GetPath())
-                continue
+        engine = rules.RuleEngine()
+        engine.remove_name("mtl")
+        engine.remove_type("GeomSubset")
+        engine.remove_type("Material")
 
-            # for attr in prim.GetAuthoredAttributes():
-            #         self.validate_attribute(stage, prim, attr, "Geo")
-            
-            self.clear_pivots(prim)
-            core.set_prim_defaults(prim)
-        
-        for path in to_remove:
-            stage.RemovePrim(path)
+        # engine.attribute_policy("Mesh", lambda session, prim, attr: self.validate_attribute(stage, prim, attr, "Geo"))
+
+        if not self.bake_transforms:
+            engine.add_rule("clear_pivots", lambda prim, session: rules.EDITED if self.clear_pivots(prim) else rules.SKIPPED)
+        engine.add_rule("set_prim_defaults", set_prim_defaults)
+
+        stage = engine.run(stage)
+        self.stats = engine.stats
+
+        if self.bake_transforms:
+            stage = transforms.bake_transforms(stage)
+
+        bounds.compute_extents(stage)
+
+        if self.index_primvars:
+            self.primvar_savings = primvars.index_primvars(stage)
 
         return stage
     
@@ -81,13 +159,15 @@ class Validator:
         Returns:
             Usd.Stage: Cleaned Stage.
         """
-        for prim in stage.Traverse():
-            if prim.HasAuthoredMetadata("kind"):
-                prim.ClearMetadata("kind")
+        engine = rules.RuleEngine()
+        engine.clear_metadata("kind")
+        engine.attribute_policy("Camera", lambda session, prim, attr: self.validate_attribute(stage, prim, attr, "Cam"))
 
-            if prim.IsA("Camera"):
-                for attr in prim.GetAuthoredAttributes():
-                    self.validate_attribute(stage, prim, attr, "Cam")
+        stage = engine.run(stage)
+        self.stats = engine.stats
+
+        if self.bake_transforms:
+            stage = transforms.bake_transforms(stage, bake_static=False)
 
         return stage
         
@@ -96,6 +176,8 @@ class Validator:
         """
         Cleans up unneccessary attribute.
 
+        Edits join the stage's current edit session, or are applied when this returns.
+
         Args:
             stage (Usd.Stage): Stage to clean.
             prim (Usd.Prim): Prim to clean.
@@ -105,79 +187,82 @@ class Validator:
         name = attr.GetName()
         first_frame = stage.GetStartTimeCode()
 
-        match type:
-            case "Anim":
-                static = ["faceVertexCounts", "faceVertexIndices"]
-                animated = ["points", "extent"]
+        with edit_session(stage) as session:
+            match type:
+                case "Anim":
+                    static = ["faceVertexCounts", "faceVertexIndices"]
+                    animated = ["points", "extent"]
                         
-                if name in static:
-                    value = attr.Get(first_frame)
-                    attr.Clear()
-                    attr.Set(value)
+                    if name in static:
+                        session.set_default(attr, attr.Get(first_frame), clear_samples=True)
                 
-                elif name in animated or name.startswith("xFormOp"):
-                    timesamples = attr.GetTimeSamples()
-                    if len(timesamples) > 1:
-                        for sample in timesamples:
-                            if not float(sample).is_integer():
-                                attr.ClearAtTime(sample)
-
-                else:
-                    prim.RemoveProperty(name)
+                    elif name in animated or name.startswith("xFormOp"):
+                        timesamples = attr.GetTimeSamples()
+                        if len(timesamples) > 1:
+                            for sample in timesamples:
+                                if not float(sample).is_integer():
+                                    session.clear_at_time(attr, sample)
+
+                    else:
+                        session.remove_property(prim, name)
             
-            case "Geo":
-                valid = ["points", "extent", "primvars:st", "primvars:st:indices",
-                          "doubleSided", "faceVertexCounts", "faceVertexIndices",
-                          "normals"]
+                case "Geo":
+                    valid = ["points", "extent", "primvars:st", "primvars:st:indices",
+                              "doubleSided", "faceVertexCounts", "faceVertexIndices",
+                              "normals"]
                 
-                if name in valid:
-                    if attr.ValueMightBeTimeVarying():
-                        value = attr.Get(time=first_frame)
-                        attr.Clear()
-                        attr.Set(value)
-
-                elif name == "primvars:mat":
-                    if attr.Get(first_frame) == "initialShadingGroup":
-                        prim.RemoveProperty(name)
-                else:
-                    prim.RemoveProperty(name)
-
-            case "Cam":
-                static = ["clippingRange", "focalLength", "focusDistance",
-                         "horizontalAperture", "verticalAperture"]
+                    if name in valid:
+                        if attr.ValueMightBeTimeVarying():
+                            session.set_default(attr, attr.Get(time=first_frame), clear_samples=True)
+
+                    elif name == "primvars:mat":
+                        if attr.Get(first_frame) == "initialShadingGroup":
+                            session.remove_property(prim, name)
+                    else:
+                        session.remove_property(prim, name)
+
+                case "Cam":
+                    static = ["clippingRange", "focalLength", "focusDistance",
+                             "horizontalAperture", "verticalAperture"]
                 
-                if name in static:
-                    value = attr.Get(first_frame)
-                    attr.Clear()
-                    attr.Set(value)
-
-                elif name.startswith("xFormOp"):
-                    timesamples = attr.GetTimeSamples()
-                    if len(timesamples) > 1:
-                        for sample in timesamples:
-                            if not float(sample).is_integer():
-                                attr.ClearAtTime(sample)
+                    if name in static:
+                        session.set_default(attr, attr.Get(first_frame), clear_samples=True)
+
+                    elif name.startswith("xFormOp"):
+                        timesamples = attr.GetTimeSamples()
+                        if len(timesamples) > 1:
+                            for sample in timesamples:
+                                if not float(sample).is_integer():
+                                    session.clear_at_time(attr, sample)
             
 
-    def clear_pivots(self, prim: Usd.Prim):
+    def clear_pivots(self, prim: Usd.Prim) -> bool:
         """
         Clears xFormOp pivots from Mesh.
 
         Args:
             prim (Usd.Prim): Prim to clear pivots from.
+
+        Returns:
+            bool: Returns true if the prim had xform ops to clear.
         """
         xf = UsdGeom.Xformable(prim)
         if not xf:
-            pass
+            return False
 
         ops = xf.GetOrderedXformOps()
+        if not ops:
+            return False
+
         pivot_ops = [op for op in ops if "pivot" in op.GetOpName()]
         if not pivot_ops:
             pass
 
         # Gather time samples
-        for op in ops:
-            attr = op.GetAttr()
-            attr.Clear()
+        with edit_session(prim.GetStage()) as session:
+            for op in ops:
+                session.clear_values(op.GetAttr())
+
+        return True
         
 
@@ -0,0 +1,33 @@
+import pytest
+from usd_tools.io import batch
+
+
+def test_malformed_job_is_reported_not_raised():
+    result = batch.run_job({"asset_name": "Birdfeeder"})
+    assert result["input"] is None
+    assert "KeyError" in result["error"]
+
+
+def test_broken_pool_jobs_rerun_skipping_unchanged(monkeypatch):
+    calls = []
+    def run_pool(jobs, workers, tasks_per_child, skip_unchanged, results, total):
+        calls.append((len(jobs), skip_unchanged))
+        return list(jobs) if len(calls) == 1 else []
+    monkeypatch.setattr(batch, "_run_pool", run_pool)
+
+    batch.run_batch([{"input": "a.usd"}, {"input": "b.usd"}], skip_unchanged=False)
+    assert calls == [(2, False), (1, True), (1, True)]
+
+
+def test_crashing_job_is_reported(monkeypatch):
+    monkeypatch.setattr(batch, "_run_pool", lambda jobs, *args: list(jobs))
+    results = batch.run_batch([{"input": "a.usd"}])
+    assert results[0]["input"] == "a.usd"
+    assert results[0]["error"] == "Worker process crashed."
+
+
+def test_warns_without_worker_replacement(monkeypatch):
+    monkeypatch.setattr(batch, "_run_pool", lambda *args: [])
+    monkeypatch.setattr(batch.sys, "version_info", (3, 10, 0))
+    with pytest.warns(UserWarning):
+        batch.run_batch([])
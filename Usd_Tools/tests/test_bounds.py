@@ -0,0 +1,28 @@
+from pxr import Usd, UsdGeom
+from usd_tools import bounds
+
+
+def test_static_points_clear_old_extent_samples():
+    stage = Usd.Stage.CreateInMemory()
+    mesh = UsdGeom.Mesh.Define(stage, "/Root/Geo")
+    mesh.CreatePointsAttr([(0, 0, 0), (2, 2, 2)])
+    extent = mesh.CreateExtentAttr()
+    extent.Set([(0, 0, 0), (1, 1, 1)], 1)
+    extent.Set([(0, 0, 0), (5, 5, 5)], 2)
+
+    assert bounds.compute_extents(stage) == 1
+    assert not extent.GetTimeSamples()
+    assert extent.Get(2) == [(0, 0, 0), (2, 2, 2)]
+
+
+def test_animated_points_replace_old_extent_samples():
+    stage = Usd.Stage.CreateInMemory()
+    mesh = UsdGeom.Mesh.Define(stage, "/Root/Geo")
+    points = mesh.CreatePointsAttr()
+    points.Set([(0, 0, 0), (1, 1, 1)], 1)
+    points.Set([(0, 0, 0), (3, 3, 3)], 2)
+    mesh.CreateExtentAttr().Set([(0, 0, 0), (9, 9, 9)], 5)
+
+    bounds.compute_extents(stage)
+    assert mesh.GetExtentAttr().GetTimeSamples() == [1, 2]
+    assert mesh.GetExtentAttr().Get(2) == [(0, 0, 0), (3, 3, 3)]
@@ -0,0 +1,65 @@
+import os
+from pxr import Usd, UsdGeom, Sdf, Gf
+from usd_tools.io import clips
+
+
+def make_anim(start, end):
+    stage = Usd.Stage.CreateInMemory()
+    stage.SetStartTimeCode(start)
+    stage.SetEndTimeCode(end)
+    mesh = UsdGeom.Mesh.Define(stage, "/Root/Geo")
+    mesh.CreateFaceVertexCountsAttr([3])
+    mesh.CreateFaceVertexIndicesAttr([0, 1, 2])
+
+    # Held samples already removed, nothing changes between frames 40 and 60.
+    points = mesh.CreatePointsAttr()
+    for t, x in ((1, 0.0), (10, 1.0), (40, 5.0)):
+        points.Set([(x, 0, 0), (x + 1, 0, 0), (x, 1, 0)], t)
+    return stage
+
+
+def export(stage, tmp_path, monkeypatch):
+    monkeypatch.setenv("PROJ", str(tmp_path))
+    result_path = str(tmp_path / "anim" / "Root_010_v001.usda")
+    os.makedirs(os.path.dirname(result_path))
+    stats = clips.export_clips(stage, "/Root", result_path, str(tmp_path / "anim" / "clips"), "Root_010",
+                               chunk_size=25, extension="usda", layer_data={"key": "value"})
+    return result_path, stats
+
+
+def test_every_frame_resolves_through_clips(tmp_path, monkeypatch):
+    stage = make_anim(1, 60)
+    result_path, stats = export(stage, tmp_path, monkeypatch)
+    assert stats == {"chunks": 3, "written": 3, "reused": 0}
+
+    clipped = Usd.Stage.Open(result_path)
+    source = stage.GetAttributeAtPath("/Root/Geo.points")
+    target = clipped.GetAttributeAtPath("/Root/Geo.points")
+    for t in range(1, 61):
+        assert target.Get(t) is not None, t
+        assert all(Gf.IsClose(a, b, 1e-5) for a, b in zip(target.Get(t), source.Get(t))), t
+    assert clipped.GetPrimAtPath("/Root/Geo").GetAttribute("faceVertexCounts").Get() == [3]
+    assert clipped.GetRootLayer().customLayerData == {"key": "value"}
+
+
+def test_chunks_have_their_own_time_range(tmp_path, monkeypatch):
+    result_path, _ = export(make_anim(1, 60), tmp_path, monkeypatch)
+    ranges = []
+    for name in sorted(os.listdir(tmp_path / "anim" / "clips")):
+        if name.count(".") == 3 and "-" in name:
+            layer = Sdf.Layer.FindOrOpen(str(tmp_path / "anim" / "clips" / name))
+            ranges.append((layer.startTimeCode, layer.endTimeCode))
+    assert ranges == [(1, 25), (25, 50), (50, 60)]
+
+
+def test_unchanged_chunks_are_reused(tmp_path, monkeypatch):
+    # Held, so a change after frame 50 doesn't reach the previous chunk's last frame.
+    stage = make_anim(1, 60)
+    stage.SetInterpolationType(Usd.InterpolationTypeHeld)
+    export(stage, tmp_path, monkeypatch)
+    stage.GetAttributeAtPath("/Root/Geo.points").Set([(9, 0, 0), (10, 0, 0), (9, 1, 0)], 55)
+
+    monkeypatch.setenv("PROJ", str(tmp_path))
+    stats = clips.export_clips(stage, "/Root", str(tmp_path / "anim" / "Root_010_v002.usda"),
+                               str(tmp_path / "anim" / "clips"), "Root_010", chunk_size=25, extension="usda")
+    assert stats == {"chunks": 3, "written": 1, "reused": 2}
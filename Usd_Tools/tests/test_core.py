@@ -0,0 +1,125 @@
+import pytest
+from pxr import Usd, UsdGeom, UsdShade, Sdf
+from usd_tools import core
+
+
+def test_find_prim_specs_across_layer_stack(tmp_path):
+    weak = Sdf.Layer.CreateNew(str(tmp_path / "weak.usda"))
+    for path in ("/Root/Geo", "/Root/mtl", "/Root/Geo/mtl"):
+        Sdf.CreatePrimInLayer(weak, path)
+    weak.Save()
+
+    strong = Sdf.Layer.CreateAnonymous(".usda")
+    strong.subLayerPaths.append(weak.identifier)
+    Sdf.CreatePrimInLayer(strong, "/Root/mtl")
+
+    paths = core.find_prim_specs(strong, lambda spec: spec.name == "mtl")
+    assert paths == [Sdf.Path("/Root/mtl"), Sdf.Path("/Root/Geo/mtl")]
+
+
+def make_export():
+    stage = Usd.Stage.CreateInMemory()
+    UsdGeom.Xform.Define(stage, "/Export")
+    material = UsdShade.Material.Define(stage, "/Looks/wood")
+    mesh = UsdGeom.Mesh.Define(stage, "/Export/Body")
+    mesh.CreateFaceVertexCountsAttr([3])
+    points = mesh.CreatePointsAttr()
+    for t in (1, 1.5, 2):
+        points.Set([(t, 0, 0), (1, 0, 0), (0, 1, 0)], t)
+    UsdShade.MaterialBindingAPI.Apply(mesh.GetPrim()).Bind(material)
+    UsdGeom.Xform.Define(stage, "/Export/Body/Bolt")
+    return stage
+
+
+@pytest.mark.parametrize("mode", ["layer", "prim"])
+def test_move_prims(mode):
+    stage = make_export()
+    core.move_prims(stage, stage.GetPrimAtPath("/Export"), "/Asset/Geo", mode)
+
+    assert not stage.GetPrimAtPath("/Export")
+    assert stage.GetPrimAtPath("/Asset/Geo/Body/Bolt")
+    body = stage.GetPrimAtPath("/Asset/Geo/Body")
+    assert body.GetTypeName() == "Mesh"
+    assert UsdGeom.PrimvarsAPI(body).GetPrimvar("mat").Get() == "wood"
+    assert not body.GetRelationship("material:binding")
+    assert body.GetAttribute("points").GetTimeSamples() == [1, 2]
+    assert body.GetAttribute("faceVertexCounts").Get() == [3]
+    assert not stage.GetRootLayer().GetPrimAtPath("/Asset/Geo/Body").HasInfo("apiSchemas")
+
+
+@pytest.mark.parametrize("bulk", [True, False])
+def test_transfer_time_samples(bulk):
+    stage = Usd.Stage.CreateInMemory()
+    src = stage.DefinePrim("/src").CreateAttribute("width", Sdf.ValueTypeNames.FloatArray)
+    for t in (1, 1.25, 2, 3):
+        src.Set([t, t * 2], t)
+    dst = stage.DefinePrim("/dst").CreateAttribute("width", Sdf.ValueTypeNames.FloatArray)
+    dst.Set([0.0])
+
+    core.reset_transfer_stats()
+    assert core.transfer_time_samples(dst, src, bulk=bulk) == 3
+    assert dst.GetTimeSamples() == [1, 2, 3]
+    assert list(dst.Get(3)) == [3, 6]
+    assert core.get_transfer_stats()["bulk" if bulk else "per_sample"]["samples"] == 3
+
+
+def test_transfer_keeps_attribute_type_for_scalars():
+    stage = Usd.Stage.CreateInMemory()
+    src = stage.DefinePrim("/src").CreateAttribute("radius", Sdf.ValueTypeNames.Float)
+    src.Set(1.5, 1)
+    src.Set(2.5, 2)
+    dst = stage.DefinePrim("/dst").CreateAttribute("radius", Sdf.ValueTypeNames.Float)
+    dst.Set(0.0)
+
+    core.handle_attribute_transfer(dst, src)
+    assert dst.GetTimeSamples() == [1, 2]
+    assert stage.GetRootLayer().QueryTimeSample(dst.GetPath(), 2) == 2.5
+    assert dst.Get(Usd.TimeCode.Default()) is None
+
+
+def make_layered_stage(tmp_path):
+    base = Usd.Stage.CreateNew(str(tmp_path / "base.usda"))
+    UsdGeom.Mesh.Define(base, "/Scene/Assets/Body").CreateFaceVertexCountsAttr([3])
+    UsdGeom.Mesh.Define(base, "/Scene/Assets/Wheel")
+    base.GetRootLayer().Save()
+
+    stage = Usd.Stage.CreateNew(str(tmp_path / "shot.usda"))
+    stage.GetRootLayer().subLayerPaths.append("./base.usda")
+    UsdGeom.Mesh(stage.GetPrimAtPath("/Scene/Assets/Body")).CreateFaceVertexCountsAttr([4])
+    return stage
+
+
+def test_flatten_subtree(tmp_path):
+    layer = core.flatten_layer(make_layered_stage(tmp_path), "/Scene/Assets/Body")
+    assert layer.GetPrimAtPath("/Scene/Assets/Body")
+    assert not layer.GetPrimAtPath("/Scene/Assets/Wheel")
+    assert layer.GetAttributeAtPath("/Scene/Assets/Body.faceVertexCounts").default == [4]
+    assert not layer.subLayerPaths
+
+
+def test_flatten_is_the_same_for_any_source_path(tmp_path):
+    (tmp_path / "a").mkdir()
+    (tmp_path / "b").mkdir()
+    first = core.flatten_layer(make_layered_stage(tmp_path / "a")).ExportToString()
+    second = core.flatten_layer(make_layered_stage(tmp_path / "b")).ExportToString()
+    assert first == second
+    assert str(tmp_path) not in first
+
+
+def test_flatten_to_file(tmp_path):
+    path = core.flatten_to_file(make_layered_stage(tmp_path), str(tmp_path / "flat.usda"))
+    stage = Usd.Stage.Open(path)
+    assert stage.GetPrimAtPath("/Scene/Assets/Wheel")
+    assert not stage.GetRootLayer().subLayerPaths
+
+
+def test_removing_last_api_schema_clears_list_op():
+    layer = Sdf.Layer.CreateAnonymous(".usda")
+    spec = Sdf.CreatePrimInLayer(layer, "/Body")
+    spec.SetInfo("apiSchemas", Sdf.TokenListOp.CreateExplicit(["MaterialBindingAPI"]))
+    core._remove_api_schema(spec, "MaterialBindingAPI")
+    assert not spec.HasInfo("apiSchemas")
+
+    spec.SetInfo("apiSchemas", Sdf.TokenListOp.Create(prependedItems=["MaterialBindingAPI", "GeomModelAPI"]))
+    core._remove_api_schema(spec, "MaterialBindingAPI")
+    assert spec.GetInfo("apiSchemas").prependedItems == ["GeomModelAPI"]
@@ -0,0 +1,64 @@
+import numpy as np
+from pxr import Usd, UsdGeom, Sdf
+from usd_tools import decimate
+
+
+def make_grid(stage, path, size=30):
+    xs, ys = np.meshgrid(np.arange(size, dtype=np.float32), np.arange(size, dtype=np.float32))
+    points = np.stack([xs.ravel(), ys.ravel(), np.zeros(size * size, dtype=np.float32)], axis=1)
+    quads = [(y * size + x, y * size + x + 1, (y + 1) * size + x + 1, (y + 1) * size + x)
+             for y in range(size - 1) for x in range(size - 1)]
+
+    mesh = UsdGeom.Mesh.Define(stage, path)
+    mesh.CreatePointsAttr(points.tolist())
+    mesh.CreateFaceVertexCountsAttr([4] * len(quads))
+    mesh.CreateFaceVertexIndicesAttr([i for quad in quads for i in quad])
+    return mesh
+
+
+def test_cell_size_of_coincident_points():
+    points = np.zeros((10, 3))
+    cell_size = decimate.find_cell_size(points, 1)
+    assert cell_size > 0.0
+    clusters, clustered = decimate.cluster_points(points, cell_size)
+    assert len(clustered) == 1
+
+
+def test_cell_size_with_zero_target():
+    points = np.random.default_rng(0).random((100, 3))
+    assert np.isfinite(decimate.find_cell_size(points, 0))
+
+
+def test_proxy_keeps_constant_primvars():
+    stage = Usd.Stage.CreateInMemory()
+    mesh = make_grid(stage, "/Geo/grid")
+    # mat has no authored interpolation, so it is constant.
+    mesh.GetPrim().CreateAttribute("primvars:mat", Sdf.ValueTypeNames.String).Set("wood")
+    primvars = UsdGeom.PrimvarsAPI(mesh)
+    primvars.CreatePrimvar("displayColor", Sdf.ValueTypeNames.Color3fArray, UsdGeom.Tokens.constant).Set([(1, 0, 0)])
+    primvars.CreatePrimvar("st", Sdf.ValueTypeNames.TexCoord2fArray, UsdGeom.Tokens.vertex).Set([(0, 0)] * 900)
+
+    proxy = decimate.author_proxy(mesh.GetPrim(), 0.1)
+    proxy_primvars = UsdGeom.PrimvarsAPI(proxy)
+    assert proxy_primvars.GetPrimvar("mat").Get() == "wood"
+    assert proxy_primvars.GetPrimvar("displayColor").Get()
+    assert not proxy_primvars.HasPrimvar("st")
+    assert len(UsdGeom.Mesh(proxy).GetPointsAttr().Get()) < 900
+
+
+def test_proxy_reads_composed_interpolation():
+    stage = Usd.Stage.CreateInMemory()
+    weak = Sdf.Layer.CreateAnonymous(".usda")
+    stage.GetRootLayer().subLayerPaths.append(weak.identifier)
+
+    stage.SetEditTarget(weak)
+    mesh = make_grid(stage, "/Geo/grid")
+    UsdGeom.PrimvarsAPI(mesh).CreatePrimvar("st", Sdf.ValueTypeNames.TexCoord2fArray, UsdGeom.Tokens.vertex)
+    stage.SetEditTarget(stage.GetRootLayer())
+    mesh.GetPrim().GetAttribute("primvars:st").Set([(0, 0)] * 900)
+    mesh.GetPointsAttr().Set(mesh.GetPointsAttr().Get())
+    mesh.GetFaceVertexCountsAttr().Set(mesh.GetFaceVertexCountsAttr().Get())
+    mesh.GetFaceVertexIndicesAttr().Set(mesh.GetFaceVertexIndicesAttr().Get())
+
+    proxy = decimate.author_proxy(mesh.GetPrim(), 0.1)
+    assert not UsdGeom.PrimvarsAPI(proxy).HasPrimvar("st")
@@ -0,0 +1,75 @@
+import pytest
+from pxr import Usd, Sdf, Tf
+from usd_tools.edit_session import edit_session
+
+
+def make_stage():
+    stage = Usd.Stage.CreateInMemory()
+    prim = stage.DefinePrim("/Root/Geo", "Mesh")
+    prim.CreateAttribute("width", Sdf.ValueTypeNames.Float).Set(1.0)
+    prim.CreateAttribute("height", Sdf.ValueTypeNames.Float).Set(2.0)
+    prim.SetMetadata("kind", "component")
+    stage.DefinePrim("/Root/Other")
+    return stage
+
+
+def test_edits_apply_on_exit_with_one_notice():
+    stage = make_stage()
+    prim = stage.GetPrimAtPath("/Root/Geo")
+    notices = []
+    listener = Tf.Notice.Register(Usd.Notice.ObjectsChanged, lambda notice, sender: notices.append(notice), stage)
+
+    with edit_session(stage, enabled=True) as session:
+        session.remove_property(prim, "width")
+        session.set_default(prim.GetAttribute("height"), 3.0)
+        session.set_time_sample(prim.GetAttribute("height"), 1, 4.0)
+        session.clear_metadata(prim, "kind")
+        session.remove_prim("/Root/Other")
+        assert prim.GetAttribute("width")
+
+    listener.Revoke()
+    assert not prim.GetAttribute("width")
+    assert prim.GetAttribute("height").Get() == 3.0
+    assert prim.GetAttribute("height").Get(1) == 4.0
+    assert not prim.HasAuthoredMetadata("kind")
+    assert not stage.GetPrimAtPath("/Root/Other")
+    assert len(notices) <= 2
+
+
+def test_edits_are_dropped_if_block_raises():
+    stage = make_stage()
+    prim = stage.GetPrimAtPath("/Root/Geo")
+    with pytest.raises(RuntimeError):
+        with edit_session(stage, enabled=True) as session:
+            session.remove_prim(prim.GetPath())
+            raise RuntimeError
+    assert stage.GetPrimAtPath("/Root/Geo")
+
+
+def test_nested_sessions_join_the_outermost():
+    stage = make_stage()
+    prim = stage.GetPrimAtPath("/Root/Geo")
+    with edit_session(stage, enabled=True) as outer:
+        with edit_session(stage) as inner:
+            assert inner is outer
+            inner.remove_property(prim, "width")
+        assert prim.GetAttribute("width")
+    assert not prim.GetAttribute("width")
+
+
+def test_disabled_session_applies_immediately():
+    stage = make_stage()
+    prim = stage.GetPrimAtPath("/Root/Geo")
+    with edit_session(stage, enabled=False) as session:
+        session.remove_property(prim, "width")
+        assert not prim.GetAttribute("width")
+
+
+def test_edits_without_a_spec_fall_back_to_usd():
+    stage = make_stage()
+    stage.SetEditTarget(stage.GetSessionLayer())
+    prim = stage.GetPrimAtPath("/Root/Geo")
+    with edit_session(stage, enabled=True) as session:
+        session.set_default(prim.GetAttribute("height"), 5.0)
+    assert prim.GetAttribute("height").Get() == 5.0
+    assert stage.GetRootLayer().GetAttributeAtPath("/Root/Geo.height").default == 2.0
@@ -0,0 +1,46 @@
+import hashlib
+import os
+import subprocess
+import sys
+import pytest
+from pxr import Usd, Sdf
+from usd_tools import fingerprint
+
+
+DATA = os.path.join(os.path.dirname(__file__), "data", "fingerprint.usda")
+
+SCRIPT = """
+import sys
+from pxr import Usd
+from usd_tools import fingerprint
+print(fingerprint.stage_fingerprint(Usd.Stage.Open(sys.argv[1], Usd.Stage.LoadNone)))
+"""
+
+
+def run_fingerprint():
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+    output = subprocess.run([sys.executable, "-c", SCRIPT, DATA], env=env, capture_output=True, text=True, check=True)
+    return output.stdout.strip()
+
+
+def test_fingerprint_is_the_same_in_separate_processes():
+    first = run_fingerprint()
+    assert first == run_fingerprint()
+    assert first == fingerprint.stage_fingerprint(Usd.Stage.Open(DATA, Usd.Stage.LoadNone))
+
+
+def test_list_ops_hash_by_items():
+    def digest(list_op):
+        d = hashlib.blake2b()
+        fingerprint.hash_value(d, list_op)
+        return d.hexdigest()
+
+    prepended = Sdf.TokenListOp.Create(prependedItems=["GeomModelAPI"])
+    assert digest(prepended) == digest(Sdf.TokenListOp.Create(prependedItems=["GeomModelAPI"]))
+    assert digest(prepended) != digest(Sdf.TokenListOp.Create(appendedItems=["GeomModelAPI"]))
+    assert digest(prepended) != digest(Sdf.TokenListOp.CreateExplicit(["GeomModelAPI"]))
+
+
+def test_unknown_types_raise():
+    with pytest.raises(TypeError):
+        fingerprint.hash_value(hashlib.blake2b(), object())
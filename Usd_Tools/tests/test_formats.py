@@ -0,0 +1,40 @@
+import pytest
+from pxr import Usd, UsdGeom
+from usd_tools.io import formats
+
+
+@pytest.fixture
+def structure(monkeypatch):
+    def set_formats(export_formats):
+        monkeypatch.setattr(formats.os.path, "exists", lambda path: True)
+        monkeypatch.setattr(formats.io, "read_json_cached", lambda path: {"export_formats": export_formats})
+    return set_formats
+
+
+def test_defaults_without_structure(tmp_path):
+    assert formats.get_export_format("geo", str(tmp_path / "missing")) == "usdc"
+    assert formats.get_export_format("cam", str(tmp_path / "missing")) == "usda"
+
+
+def test_structure_overrides_default(structure):
+    structure({"geo": "usda"})
+    assert formats.get_export_format("geo", "database") == "usda"
+    assert formats.get_export_format("anim", "database") == "usdc"
+
+
+def test_unknown_format_raises(structure):
+    structure({"geo": "abc"})
+    with pytest.raises(ValueError):
+        formats.get_export_format("geo", "database")
+
+
+def test_benchmark_reports_each_format():
+    stage = Usd.Stage.CreateInMemory()
+    UsdGeom.Mesh.Define(stage, "/Geo").CreatePointsAttr([(0, 0, 0), (1, 0, 0), (0, 1, 0)])
+
+    results = formats.benchmark_formats(stage, repeats=1)
+    assert set(results) == {"usda", "usdc"}
+    for result in results.values():
+        assert result["bytes"] > 0
+        assert result["write_seconds"] >= 0.0
+        assert result["load_seconds"] >= 0.0
@@ -0,0 +1,79 @@
+from pxr import Usd, UsdGeom, Sdf, Gf
+from usd_tools import instancing
+
+
+def make_mesh(stage, path, x=0.0, uvs=((0, 0), (1, 0), (0, 1)), material=None):
+    mesh = UsdGeom.Mesh.Define(stage, path)
+    mesh.CreatePointsAttr([(0, 0, 0), (1, 0, 0), (0, 1, 0)])
+    mesh.CreateFaceVertexCountsAttr([3])
+    mesh.CreateFaceVertexIndicesAttr([0, 1, 2])
+    mesh.AddTranslateOp().Set(Gf.Vec3d(x, 0, 0))
+    primvars = UsdGeom.PrimvarsAPI(mesh)
+    primvars.CreatePrimvar("st", Sdf.ValueTypeNames.TexCoord2fArray, UsdGeom.Tokens.vertex).Set(uvs)
+    if material:
+        primvars.CreatePrimvar("mat", Sdf.ValueTypeNames.String).Set(material)
+    return mesh
+
+
+def test_meshes_with_different_uvs_are_not_grouped():
+    stage = Usd.Stage.CreateInMemory()
+    make_mesh(stage, "/Geo/a")
+    make_mesh(stage, "/Geo/b", uvs=((0, 0), (0.5, 0), (0, 0.5)))
+    assert instancing.find_duplicates(stage, "/Geo") == []
+
+
+def test_primvar_interpolation_is_fingerprinted():
+    stage = Usd.Stage.CreateInMemory()
+    make_mesh(stage, "/Geo/a")
+    b = make_mesh(stage, "/Geo/b")
+    UsdGeom.PrimvarsAPI(b).GetPrimvar("st").SetInterpolation(UsdGeom.Tokens.faceVarying)
+    assert instancing.find_duplicates(stage, "/Geo") == []
+
+
+def test_instances_keep_uvs():
+    stage = Usd.Stage.CreateInMemory()
+    uvs = ((0, 0), (0.5, 0), (0, 0.5))
+    make_mesh(stage, "/Geo/a", 0, uvs)
+    make_mesh(stage, "/Geo/b", 5, uvs)
+
+    stats = instancing.instance_duplicates(stage, "/Geo")
+    assert stats["instances"] == 2
+    mesh = stage.GetPrimAtPath("/Geo/b/mesh")
+    assert mesh.IsInstanceProxy()
+    assert UsdGeom.PrimvarsAPI(mesh).GetPrimvar("st").Get() == [Gf.Vec2f(uv) for uv in uvs]
+
+
+def test_point_instancer_keeps_materials():
+    stage = Usd.Stage.CreateInMemory()
+    make_mesh(stage, "/Geo/a", 0, material="wood")
+    make_mesh(stage, "/Geo/b", 5, material="metal")
+    make_mesh(stage, "/Geo/c", 10, material="wood")
+
+    instancing.instance_duplicates(stage, "/Geo", mode=instancing.POINT_INSTANCER)
+    instancer = UsdGeom.PointInstancer(stage.GetPrimAtPath("/Geo/instancer_0"))
+    prototypes = instancer.GetPrototypesRel().GetTargets()
+    indices = list(instancer.GetProtoIndicesAttr().Get())
+    assert len(prototypes) == 2 and indices == [0, 1, 0]
+
+    materials = []
+    for target in prototypes:
+        mesh = stage.GetPrimAtPath(target.AppendChild("mesh"))
+        assert mesh.IsA(UsdGeom.Mesh)
+        materials.append(UsdGeom.PrimvarsAPI(mesh).GetPrimvar("mat").Get())
+    assert materials == ["wood", "metal"]
+
+
+def test_rotated_copies_need_rotated_normals():
+    stage = Usd.Stage.CreateInMemory()
+    a = make_mesh(stage, "/Geo/a")
+    b = make_mesh(stage, "/Geo/b")
+    c = make_mesh(stage, "/Geo/c")
+    a.CreateNormalsAttr([(0, 0, 1)] * 3)
+    # b is a rotated 90 degrees about x, c has the same points but unrotated normals.
+    b.CreatePointsAttr([(0, 0, 0), (1, 0, 0), (0, 0, 1)])
+    b.CreateNormalsAttr([(0, -1, 0)] * 3)
+    c.CreatePointsAttr([(0, 0, 0), (1, 0, 0), (0, 0, 1)])
+    c.CreateNormalsAttr([(0, 0, 1)] * 3)
+
+    groups = instancing.find_duplicates(stage, "/Geo", transform_invariant=True)
+    assert [[str(prim.GetPath()) for prim, _ in group] for group in groups] == [["/Geo/a", "/Geo/b"]]
@@ -0,0 +1,40 @@
+import numpy as np
+from pxr import Usd, UsdGeom, Sdf, Vt
+from usd_tools import primvars
+
+
+def test_index_values_keeps_first_use_order():
+    values = np.array([[1, 1], [0, 0], [1, 1], [2, 2]], dtype=np.float32)
+    unique, indices = primvars.index_values(values)
+    assert unique.tolist() == [[1, 1], [0, 0], [2, 2]]
+    assert indices.tolist() == [0, 1, 0, 2]
+
+
+def test_index_values_keeps_negative_zero():
+    values = np.array([0.0, -0.0, 0.0], dtype=np.float32)
+    unique, indices = primvars.index_values(values)
+    assert len(unique) == 2
+    assert np.signbit(unique[indices]).tolist() == [False, True, False]
+
+
+def test_repeated_primvar_is_indexed():
+    stage = Usd.Stage.CreateInMemory()
+    prim = UsdGeom.Mesh.Define(stage, "/Geo").GetPrim()
+    primvar = UsdGeom.PrimvarsAPI(prim).CreatePrimvar("st", Sdf.ValueTypeNames.TexCoord2fArray, UsdGeom.Tokens.faceVarying)
+    values = Vt.Vec2fArray([(0, 0), (1, 0), (1, 1), (0, 1)] * 50)
+    primvar.Set(values)
+
+    report = primvars.index_primvars(stage)
+    assert report == {"/Geo": 200 * 8 - 4 * 8 - 200 * primvars.INDEX_BYTES}
+    assert primvar.IsIndexed()
+    assert primvar.ComputeFlattened() == values
+
+
+def test_unique_primvar_is_left_flat():
+    stage = Usd.Stage.CreateInMemory()
+    prim = UsdGeom.Mesh.Define(stage, "/Geo").GetPrim()
+    primvar = UsdGeom.PrimvarsAPI(prim).CreatePrimvar("st", Sdf.ValueTypeNames.TexCoord2fArray, UsdGeom.Tokens.vertex)
+    primvar.Set(Vt.Vec2fArray([(i, i) for i in range(10)]))
+
+    assert primvars.index_primvars(stage) == {}
+    assert not primvar.IsIndexed()
@@ -0,0 +1,92 @@
+import numpy as np
+import pytest
+from pxr import Usd, UsdGeom, Sdf, Vt
+from usd_tools import quantize, validator
+
+
+def make_cache(normals_primvar=False):
+    rng = np.random.default_rng(0)
+    points = rng.uniform(0, 1, (1000, 3)).astype(np.float32)
+    normals = rng.normal(size=(1000, 3)).astype(np.float32)
+    normals /= np.linalg.norm(normals, axis=1)[:, None]
+
+    stage = Usd.Stage.CreateInMemory()
+    mesh = UsdGeom.Mesh.Define(stage, "/Geo")
+    if normals_primvar:
+        normals_attr = UsdGeom.PrimvarsAPI(mesh).CreatePrimvar("normals", Sdf.ValueTypeNames.Normal3fArray,
+                                                                UsdGeom.Tokens.faceVarying).GetAttr()
+    else:
+        normals_attr = mesh.CreateNormalsAttr()
+        mesh.SetNormalsInterpolation(UsdGeom.Tokens.vertex)
+    for t in (1, 2):
+        mesh.CreatePointsAttr().Set(Vt.Vec3fArray.FromNumpy(points * t), t)
+        normals_attr.Set(Vt.Vec3fArray.FromNumpy(normals), t)
+    return stage, points, normals
+
+
+def test_round_stays_within_bound():
+    array = np.random.default_rng(0).uniform(-10, 10, (100, 3)).astype(np.float32)
+    result = quantize.quantize_array(array, quantize.ROUND, 1e-3)
+    assert result.dtype == np.float32
+    assert np.abs(result - array).max() <= 1e-3
+
+
+def test_unknown_mode_raises():
+    with pytest.raises(ValueError):
+        quantize.quantize_array(np.zeros(3, dtype=np.float32), "abc", 1e-3)
+
+
+def test_points_are_quantized_within_bound():
+    stage, points, _ = make_cache()
+    report = quantize.quantize_points(stage, mode=quantize.ROUND, error_bound=1e-3)
+    result = report["/Geo.points"]
+    assert result["max_deviation"] <= result["bound"]
+
+    attr = stage.GetAttributeAtPath("/Geo.points")
+    assert attr.GetTypeName() == Sdf.ValueTypeNames.Point3fArray
+    assert np.abs(np.asarray(attr.Get(2)) - points * 2).max() <= result["bound"]
+
+
+def test_attribute_left_unchanged_if_bound_is_exceeded():
+    stage = Usd.Stage.CreateInMemory()
+    attr = UsdGeom.Mesh.Define(stage, "/Geo").CreatePointsAttr([(0.1, 0.2, 0.3)])
+
+    assert quantize.quantize_attribute(attr, quantize.HALF, 1e-9) is None
+    assert np.asarray(attr.Get()).tobytes() == np.array([(0.1, 0.2, 0.3)], dtype=np.float32).tobytes()
+
+
+@pytest.mark.parametrize("normals_primvar", [False, True])
+def test_half_normals_become_half_primvar(normals_primvar):
+    stage, _, normals = make_cache(normals_primvar)
+    interpolation = UsdGeom.Tokens.faceVarying if normals_primvar else UsdGeom.Tokens.vertex
+
+    report = quantize.quantize_points(stage, mode=quantize.HALF, error_bound=1e-3)
+    assert report["/Geo.primvars:normals"]["max_deviation"] <= 1e-3
+
+    prim = stage.GetPrimAtPath("/Geo")
+    primvar = UsdGeom.PrimvarsAPI(prim).GetPrimvar("normals")
+    assert primvar.GetTypeName() == Sdf.ValueTypeNames.Normal3hArray
+    assert primvar.GetInterpolation() == interpolation
+    assert not prim.GetAttribute("normals").HasAuthoredValue()
+    assert np.abs(np.asarray(primvar.Get(2), dtype=np.float32) - normals).max() <= 1e-3
+
+
+def test_half_normals_shrink_exported_size():
+    stage, _, _ = make_cache()
+    size = quantize.exported_size(stage)
+    quantize.quantize_points(stage, mode=quantize.HALF, error_bound=1e-3)
+    # Both samples share one normals array, 12 kB as float3 and 6 kB as half3.
+    assert quantize.exported_size(stage) < size - 5000
+
+
+def test_report_uses_exported_size():
+    # The anim validator drops normals, so only points are quantized and they stay float3.
+    stage, _, _ = make_cache()
+    stage_validator = validator.Validator(eliminate_held=False, index_primvars=False,
+                                          quantize_mode=quantize.ROUND, quantize_error=1e-3)
+    stage_validator.validate_anim(stage)
+
+    report = stage_validator.quantize_report
+    assert report["bytes"] > 0
+    assert report["quantized_bytes"] == report["bytes"]
+    assert "/Geo.points" in report["attributes"]
@@ -0,0 +1,59 @@
+import os
+from pxr import Usd, UsdGeom
+from usd_tools.io import payloads, re_exporter
+
+
+def make_input(tmp_path):
+    stage = Usd.Stage.CreateInMemory()
+    mesh = UsdGeom.Mesh.Define(stage, "/Birdfeeder/mesh")
+    mesh.CreatePointsAttr([(0, 0, 0), (1, 0, 0), (0, 1, 0)])
+    mesh.CreateFaceVertexCountsAttr([3])
+    mesh.CreateFaceVertexIndicesAttr([0, 1, 2])
+    input_file = str(tmp_path / "in.usda")
+    stage.Export(input_file)
+    return input_file
+
+
+def test_payload_publish_on_fresh_asset(tmp_path, monkeypatch):
+    monkeypatch.setenv("PROJ", str(tmp_path / "proj"))
+    monkeypatch.delenv("DATABASE", raising=False)
+    input_file = make_input(tmp_path)
+    folder = fr"{tmp_path / 'proj'}\35_depot\assets\Prop\Birdfeeder\Geo"
+    os.makedirs(folder)
+
+    for _ in range(2):
+        published = re_exporter.ReExporter(input_file, "Birdfeeder", "Prop").export_mesh(payload=True)
+        assert os.path.exists(fr"{folder}\{payloads.PAYLOAD_FOLDER}")
+
+        interface = Usd.Stage.Open(published, Usd.Stage.LoadNone)
+        asset = interface.GetPrimAtPath("/Scene/Assets/Prop/Birdfeeder")
+        assert asset.HasAuthoredPayloads()
+        assert not asset.IsLoaded()
+        assert asset.GetAttribute("extentsHint").Get()
+
+
+def test_camera_export_in_one_pass(tmp_path, monkeypatch):
+    monkeypatch.setenv("PROJ", str(tmp_path / "proj"))
+    monkeypatch.delenv("DATABASE", raising=False)
+    stage = Usd.Stage.CreateInMemory()
+    xform = UsdGeom.Xform.Define(stage, "/Cam")
+    xform.GetPrim().SetMetadata("kind", "group")
+    xform.AddTranslateOp().Set((0, 1, 5))
+    UsdGeom.Camera.Define(stage, "/Cam/RenderCam").CreateFocalLengthAttr(35.0)
+    UsdGeom.Mesh.Define(stage, "/Set")
+    input_file = str(tmp_path / "cam.usda")
+    stage.Export(input_file)
+    os.makedirs(fr"{tmp_path / 'proj'}\35_depot\shots\010\Cameras")
+
+    traversals = []
+    traverse = Usd.Stage.Traverse
+    monkeypatch.setattr(Usd.Stage, "Traverse", lambda self, *args: traversals.append(self) or traverse(self, *args))
+    exporter = re_exporter.ReExporter(input_file, "Camera", "Camera", shot_num="010")
+    published = Usd.Stage.Open(exporter.export_cam())
+    assert len(traversals) == 1
+
+    camera = published.GetPrimAtPath("/Scene/Cameras/RenderCam/RenderCam")
+    assert camera.GetAttribute("focalLength").Get() == 35.0
+    assert not any(prim.IsA(UsdGeom.Mesh) for prim in published.Traverse())
+    assert not camera.HasAuthoredMetadata("kind")
+    assert exporter.rule_stats["clear_metadata:kind"]["hits"] == 1
@@ -0,0 +1,67 @@
+from pxr import Usd, UsdGeom, Sdf
+from usd_tools import rules, validator
+
+
+def make_stage():
+    stage = Usd.Stage.CreateInMemory()
+    UsdGeom.Xform.Define(stage, "/Cam").GetPrim().SetMetadata("kind", "group")
+    UsdGeom.Camera.Define(stage, "/Cam/RenderCam")
+    UsdGeom.Mesh.Define(stage, "/Cam/Set")
+    UsdGeom.Mesh.Define(stage, "/Cam/Set/Child")
+    stage.DefinePrim("/Cam/mtl", "Scope")
+    stage.DefinePrim("/Cam/mtl/wood", "Material")
+    return stage
+
+
+def test_rules_run_in_one_traversal():
+    engine = rules.RuleEngine()
+    engine.remove_type("Mesh")
+    engine.remove_name("mtl")
+    engine.clear_metadata("kind")
+    stage = engine.run(make_stage())
+
+    assert [str(prim.GetPath()) for prim in stage.Traverse()] == ["/Cam", "/Cam/RenderCam"]
+    assert not stage.GetPrimAtPath("/Cam").HasAuthoredMetadata("kind")
+    assert engine.stats["remove_type:Mesh"]["hits"] == 1
+    assert engine.stats["remove_name:mtl"]["hits"] == 1
+    assert engine.stats["clear_metadata:kind"]["hits"] == 1
+
+
+def test_removed_prims_skip_remaining_rules_and_children():
+    seen = []
+    engine = rules.RuleEngine()
+    engine.remove_type("Mesh")
+    engine.add_rule("record", lambda prim, session: seen.append(str(prim.GetPath())) or rules.SKIPPED)
+    engine.run(make_stage())
+
+    assert "/Cam/Set" not in seen
+    assert "/Cam/Set/Child" not in seen
+    assert "/Cam/RenderCam" in seen
+
+
+def test_attribute_policy():
+    stage = make_stage()
+    UsdGeom.Mesh(stage.GetPrimAtPath("/Cam/Set")).CreateNormalsAttr([(0, 0, 1)])
+
+    def drop_normals(session, prim, attr):
+        if attr.GetName() == "normals":
+            session.remove_property(prim, "normals")
+
+    engine = rules.RuleEngine()
+    engine.attribute_policy("Mesh", drop_normals)
+    engine.run(stage)
+    assert not stage.GetPrimAtPath("/Cam/Set").GetAttribute("normals").IsAuthored()
+    assert engine.stats["attributes:Mesh"]["hits"] == 2
+
+
+def test_clear_pivots_only_counts_prims_with_ops():
+    stage = Usd.Stage.CreateInMemory()
+    UsdGeom.Xform.Define(stage, "/Geo")
+    mesh = UsdGeom.Mesh.Define(stage, "/Geo/mesh")
+    mesh.AddTranslateOp().Set((1, 0, 0))
+    UsdGeom.Mesh.Define(stage, "/Geo/plain")
+
+    stage_validator = validator.Validator()
+    stage_validator.validate_geo(stage)
+    assert stage_validator.stats["clear_pivots"]["hits"] == 1
+    assert not mesh.GetPrim().GetAttribute("xformOp:translate").HasAuthoredValue()
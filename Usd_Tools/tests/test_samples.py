@@ -0,0 +1,39 @@
+import numpy as np
+from pxr import Usd, UsdGeom, Sdf
+from usd_tools import samples
+
+
+def test_held_mask_keeps_run_ends():
+    values = [np.array([v]) for v in (0, 1, 1, 1, 1, 2, 2)]
+    assert samples.held_sample_mask(values).tolist() == [False, False, True, True, False, False, False]
+
+
+def test_held_mask_with_tolerance_compares_to_run_start():
+    # Each step is within tolerance of the last, but not of the run's start.
+    values = [np.array([v]) for v in (0.0, 0.004, 0.008, 0.012, 0.016)]
+    assert samples.held_sample_mask(values, tolerance=0.01).tolist() == [False, True, False, False, False]
+
+
+def test_held_samples_are_removed_and_values_unchanged():
+    stage = Usd.Stage.CreateInMemory()
+    attr = UsdGeom.Mesh.Define(stage, "/Geo").CreatePointsAttr()
+    frames = {1: 0, 2: 1, 3: 1, 4: 1, 5: 2}
+    for t, x in frames.items():
+        attr.Set([(x, 0, 0)], t)
+    before = {t: attr.Get(t) for t in np.arange(1, 5.25, 0.25)}
+
+    saved = samples.eliminate_held_samples(stage)
+    assert attr.GetTimeSamples() == [1, 2, 4, 5]
+    assert saved == {"/Geo": 12}
+    assert {t: attr.Get(t) for t in before} == before
+
+
+def test_static_samples_become_default():
+    stage = Usd.Stage.CreateInMemory()
+    attr = stage.DefinePrim("/Geo").CreateAttribute("width", Sdf.ValueTypeNames.Float)
+    for t in (1, 2, 3):
+        attr.Set(0.5, t)
+
+    samples.eliminate_held_samples(stage)
+    assert not attr.GetTimeSamples()
+    assert attr.Get() == 0.5
@@ -0,0 +1,58 @@
+from pxr import Usd, UsdGeom, Gf
+from usd_tools import transforms
+
+
+def make_mesh(stage, path, x):
+    mesh = UsdGeom.Mesh.Define(stage, path)
+    mesh.CreatePointsAttr([(0, 0, 0), (1, 0, 0), (0, 1, 0)])
+    mesh.CreateFaceVertexCountsAttr([3])
+    mesh.CreateFaceVertexIndicesAttr([0, 1, 2])
+    mesh.AddTranslateOp().Set(Gf.Vec3d(x, 0, 0))
+    return mesh
+
+
+def world_points(stage, path, time=Usd.TimeCode.Default()):
+    prim = stage.GetPrimAtPath(path)
+    matrix = UsdGeom.XformCache(time).GetLocalToWorldTransform(prim)
+    return [matrix.Transform(Gf.Vec3d(p)) for p in UsdGeom.Mesh(prim).GetPointsAttr().Get(time)]
+
+
+def test_static_mesh_with_animated_child_keeps_its_placement():
+    stage = Usd.Stage.CreateInMemory()
+    make_mesh(stage, "/Root/Body", 10)
+    wheel = make_mesh(stage, "/Root/Body/Wheel", 0)
+    rotate = wheel.AddRotateZOp()
+    rotate.Set(0.0, 1)
+    rotate.Set(90.0, 2)
+    before = world_points(stage, "/Root/Body")
+
+    transforms.bake_transforms(stage)
+    assert world_points(stage, "/Root/Body") == before
+    assert world_points(stage, "/Root/Body")[0][0] == 10
+
+
+def test_static_mesh_is_baked():
+    stage = Usd.Stage.CreateInMemory()
+    make_mesh(stage, "/Root/Rock", 5)
+    transforms.bake_transforms(stage)
+
+    mesh = UsdGeom.Mesh(stage.GetPrimAtPath("/Root/Rock"))
+    assert not mesh.GetOrderedXformOps()
+    assert mesh.GetPointsAttr().Get()[0][0] == 5
+
+
+def test_collapse_keeps_animated_transform():
+    stage = Usd.Stage.CreateInMemory()
+    xf = UsdGeom.Xform.Define(stage, "/Root/Arm")
+    xf.AddTranslateOp().Set(Gf.Vec3d(1, 2, 3))
+    rotate = xf.AddRotateZOp()
+    rotate.Set(0.0, 1)
+    rotate.Set(45.0, 2)
+    expected = {t: xf.GetLocalTransformation(t) for t in (1, 2)}
+
+    transforms.bake_transforms(stage, bake_static=False)
+    ops = xf.GetOrderedXformOps()
+    assert [op.GetOpType() for op in ops] == [UsdGeom.XformOp.TypeTransform]
+    for t, matrix in expected.items():
+        assert Gf.IsClose(xf.GetLocalTransformation(t), matrix, 1e-9)
+    assert not stage.GetPrimAtPath("/Root/Arm").GetAttribute("xformOp:rotateZ")
@@ -13,4 +13,23 @@ def hash_encode(data: list[str]) -> str:
         """
         raw = ":".join([i for i in data])
         id = hashlib.sha1(raw.encode()).hexdigest()
-        return id
\ No newline at end of file
+        return id
+
+
+def hash_file(path: str, algorithm="sha1", chunk_size=8 * 1024 * 1024) -> str:
+        """
+        Encodes a file's contents into a hash value, reading it in chunks.
+
+        Args:
+            path (str): File to hash.
+            algorithm (str, optional): Hashlib algorithm name. Defaults to "sha1".
+            chunk_size (int, optional): Bytes read per chunk. Defaults to 8MB.
+
+        Returns:
+            str: Hash value.
+        """
+        digest = hashlib.new(algorithm)
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(chunk_size), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
@@ -1,5 +1,6 @@
 import re
 import os
+from utils import version_utils
 
 
 def get_highest_file_version(folder: str, pattern: re.compile) -> str:
@@ -13,18 +14,7 @@ def get_highest_file_version(folder: str, pattern: re.compile) -> str:
     Returns:
         str: Highest current version.
     """
-    highest_version = 0
-
-    for fname in os.listdir(folder):
-        fpath = os.path.join(folder, fname)
-        if os.path.isfile(fpath):
-            match = pattern.match(fname)
-            if match:
-                version_num = int(match.group(1))
-                if version_num > highest_version:
-                    highest_version = version_num
-
-    return highest_version
+    return version_utils.highest_version(folder, pattern, "file")
 
 
 def get_highest_folder_version(folder: str, pattern: re.compile) -> str:
@@ -38,18 +28,7 @@ def get_highest_folder_version(folder: str, pattern: re.compile) -> str:
     Returns:
         str: Highest current version.
     """
-    highest_version = 0
-
-    for fname in os.listdir(folder):
-        fpath = os.path.join(folder, fname)
-        if os.path.isdir(fpath):
-            match = pattern.match(fname)
-            if match:
-                version_num = int(match.group(1))
-                if version_num > highest_version:
-                    highest_version = version_num
-
-    return highest_version
+    return version_utils.highest_version(folder, pattern, "folder")
 
 
 def get_next_usd_file(file_base: str, folder: str, extension="usd") -> str:
@@ -65,11 +44,28 @@ def get_next_usd_file(file_base: str, folder: str, extension="usd") -> str:
         str: Versioned Usd file path.
     """
     pattern = re.compile(rf"^{re.escape(file_base)}_v(\d+)\.(usd[a-z]*)$")
-    version = get_highest_file_version(folder, pattern)
-    next_version = version + 1
+    next_version = version_utils.next_version(folder, pattern, "file")
     return fr"{folder}\{file_base}_v{next_version:03d}.{extension}"
 
 
+def get_latest_usd_file(file_base: str, folder: str) -> str | None:
+    """
+    Gets path of the highest existing Usd version.
+
+    Args:
+        file_base (str): Base file name.
+        folder (str): Folder to traverse.
+
+    Returns:
+        str | None: Latest versioned Usd file path, None if no version exists.
+    """
+    pattern = re.compile(rf"^{re.escape(file_base)}_v(\d+)\.(usd[a-z]*)$")
+    versions = version_utils.all_versions(folder, pattern, "file")
+    if not versions:
+        return None
+    return fr"{folder}\{versions[max(versions)]}"
+
+
 def get_next_ma_file(file_base: str, folder: str, extension="ma") -> str:
     """
     Gets path of the next Ma version to create.
@@ -83,8 +79,7 @@ def get_next_ma_file(file_base: str, folder: str, extension="ma") -> str:
         str: Versioned Ma file path.
     """
     pattern = re.compile(rf"^{re.escape(file_base)}_v(\d+)\.ma$")
-    version = get_highest_file_version(folder, pattern)
-    next_version = version + 1
+    next_version = version_utils.next_version(folder, pattern, "file")
     return fr"{folder}\{file_base}_v{next_version:03d}.{extension}"
 
 
@@ -99,11 +94,66 @@ def get_next_render_folder(folder: str) -> str:
         str: Next version of folder to create.
     """
     pattern = re.compile(rf"v(\d+)")
-    version = get_highest_folder_version(folder, pattern)
-    next_version = version + 1
+    next_version = version_utils.next_version(folder, pattern, "folder")
     return fr"v{next_version:03d}"
 
 
+def reserve_next_usd_file(file_base: str, folder: str, extension="usd") -> version_utils.VersionReservation:
+    """
+    Atomically reserves the next Usd version so concurrent publishes never share a file.
+
+    Args:
+        file_base (str): Base file name.
+        folder (str): Folder to traverse.
+        extension (str, optional): Extension of Usd file. Defaults to "usd".
+
+    Returns:
+        version_utils.VersionReservation: Reservation holding the versioned Usd file path.
+    """
+    pattern = re.compile(rf"^{re.escape(file_base)}_v(\d+)\.(usd[a-z]*)$")
+    path_for = lambda version: fr"{folder}\{file_base}_v{version:03d}.{extension}"
+    return version_utils.reserve_version(folder, pattern, path_for, "file")
+
+
+def reserve_next_ma_file(file_base: str, folder: str, extension="ma") -> version_utils.VersionReservation:
+    """
+    Atomically reserves the next Ma version so concurrent publishes never share a file.
+
+    Args:
+        file_base (str): Base file name.
+        folder (str): Folder to traverse.
+        extension (str, optional): Extension of Ma file. Defaults to "ma".
+
+    Returns:
+        version_utils.VersionReservation: Reservation holding the versioned Ma file path.
+    """
+    pattern = re.compile(rf"^{re.escape(file_base)}_v(\d+)\.ma$")
+    path_for = lambda version: fr"{folder}\{file_base}_v{version:03d}.{extension}"
+    return version_utils.reserve_version(folder, pattern, path_for, "file")
+
+
+def reserve_render_folder(folder: str, preferred=None) -> version_utils.VersionReservation:
+    """
+    Atomically creates a render version folder so concurrent submissions never share one.
+
+    Args:
+        folder (str): Folder to create render version in.
+        preferred (str, optional): Version to try first, e.g. "v004". Defaults to None.
+
+    Returns:
+        version_utils.VersionReservation: Reservation holding the render folder path.
+    """
+    pattern = re.compile(rf"v(\d+)")
+    start = None
+    if preferred:
+        match = pattern.fullmatch(preferred)
+        if match:
+            start = int(match.group(1))
+
+    path_for = lambda version: os.path.join(folder, f"v{version:03d}")
+    return version_utils.reserve_version(folder, pattern, path_for, "folder", start=start)
+
+
 def reformat_path(path: str) -> str:
     """
     Formats path of university drive from local name to network name.
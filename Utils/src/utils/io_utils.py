@@ -1,5 +1,20 @@
 import json
-from typing import Any
+import os
+import shutil
+import socket
+import tempfile
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from types import MappingProxyType
+from typing import Any, Callable, Mapping
+from utils import version_utils
+
+
+_json_cache = {}
+_json_cache_lock = threading.Lock()
+_json_cache_stats = {"hits": 0, "misses": 0, "bytes_saved": 0}
 
 
 def read_json(file: str) -> dict[str, Any]:
@@ -19,13 +34,318 @@ def read_json(file: str) -> dict[str, Any]:
     return data
 
 
+def read_json_cached(file: str) -> Mapping[str, Any]:
+    """
+    Reads given json file, reusing the last parse while its size and mtime are unchanged.
+
+    The returned data is a read-only view shared between callers, use read_json
+    for data that needs to be modified.
+
+    Args:
+        file (str): File to read.
+
+    Returns:
+        Mapping[str, Any]: Read-only json dictionary returned from file.
+    """
+    key = os.path.normcase(os.path.abspath(file))
+    stat = os.stat(file)
+    signature = (stat.st_size, stat.st_mtime_ns)
+
+    with _json_cache_lock:
+        cached = _json_cache.get(key)
+        if cached is not None and cached[0] == signature:
+            _json_cache_stats["hits"] += 1
+            _json_cache_stats["bytes_saved"] += stat.st_size
+            return cached[1]
+
+    data = _freeze(read_json(file))
+
+    with _json_cache_lock:
+        _json_cache[key] = (signature, data)
+        _json_cache_stats["misses"] += 1
+
+    return data
+
+
+def json_cache_stats() -> dict[str, int]:
+    """
+    Gets counters for the cached json reads.
+
+    Returns:
+        dict[str, int]: Hits, misses, bytes of json not re-read and cached entries.
+    """
+    with _json_cache_lock:
+        stats = dict(_json_cache_stats)
+        stats["entries"] = len(_json_cache)
+    return stats
+
+
+def clear_json_cache(file=None):
+    """
+    Drops cached json data.
+
+    Args:
+        file (str, optional): File to drop, all files if None. Defaults to None.
+    """
+    with _json_cache_lock:
+        if file is None:
+            _json_cache.clear()
+        else:
+            _json_cache.pop(os.path.normcase(os.path.abspath(file)), None)
+
+
+def _freeze(data: Any) -> Any:
+    """
+    Recursively converts json data into read-only containers.
+
+    Args:
+        data (Any): Parsed json data.
+
+    Returns:
+        Any: Data with dicts as mapping proxies and lists as tuples.
+    """
+    if isinstance(data, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in data.items()})
+    if isinstance(data, list):
+        return tuple(_freeze(i) for i in data)
+    return data
+
+
 def write_json(file: str, data: dict[str, Any]):
     """
     Writes data to json file.
 
+    The data is written to a temp file next to the target and renamed over it,
+    so readers never see a partially written file.
+
     Args:
         file (str): File to write to.
         data (dict[str]): Dictionary to write.
     """
-    with open(file, "w") as json_file:
-        json.dump(data, json_file, indent=4)
+    with file_lock(file):
+        _write_json_atomic(file, data)
+
+
+def update_json(file: str, fn: Callable[[dict[str, Any]], dict[str, Any] | None], default=None) -> dict[str, Any] | None:
+    """
+    Read-modify-writes json file while holding its lock.
+
+    The file is re-read under the lock, so changes made by other processes
+    since the caller last read it are kept rather than overwritten.
+
+    Args:
+        file (str): File to update.
+        fn (Callable[[dict[str, Any]], dict[str, Any] | None]): Receives current data and returns
+            data to write, or None to leave the file untouched.
+        default (dict[str, Any], optional): Data to start from if file doesn't exist. Defaults to None.
+
+    Returns:
+        dict[str, Any] | None: Data written, None if nothing was written.
+    """
+    with file_lock(file):
+        if os.path.exists(file):
+            data = read_json(file)
+        else:
+            data = dict(default or {})
+
+        data = fn(data)
+        if data is not None:
+            _write_json_atomic(file, data)
+
+    return data
+
+
+@contextmanager
+def file_lock(file: str, timeout=60.0, stale=300.0, poll=0.05):
+    """
+    Holds an advisory lock on a file, using an exclusively created lock file beside it.
+
+    The lock file holds a token with the holder's host and process, unique to this
+    holder, so a holder whose lock was broken never removes the lock someone else
+    has since taken. The lock is touched while held, so only a lock whose holder
+    has crashed grows stale, however long the locked work takes.
+
+    Args:
+        file (str): File to lock.
+        timeout (float, optional): Seconds to wait for the lock. Defaults to 60.0.
+        stale (float, optional): Seconds without a touch after which a lock from another
+            host is broken. Defaults to 300.0.
+        poll (float, optional): Seconds between attempts. Defaults to 0.05.
+
+    Raises:
+        TimeoutError: If the lock couldn't be acquired in time.
+    """
+    lock_path = f"{file}.lock"
+    token = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex}"
+    deadline = time.monotonic() + timeout
+
+    while True:
+        try:
+            fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            _break_stale_lock(lock_path, stale)
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"Timed out waiting for lock: {lock_path}")
+            time.sleep(poll)
+            continue
+
+        with os.fdopen(fd, "w") as lock_file:
+            lock_file.write(token)
+        break
+
+    stop = threading.Event()
+    refresher = threading.Thread(target=_refresh_lock, args=(lock_path, token, stop, stale / 4), daemon=True)
+    refresher.start()
+    try:
+        yield
+    finally:
+        stop.set()
+        refresher.join()
+        if _read_lock_token(lock_path) == token:
+            try:
+                os.remove(lock_path)
+            except FileNotFoundError:
+                pass
+
+
+def _read_lock_token(lock_path: str) -> str | None:
+    """
+    Reads the token of a lock's holder.
+
+    Args:
+        lock_path (str): Lock file path.
+
+    Returns:
+        str | None: Holder token, None if the lock file is gone.
+    """
+    try:
+        with open(lock_path, "r") as lock_file:
+            return lock_file.read()
+    except OSError:
+        return None
+
+
+def _refresh_lock(lock_path: str, token: str, stop: threading.Event, interval: float):
+    """
+    Touches a held lock until stopped, so waiters don't take it for a crashed holder's.
+
+    Args:
+        lock_path (str): Lock file path.
+        token (str): Holder token, the lock is left alone once it holds another.
+        stop (threading.Event): Set when the lock is released.
+        interval (float): Seconds between touches.
+    """
+    while not stop.wait(interval):
+        if _read_lock_token(lock_path) != token:
+            return
+        try:
+            os.utime(lock_path)
+        except OSError:
+            return
+
+
+def _lock_abandoned(lock_path: str, mtime: float, stale: float) -> bool:
+    """
+    Checks if a lock's holder is gone.
+
+    A holder on this host is checked directly, as version_utils does for its
+    reservations. One on another host is gone once the lock hasn't been touched
+    for stale seconds, as holders touch their locks while they run.
+
+    Args:
+        lock_path (str): Lock file path.
+        mtime (float): Modification time of the lock.
+        stale (float): Seconds after which an untouched lock is considered abandoned.
+
+    Returns:
+        bool: True if the lock can be broken.
+    """
+    holder = (_read_lock_token(lock_path) or "").split(":")
+    if len(holder) >= 2 and holder[0] == socket.gethostname() and holder[1].isdigit():
+        return not version_utils.process_alive(int(holder[1]))
+    return time.time() - mtime >= stale
+
+
+def _break_stale_lock(lock_path: str, stale: float):
+    """
+    Removes a lock file left behind by a crashed process.
+
+    The lock is renamed away and the renamed file checked against the one found
+    stale. If another waiter broke the lock and took it in between, the renamed
+    file is that waiter's fresh lock, so it is put back.
+
+    Args:
+        lock_path (str): Lock file path.
+        stale (float): Seconds after which the lock is considered abandoned.
+    """
+    try:
+        found = os.stat(lock_path)
+        if not _lock_abandoned(lock_path, found.st_mtime, stale):
+            return
+        broken = f"{lock_path}.{socket.gethostname()}.{uuid.uuid4().hex}.stale"
+        os.replace(lock_path, broken)
+        renamed = os.stat(broken)
+    except OSError:
+        return
+
+    if (renamed.st_ino, renamed.st_mtime_ns) != (found.st_ino, found.st_mtime_ns):
+        try:
+            # Fails rather than overwriting if yet another waiter has taken the lock.
+            os.link(broken, lock_path)
+        except FileExistsError:
+            pass
+        except OSError:
+            if os.name == "nt":
+                try:
+                    os.rename(broken, lock_path)
+                    return
+                except OSError:
+                    pass
+
+    try:
+        os.remove(broken)
+    except OSError:
+        pass
+
+
+def _write_json_atomic(file: str, data: dict[str, Any], retries=10):
+    """
+    Writes json to a temp file, flushes it to disk and renames it over the target.
+
+    Args:
+        file (str): File to write to.
+        data (dict[str]): Dictionary to write.
+        retries (int, optional): Attempts at replacing a target held open by a reader. Defaults to 10.
+    """
+    folder = os.path.dirname(os.path.abspath(file))
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{os.path.basename(file)}.", suffix=".tmp", dir=folder)
+
+    try:
+        with os.fdopen(fd, "w") as json_file:
+            json.dump(data, json_file, indent=4)
+            json_file.flush()
+            os.fsync(json_file.fileno())
+
+        # mkstemp files are private, keep the target readable by other users.
+        if os.path.exists(file):
+            shutil.copymode(file, tmp_path)
+        else:
+            os.chmod(tmp_path, 0o644)
+
+        for attempt in range(retries):
+            try:
+                os.replace(tmp_path, file)
+                break
+            except PermissionError:
+                # Windows refuses to replace files that are open elsewhere.
+                if attempt == retries - 1:
+                    raise
+                time.sleep(0.1)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
+
+    clear_json_cache(file)
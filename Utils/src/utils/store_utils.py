@@ -0,0 +1,213 @@
+import os
+import shutil
+import socket
+import stat
+import sys
+import tempfile
+import uuid
+from utils import codec_utils as codec
+
+
+# Mode of stored objects, readable by everyone and writable by no one.
+READ_ONLY = stat.S_IREAD | stat.S_IRGRP | stat.S_IROTH
+
+
+class DepotStore:
+    """
+    Content-addressed object store for depot publishes.
+
+    Every published file is stored once under its content hash, and versions in
+    the depot are hardlinks to the stored object. Publishing bytes that already
+    exist in the store costs no extra space and no network copy. Stored objects
+    are read-only, so a version can't be saved over in place and change every
+    version sharing its object.
+    """
+    def __init__(self, root=None, algorithm="sha256"):
+        """
+        Initialise store location.
+
+        Args:
+            root (str, optional): Store folder. Defaults to ".store" inside the depot.
+            algorithm (str, optional): Hashlib algorithm used for object names. Defaults to "sha256".
+        """
+        self.root = root or os.path.join(os.getenv("PROJ"), "35_depot", ".store")
+        self.algorithm = algorithm
+
+
+    def object_path(self, digest: str) -> str:
+        """
+        Gets path of a stored object.
+
+        Args:
+            digest (str): Content hash of object.
+
+        Returns:
+            str: Object path.
+        """
+        return os.path.join(self.root, digest[:2], digest)
+
+
+    def ingest(self, src: str) -> tuple[str, bool]:
+        """
+        Adds a file's contents to the store.
+
+        The file is copied rather than hardlinked, so later changes to it can't
+        reach the stored object. The copy is hashed again, so the object always
+        matches its name even if the file changed while it was being read, and
+        made read-only before it is added.
+
+        Args:
+            src (str): File to add.
+
+        Returns:
+            tuple[str, bool]: Content hash and whether the object already existed.
+        """
+        digest = codec.hash_file(src, self.algorithm)
+        if os.path.exists(self.object_path(digest)):
+            return digest, True
+
+        os.makedirs(self.root, exist_ok=True)
+        tmp = os.path.join(self.root, temp_name("ingest"))
+        try:
+            shutil.copyfile(src, tmp)
+            digest = codec.hash_file(tmp, self.algorithm)
+            obj = self.object_path(digest)
+            if os.path.exists(obj):
+                return digest, True
+
+            os.makedirs(os.path.dirname(obj), exist_ok=True)
+            os.chmod(tmp, READ_ONLY)
+            os.replace(tmp, obj)
+        finally:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+
+        return digest, False
+
+
+    def materialize(self, digest: str, dst: str) -> str:
+        """
+        Places a stored object at a depot path, replacing anything already there.
+
+        Args:
+            digest (str): Content hash of object.
+            dst (str): Depot path to create.
+
+        Returns:
+            str: "link" if hardlinked, "copy" if the volume doesn't support hardlinks.
+        """
+        obj = self.object_path(digest)
+        tmp = os.path.join(os.path.dirname(dst), temp_name(os.path.basename(dst)))
+        method = "link"
+        try:
+            try:
+                os.link(obj, tmp)
+            except OSError:
+                shutil.copyfile(obj, tmp)
+                method = "copy"
+            os.replace(tmp, dst)
+        finally:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+
+        return method
+
+
+    def publish(self, src: str, dst: str) -> dict[str, str | bool]:
+        """
+        Publishes a file to the depot through the store.
+
+        Args:
+            src (str): File to publish, e.g. a local temp export.
+            dst (str): Depot path to publish to.
+
+        Returns:
+            dict[str, str | bool]: Content hash, whether it was a duplicate and how it was placed.
+        """
+        digest, duplicate = self.ingest(src)
+        method = self.materialize(digest, dst)
+        return {"hash": digest, "duplicate": duplicate, "method": method}
+
+
+    def dedup(self, folder: str) -> dict[str, int]:
+        """
+        Moves existing depot files into the store, replacing them with hardlinks to the stored objects.
+
+        Args:
+            folder (str): Depot folder to deduplicate.
+
+        Returns:
+            dict[str, int]: Files scanned, files deduplicated and bytes saved.
+        """
+        stats = {"files": 0, "deduplicated": 0, "bytes_saved": 0}
+        store_root = os.path.normcase(os.path.abspath(self.root))
+
+        for dirpath, dirnames, filenames in os.walk(folder):
+            if os.path.normcase(os.path.abspath(dirpath)).startswith(store_root):
+                dirnames[:] = []
+                continue
+
+            for filename in filenames:
+                path = os.path.join(dirpath, filename)
+                stats["files"] += 1
+
+                digest, duplicate = self.ingest(path)
+                if os.path.samefile(path, self.object_path(digest)):
+                    continue
+
+                size = os.path.getsize(path)
+                if self.materialize(digest, path) == "link" and duplicate:
+                    stats["deduplicated"] += 1
+                    stats["bytes_saved"] += size
+
+        return stats
+
+
+def temp_name(name: str) -> str:
+    """
+    Gets a hidden temp file name that no other process or machine will pick.
+
+    Args:
+        name (str): Name to base it on, e.g. the file being written.
+
+    Returns:
+        str: Temp file name, e.g. .Birdfeeder_v003.usdc.ws042.3f2a....tmp
+    """
+    return f".{name}.{socket.gethostname()}.{uuid.uuid4().hex}.tmp"
+
+
+def publish_file(src: str, dst: str) -> dict[str, str | bool]:
+    """
+    Publishes a file to the depot through the default store.
+
+    Args:
+        src (str): File to publish.
+        dst (str): Depot path to publish to.
+
+    Returns:
+        dict[str, str | bool]: Content hash, whether it was a duplicate and how it was placed.
+    """
+    return DepotStore().publish(src, dst)
+
+
+def temp_export_path(extension: str) -> str:
+    """
+    Creates an empty local temp file to export into before publishing.
+
+    Args:
+        extension (str): File extension without the dot.
+
+    Returns:
+        str: Temp file path.
+    """
+    fd, path = tempfile.mkstemp(suffix=f".{extension}")
+    os.close(fd)
+    return path
+
+
+if __name__ == "__main__":
+    folder = sys.argv[1] if len(sys.argv) > 1 else os.path.join(os.getenv("PROJ"), "35_depot")
+    stats = DepotStore().dedup(folder)
+    print(f"Files scanned: {stats['files']}")
+    print(f"Files deduplicated: {stats['deduplicated']}")
+    print(f"Bytes saved: {stats['bytes_saved']}")
@@ -44,6 +44,23 @@ def popup_warning(message: str, parent=None):
     msg_box.setStandardButtons(QMessageBox.Ok)
     msg_box.setWindowFlags(msg_box.windowFlags() | Qt.WindowStaysOnTopHint)
     msg_box.exec()
+
+
+def popup_info(message: str, parent=None):
+    """
+    Creates a Qt popup information message.
+
+    Args:
+        message (str): Message to display.
+        parent (QWidget, optional): Parent to inherit from. Defaults to None.
+    """
+    msg_box = QMessageBox(parent)
+    msg_box.setWindowTitle("Info")
+    msg_box.setText(message)
+    msg_box.setIcon(QMessageBox.Information)
+    msg_box.setStandardButtons(QMessageBox.Ok)
+    msg_box.setWindowFlags(msg_box.windowFlags() | Qt.WindowStaysOnTopHint)
+    msg_box.exec()
     
 
 def new_parm(text: str, layout: QWidget, font: QFont, box_width: float, type: str):
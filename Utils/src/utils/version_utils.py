@@ -0,0 +1,475 @@
+import os
+import re
+import socket
+import threading
+import time
+
+
+class VersionIndex:
+    """
+    Cached index of versioned files and folders, keyed by folder.
+
+    Folders are listed with os.scandir so file/folder checks use the cached
+    DirEntry type info instead of a stat per entry. Listings are reused until
+    the folder's modification time changes.
+    """
+    def __init__(self):
+        """
+        Initialise empty folder cache.
+        """
+        self._folders = {}
+        self._lock = threading.Lock()
+
+
+    def _key(self, folder: str) -> str:
+        """
+        Normalises folder path for use as a cache key.
+
+        Args:
+            folder (str): Folder path.
+
+        Returns:
+            str: Normalised folder path.
+        """
+        return os.path.normcase(os.path.abspath(folder))
+
+
+    def _listing(self, folder: str) -> dict:
+        """
+        Gets cached listing of a folder, rescanning if it has changed.
+
+        Args:
+            folder (str): Folder to list.
+
+        Raises:
+            FileNotFoundError: If folder doesn't exist.
+
+        Returns:
+            dict: Cached listing with "files", "folders" and parsed "versions".
+        """
+        key = self._key(folder)
+        mtime = os.stat(folder).st_mtime_ns
+
+        with self._lock:
+            cached = self._folders.get(key)
+            if cached is not None and cached["mtime"] == mtime:
+                return cached
+
+        files = []
+        folders = []
+        with os.scandir(folder) as entries:
+            for entry in entries:
+                try:
+                    if is_reservation(entry.name):
+                        continue
+                    if entry.is_file():
+                        files.append(entry.name)
+                    elif entry.is_dir():
+                        folders.append(entry.name)
+                except OSError:
+                    continue
+
+        listing = {"mtime": mtime, "files": files, "folders": folders, "versions": {}}
+        with self._lock:
+            self._folders[key] = listing
+        return listing
+
+
+    def all_versions(self, folder: str, pattern: re.Pattern, kind="file") -> dict[int, str]:
+        """
+        Gets all versions matching pattern in a folder.
+
+        Args:
+            folder (str): Folder to traverse.
+            pattern (re.Pattern): Pattern to match, first group being the version number.
+            kind (str, optional): "file" or "folder". Defaults to "file".
+
+        Returns:
+            dict[int, str]: Version numbers mapped to entry names.
+        """
+        listing = self._listing(folder)
+        memo_key = (pattern.pattern, pattern.flags, kind)
+
+        with self._lock:
+            versions = listing["versions"].get(memo_key)
+        if versions is not None:
+            return dict(versions)
+
+        names = listing["files"] if kind == "file" else listing["folders"]
+        versions = {}
+        for name in names:
+            match = pattern.match(name)
+            if match:
+                version_num = int(match.group(1))
+                if version_num not in versions or name < versions[version_num]:
+                    versions[version_num] = name
+
+        with self._lock:
+            listing["versions"][memo_key] = versions
+        return dict(versions)
+
+
+    def highest_version(self, folder: str, pattern: re.Pattern, kind="file") -> int:
+        """
+        Gets highest version matching pattern in a folder.
+
+        Args:
+            folder (str): Folder to traverse.
+            pattern (re.Pattern): Pattern to match.
+            kind (str, optional): "file" or "folder". Defaults to "file".
+
+        Returns:
+            int: Highest current version, 0 if none exist.
+        """
+        return max(self.all_versions(folder, pattern, kind), default=0)
+
+
+    def next_version(self, folder: str, pattern: re.Pattern, kind="file") -> int:
+        """
+        Gets next version number to create in a folder.
+
+        Args:
+            folder (str): Folder to traverse.
+            pattern (re.Pattern): Pattern to match.
+            kind (str, optional): "file" or "folder". Defaults to "file".
+
+        Returns:
+            int: Next version number.
+        """
+        return self.highest_version(folder, pattern, kind) + 1
+
+
+    def invalidate(self, folder=None):
+        """
+        Drops cached listings.
+
+        Args:
+            folder (str, optional): Folder to drop, all folders if None. Defaults to None.
+        """
+        with self._lock:
+            if folder is None:
+                self._folders.clear()
+            else:
+                self._folders.pop(self._key(folder), None)
+
+
+# Shared index used by file_utils and the DCC menus.
+_index = VersionIndex()
+
+# Matches any versioned file, e.g. Tubey_v003.usda or Tubey_rig_v012.ma
+VERSIONED_FILE_PATTERN = re.compile(r"^.+_v(\d+)\.[^.]+$")
+
+# Suffix of the hidden marker claiming a file version, e.g. .Tubey_v003.reserved
+RESERVED_SUFFIX = ".reserved"
+
+# Seconds after which a reservation is treated as abandoned, whichever host made it.
+RESERVATION_TIMEOUT = 24 * 60 * 60
+
+
+def all_versions(folder: str, pattern=VERSIONED_FILE_PATTERN, kind="file") -> dict[int, str]:
+    """
+    Gets all versions matching pattern in a folder.
+
+    Args:
+        folder (str): Folder to traverse.
+        pattern (re.Pattern, optional): Pattern to match. Defaults to VERSIONED_FILE_PATTERN.
+        kind (str, optional): "file" or "folder". Defaults to "file".
+
+    Returns:
+        dict[int, str]: Version numbers mapped to entry names.
+    """
+    return _index.all_versions(folder, pattern, kind)
+
+
+def highest_version(folder: str, pattern=VERSIONED_FILE_PATTERN, kind="file") -> int:
+    """
+    Gets highest version matching pattern in a folder.
+
+    Args:
+        folder (str): Folder to traverse.
+        pattern (re.Pattern, optional): Pattern to match. Defaults to VERSIONED_FILE_PATTERN.
+        kind (str, optional): "file" or "folder". Defaults to "file".
+
+    Returns:
+        int: Highest current version, 0 if none exist.
+    """
+    return _index.highest_version(folder, pattern, kind)
+
+
+def next_version(folder: str, pattern=VERSIONED_FILE_PATTERN, kind="file") -> int:
+    """
+    Gets next version number to create in a folder.
+
+    Args:
+        folder (str): Folder to traverse.
+        pattern (re.Pattern, optional): Pattern to match. Defaults to VERSIONED_FILE_PATTERN.
+        kind (str, optional): "file" or "folder". Defaults to "file".
+
+    Returns:
+        int: Next version number.
+    """
+    return _index.next_version(folder, pattern, kind)
+
+
+def version_labels(folder: str, pattern=VERSIONED_FILE_PATTERN) -> dict[str, str]:
+    """
+    Gets versioned files in a folder keyed by their menu label, e.g. "v003".
+
+    Args:
+        folder (str): Folder to traverse.
+        pattern (re.Pattern, optional): Pattern to match. Defaults to VERSIONED_FILE_PATTERN.
+
+    Returns:
+        dict[str, str]: Version labels mapped to file names, newest first.
+    """
+    versions = _index.all_versions(folder, pattern, "file")
+    return {f"v{num:03d}": versions[num] for num in sorted(versions, reverse=True)}
+
+
+def invalidate(folder=None):
+    """
+    Drops cached listings from the shared index.
+
+    Args:
+        folder (str, optional): Folder to drop, all folders if None. Defaults to None.
+    """
+    _index.invalidate(folder)
+
+
+def is_reservation(name: str) -> bool:
+    """
+    Checks if a file name is a reservation marker.
+
+    Args:
+        name (str): File name.
+
+    Returns:
+        bool: True if it is a reservation marker.
+    """
+    return name.startswith(".") and name.endswith(RESERVED_SUFFIX)
+
+
+def reservation_marker(path: str) -> str:
+    """
+    Gets the hidden marker path that claims a versioned file.
+
+    The extension is dropped, so one version can't be claimed twice in different formats.
+
+    Args:
+        path (str): Versioned file path, e.g. Tubey_v003.usdc
+
+    Returns:
+        str: Marker path, e.g. .Tubey_v003.reserved
+    """
+    folder, name = os.path.split(path)
+    return os.path.join(folder, f".{os.path.splitext(name)[0]}{RESERVED_SUFFIX}")
+
+
+def process_alive(pid: int) -> bool:
+    """
+    Checks if a process on this host is still running.
+
+    Args:
+        pid (int): Process id.
+
+    Returns:
+        bool: True if it is running, or if that can't be told.
+    """
+    if os.name == "nt":
+        # os.kill would terminate the process on Windows.
+        import ctypes
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.OpenProcess(0x1000, False, pid)
+        if not handle:
+            return False
+        try:
+            code = ctypes.c_ulong()
+            kernel32.GetExitCodeProcess(handle, ctypes.byref(code))
+            return code.value == 259
+        finally:
+            kernel32.CloseHandle(handle)
+
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        return True
+    return True
+
+
+def is_stale(marker: str) -> bool:
+    """
+    Checks if a reservation was abandoned.
+
+    A reservation is stale once it is older than RESERVATION_TIMEOUT, or straight
+    away if it was made on this host by a process that no longer exists.
+
+    Args:
+        marker (str): Reservation marker path.
+
+    Returns:
+        bool: True if the reservation can be removed.
+    """
+    try:
+        age = time.time() - os.path.getmtime(marker)
+        with open(marker, "r") as f:
+            owner = f.read().split()
+    except OSError:
+        return False
+
+    if age > RESERVATION_TIMEOUT:
+        return True
+    if len(owner) >= 2 and owner[0] == socket.gethostname() and owner[1].isdigit():
+        return not process_alive(int(owner[1]))
+    return False
+
+
+def clean_stale_reservations(folder: str) -> int:
+    """
+    Removes abandoned reservation markers from a folder.
+
+    Args:
+        folder (str): Folder to clean.
+
+    Returns:
+        int: Number of markers removed.
+    """
+    removed = 0
+    try:
+        names = [i for i in os.listdir(folder) if is_reservation(i)]
+    except OSError:
+        return 0
+
+    for name in names:
+        marker = os.path.join(folder, name)
+        if is_stale(marker):
+            try:
+                os.remove(marker)
+                removed += 1
+            except OSError:
+                pass
+    return removed
+
+
+class VersionReservation:
+    """
+    Claim on a version number until it is written or released.
+
+    File versions are claimed by a hidden marker that version listings ignore,
+    so nothing shows up as a version until the publish writes its file. Used as
+    a context manager, the marker is removed when the block ends, along with
+    anything partly written if the block raises.
+    """
+    def __init__(self, folder: str, path: str, version: int, kind="file", marker=None):
+        """
+        Initialise reservation.
+
+        Args:
+            folder (str): Folder the version was reserved in.
+            path (str): Path of the reserved file or folder.
+            version (int): Reserved version number.
+            kind (str, optional): "file" or "folder". Defaults to "file".
+            marker (str, optional): Reservation marker of a file version. Defaults to None.
+        """
+        self.folder = folder
+        self.path = path
+        self.version = version
+        self.kind = kind
+        self.marker = marker
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is not None:
+            self.release()
+        else:
+            self.finish()
+        return False
+
+
+    def finish(self):
+        """
+        Removes the reservation marker once the version has been written.
+        """
+        if self.marker:
+            try:
+                os.remove(self.marker)
+            except OSError:
+                pass
+        invalidate(self.folder)
+
+
+    def release(self):
+        """
+        Removes anything written and the reservation so the version can be claimed again.
+
+        Folders are only removed if nothing has been written into them.
+        """
+        try:
+            if self.kind == "file":
+                os.remove(self.path)
+            else:
+                os.rmdir(self.path)
+        except OSError:
+            pass
+        self.finish()
+
+
+def reserve_version(folder: str, pattern: re.Pattern, path_for, kind="file", start=None, retries=100) -> VersionReservation:
+    """
+    Atomically claims the next free version in a folder.
+
+    A hidden marker file is created with O_EXCL (or the version folder with mkdir),
+    so two publishers racing for the same version can never both succeed; the
+    loser moves on to the next version number. Markers record their host and
+    process, so ones left by crashed publishers are cleaned up.
+
+    Args:
+        folder (str): Folder to reserve version in.
+        pattern (re.Pattern): Pattern matching existing versions.
+        path_for (Callable[[int], str]): Builds the placeholder path for a version number.
+        kind (str, optional): "file" or "folder". Defaults to "file".
+        start (int, optional): Version to try first, next free version if None. Defaults to None.
+        retries (int, optional): Number of versions to try before giving up. Defaults to 100.
+
+    Raises:
+        FileExistsError: If no version could be claimed.
+
+    Returns:
+        VersionReservation: Claimed version.
+    """
+    if kind == "file":
+        clean_stale_reservations(folder)
+    version = start if start is not None else next_version(folder, pattern, kind)
+
+    for _ in range(retries):
+        path = path_for(version)
+        marker = reservation_marker(path) if kind == "file" else None
+        try:
+            if kind == "file":
+                fd = os.open(marker, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                with os.fdopen(fd, "w") as f:
+                    f.write(f"{socket.gethostname()} {os.getpid()}")
+            else:
+                os.mkdir(path)
+        except FileExistsError:
+            invalidate(folder)
+            version = max(version + 1, next_version(folder, pattern, kind))
+            continue
+
+        invalidate(folder)
+
+        # Published by someone who finished before our listing was taken.
+        if kind == "file" and (os.path.exists(path) or version in all_versions(folder, pattern, kind)):
+            os.remove(marker)
+            invalidate(folder)
+            version = max(version + 1, next_version(folder, pattern, kind))
+            continue
+
+        return VersionReservation(folder, path, version, kind, marker)
+
+    raise FileExistsError(f"Could not reserve a version in: {folder}")
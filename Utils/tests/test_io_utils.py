@@ -0,0 +1,109 @@
+import os
+import socket
+import subprocess
+import sys
+import time
+import pytest
+from utils import io_utils
+
+
+def make_lock(path, token, age=0.0):
+    with open(path, "w") as f:
+        f.write(token)
+    if age:
+        old = time.time() - age
+        os.utime(path, (old, old))
+
+
+def test_update_json_keeps_other_changes(tmp_path):
+    file = str(tmp_path / "assetlist.json")
+    io_utils.write_json(file, {"a": 1})
+    io_utils.update_json(file, lambda data: {**data, "b": 2})
+    assert io_utils.read_json(file) == {"a": 1, "b": 2}
+    assert not os.path.exists(f"{file}.lock")
+
+
+def test_stale_lock_is_broken(tmp_path):
+    file = str(tmp_path / "assetlist.json")
+    make_lock(f"{file}.lock", "crashed", age=600)
+    io_utils.write_json(file, {"a": 1})
+    assert io_utils.read_json(file) == {"a": 1}
+
+
+def test_fresh_lock_taken_during_break_is_restored(tmp_path, monkeypatch):
+    lock_path = str(tmp_path / "assetlist.json.lock")
+    make_lock(lock_path, "crashed", age=600)
+    replace = os.replace
+
+    def racing_replace(src, dst):
+        # Another waiter breaks the stale lock and takes it first.
+        if src == lock_path:
+            os.remove(lock_path)
+            make_lock(lock_path, "fresh")
+        replace(src, dst)
+
+    monkeypatch.setattr(io_utils.os, "replace", racing_replace)
+    io_utils._break_stale_lock(lock_path, 300.0)
+    monkeypatch.undo()
+
+    with open(lock_path) as f:
+        assert f.read() == "fresh"
+    assert [i for i in os.listdir(tmp_path) if i.endswith(".stale")] == []
+
+
+def test_broken_holder_leaves_new_lock(tmp_path):
+    file = str(tmp_path / "assetlist.json")
+    with io_utils.file_lock(file):
+        # Our lock was broken as stale and someone else now holds it.
+        make_lock(f"{file}.lock", "other")
+    with open(f"{file}.lock") as f:
+        assert f.read() == "other"
+
+
+def test_lock_of_live_process_is_kept(tmp_path):
+    lock_path = str(tmp_path / "assetlist.json.lock")
+    make_lock(lock_path, f"{socket.gethostname()}:{os.getpid()}:holder", age=600)
+    io_utils._break_stale_lock(lock_path, 300.0)
+    assert os.path.exists(lock_path)
+
+
+def test_lock_of_dead_process_is_broken(tmp_path):
+    dead = subprocess.Popen([sys.executable, "-c", "pass"])
+    dead.wait()
+    lock_path = str(tmp_path / "assetlist.json.lock")
+    make_lock(lock_path, f"{socket.gethostname()}:{dead.pid}:holder")
+    io_utils._break_stale_lock(lock_path, 300.0)
+    assert not os.path.exists(lock_path)
+
+
+def test_held_lock_is_touched(tmp_path):
+    file = str(tmp_path / "assetlist.json")
+    with io_utils.file_lock(file, stale=0.2):
+        old = time.time() - 600
+        os.utime(f"{file}.lock", (old, old))
+        time.sleep(0.2)
+        assert time.time() - os.path.getmtime(f"{file}.lock") < 0.2
+    assert not os.path.exists(f"{file}.lock")
+
+
+def test_cached_read_is_reused_until_file_changes(tmp_path):
+    file = str(tmp_path / "shotlist.json")
+    io_utils.write_json(file, {"010": {"frames": [1, 10]}})
+    io_utils.clear_json_cache()
+
+    first = io_utils.read_json_cached(file)
+    assert io_utils.read_json_cached(file) is first
+    assert io_utils.json_cache_stats()["hits"] >= 1
+
+    io_utils.write_json(file, {"010": {"frames": [1, 20]}, "020": {"frames": [1, 5]}})
+    assert io_utils.read_json_cached(file)["010"]["frames"] == (1, 20)
+
+
+def test_cached_read_is_read_only(tmp_path):
+    file = str(tmp_path / "shotlist.json")
+    io_utils.write_json(file, {"010": {"frames": [1, 10]}})
+    data = io_utils.read_json_cached(file)
+    with pytest.raises(TypeError):
+        data["020"] = {}
+    with pytest.raises(TypeError):
+        data["010"]["frames"] = []
@@ -0,0 +1,62 @@
+import os
+from utils import store_utils
+
+
+def write(path, data):
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+def read(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def test_source_changes_dont_reach_published_file(tmp_path):
+    store = store_utils.DepotStore(str(tmp_path / ".store"))
+    src = str(tmp_path / "scene.ma")
+    dst = str(tmp_path / "rig_v001.ma")
+    write(src, b"published")
+
+    store.publish(src, dst)
+    with open(src, "r+b") as f:
+        f.write(b"EDITED")
+
+    assert not os.path.samefile(src, dst)
+    assert read(dst) == b"published"
+
+
+def test_duplicate_publish_shares_object(tmp_path):
+    store = store_utils.DepotStore(str(tmp_path / ".store"))
+    src = str(tmp_path / "export.usd")
+    write(src, b"geometry")
+
+    first = store.publish(src, str(tmp_path / "a_v001.usd"))
+    second = store.publish(src, str(tmp_path / "a_v002.usd"))
+    assert not first["duplicate"] and second["duplicate"]
+    assert os.path.samefile(tmp_path / "a_v001.usd", tmp_path / "a_v002.usd")
+
+
+def test_no_temp_files_left(tmp_path):
+    store = store_utils.DepotStore(str(tmp_path / ".store"))
+    src = str(tmp_path / "export.usd")
+    write(src, b"geometry")
+    store.publish(src, str(tmp_path / "a_v001.usd"))
+
+    leftovers = [name for _, _, names in os.walk(tmp_path) for name in names if name.endswith(".tmp")]
+    assert leftovers == []
+
+
+def test_temp_names_are_unique():
+    assert store_utils.temp_name("a.usd") != store_utils.temp_name("a.usd")
+
+
+def test_published_versions_are_read_only(tmp_path):
+    store = store_utils.DepotStore(str(tmp_path / ".store"))
+    src = str(tmp_path / "export.usd")
+    write(src, b"geometry")
+    digest = store.publish(src, str(tmp_path / "a_v001.usd"))["hash"]
+
+    for path in (store.object_path(digest), str(tmp_path / "a_v001.usd")):
+        assert os.stat(path).st_mode & 0o222 == 0
+    assert os.stat(src).st_mode & 0o200
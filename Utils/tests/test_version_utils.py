@@ -0,0 +1,121 @@
+import os
+import re
+import socket
+import subprocess
+import sys
+import pytest
+from utils import version_utils as vu
+
+
+PATTERN = re.compile(r"^Bolt_v(\d+)\.(usd[a-z]*)$")
+
+
+def path_for(folder):
+    return lambda version: os.path.join(folder, f"Bolt_v{version:03d}.usdc")
+
+
+def test_reservations_claim_successive_versions(tmp_path):
+    first = vu.reserve_version(str(tmp_path), PATTERN, path_for(tmp_path))
+    second = vu.reserve_version(str(tmp_path), PATTERN, path_for(tmp_path))
+    assert (first.version, second.version) == (1, 2)
+
+
+def test_reservation_is_hidden_from_readers(tmp_path):
+    with vu.reserve_version(str(tmp_path), PATTERN, path_for(tmp_path)) as reservation:
+        assert vu.all_versions(str(tmp_path), PATTERN) == {}
+        assert vu.version_labels(str(tmp_path)) == {}
+        with open(reservation.path, "w") as f:
+            f.write("#usda 1.0\n")
+
+    assert vu.all_versions(str(tmp_path), PATTERN) == {1: "Bolt_v001.usdc"}
+    assert not any(vu.is_reservation(i) for i in os.listdir(tmp_path))
+
+
+def test_failed_publish_releases_version(tmp_path):
+    with pytest.raises(RuntimeError):
+        with vu.reserve_version(str(tmp_path), PATTERN, path_for(tmp_path)) as reservation:
+            with open(reservation.path, "w") as f:
+                f.write("partial")
+            raise RuntimeError("export failed")
+
+    assert os.listdir(tmp_path) == []
+    assert vu.reserve_version(str(tmp_path), PATTERN, path_for(tmp_path)).version == 1
+
+
+def test_listing_doesnt_stat_entries(tmp_path, monkeypatch):
+    scandir = os.scandir
+
+    class Entry:
+        def __init__(self, entry):
+            self.name = entry.name
+            self.is_file = entry.is_file
+            self.is_dir = entry.is_dir
+
+        def stat(self):
+            raise AssertionError("listing stat'ed an entry")
+
+    class Entries:
+        def __init__(self, path):
+            self.entries = scandir(path)
+
+        def __enter__(self):
+            return [Entry(i) for i in self.entries]
+
+        def __exit__(self, *args):
+            self.entries.close()
+
+    open(tmp_path / "Bolt_v001.usdc", "w").close()
+    monkeypatch.setattr(vu.os, "scandir", Entries)
+    assert vu.VersionIndex().all_versions(str(tmp_path), PATTERN) == {1: "Bolt_v001.usdc"}
+
+
+def test_reservation_of_dead_process_is_cleaned(tmp_path):
+    dead = subprocess.Popen([sys.executable, "-c", "pass"])
+    dead.wait()
+    marker = vu.reservation_marker(path_for(tmp_path)(1))
+    with open(marker, "w") as f:
+        f.write(f"{socket.gethostname()} {dead.pid}")
+
+    assert vu.reserve_version(str(tmp_path), PATTERN, path_for(tmp_path)).version == 1
+
+
+def test_live_reservation_is_kept(tmp_path):
+    marker = vu.reservation_marker(path_for(tmp_path)(1))
+    with open(marker, "w") as f:
+        f.write(f"otherhost 1")
+
+    assert vu.reserve_version(str(tmp_path), PATTERN, path_for(tmp_path)).version == 2
+    assert os.path.exists(marker)
+
+
+def touch(path, data="#usda 1.0\n"):
+    with open(path, "w") as f:
+        f.write(data)
+
+
+def test_index_lists_versions_and_labels(tmp_path):
+    for name in ("Bolt_v001.usdc", "Bolt_v003.usda", "Bolt.usdc", "notes.txt"):
+        touch(tmp_path / name)
+    (tmp_path / "Bolt_v002").mkdir()
+
+    assert vu.all_versions(str(tmp_path), PATTERN) == {1: "Bolt_v001.usdc", 3: "Bolt_v003.usda"}
+    assert vu.all_versions(str(tmp_path), re.compile(r"^Bolt_v(\d+)$"), "folder") == {2: "Bolt_v002"}
+    assert list(vu.version_labels(str(tmp_path))) == ["v003", "v001"]
+    assert vu.next_version(str(tmp_path), PATTERN) == 4
+
+
+def test_index_reuses_listing_until_folder_changes(tmp_path, monkeypatch):
+    index = vu.VersionIndex()
+    touch(tmp_path / "Bolt_v001.usdc")
+    assert index.highest_version(str(tmp_path), PATTERN) == 1
+
+    scans = []
+    scandir = os.scandir
+    monkeypatch.setattr(vu.os, "scandir", lambda path: scans.append(path) or scandir(path))
+    assert index.highest_version(str(tmp_path), PATTERN) == 1
+    assert scans == []
+
+    touch(tmp_path / "Bolt_v002.usdc")
+    os.utime(tmp_path, ns=(0, os.stat(tmp_path).st_mtime_ns + 1_000_000))
+    assert index.highest_version(str(tmp_path), PATTERN) == 2
+    assert len(scans) == 1